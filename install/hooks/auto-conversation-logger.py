@@ -1,103 +1,157 @@
 #!/usr/bin/env python3
 """
 Automatic Conversation Logger Hook
-Logs all conversations to conversation-logger MCP server
+Logs messages straight into the conversation-logger MCP server's SQLite
+database (~/.conversation-logger/conversations.db), batched into one
+transaction per run; while the database is locked they are appended to
+spool.jsonl and written by the next run
 Maintains 5-day rolling history for journal generation
+
+Usage: auto-conversation-logger.py [--cleanup | --enable-incremental-vacuum]
+  --cleanup                    Run the retention cleanup now, without a time limit
+  --enable-incremental-vacuum  Switch the database to incremental auto-vacuum
+                               (one full VACUUM), so cleanups return freed pages
 """
 
 import os
 import json
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from veritas_hooks import timing
+
+_writer = None
+
+def get_writer():
+    """One conversations.db writer per process; the hook server reuses its connection"""
+    global _writer
+    if _writer is None:
+        from veritas_hooks.conversation_db import ConversationWriter
+        _writer = ConversationWriter()
+    return _writer
+
+def read_hook_input():
+    """Hook event JSON from stdin (session_id, cwd, ...), or {}"""
+    if sys.stdin is None or sys.stdin.isatty():
+        return {}
+    try:
+        data = json.loads(sys.stdin.read() or "{}")
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def session_id_for(event, project_path):
+    """Claude's session id when the event carries one, else one per project and day"""
+    session_id = event.get("session_id") or os.environ.get("CLAUDE_SESSION_ID")
+    if session_id:
+        return str(session_id)
+    import zlib
+    digest = zlib.crc32(project_path.encode("utf-8"))
+    return f"hook-{datetime.now().strftime('%Y-%m-%d')}-{digest:08x}"
 
-def log_to_mcp(role, content, tools_used=None):
-    """Send log message to conversation-logger MCP server"""
+def log_message(session_id, role, content, tools_used=None, project_path=None):
+    """Queue a message for conversations.db; written in one batch per hook run"""
     
     # Only log substantial content (not empty or very short)
     if not content or len(content.strip()) < 10:
         return
     
-    # Prepare the MCP tool call
-    tool_call = {
-        "tool": "mcp__conversation-logger__log_message",
-        "arguments": {
-            "role": role,
-            "content": content[:5000],  # Limit to 5000 chars to avoid huge logs
-            "tools_used": tools_used or []
-        }
-    }
-    
-    # Create a flag file to indicate logging is active
-    flag_file = os.path.expanduser("~/.conversation-logger/active")
-    os.makedirs(os.path.dirname(flag_file), exist_ok=True)
-    with open(flag_file, 'w') as f:
-        f.write(f"Logging active since {datetime.now().isoformat()}\n")
+    get_writer().log_message(
+        session_id,
+        role,
+        content[:5000],  # Limit to 5000 chars to avoid huge logs
+        tools_used or [],
+        project_path=project_path
+    )
 
-def cleanup_old_logs():
-    """Clean up conversation logs older than 5 days"""
-    
+def index_new_rows(writer):
+    """Add rows written since the last sync (by this hook or the MCP server) to the search index"""
     import sqlite3
-    db_path = os.path.expanduser("~/.conversation-logger/conversations.db")
+    from veritas_hooks import conversation_search
+    try:
+        conversation_search.sync(writer.connect())
+    except sqlite3.Error as e:
+        print(f"Note: Could not update the conversation search index: {e}", file=sys.stderr)
+
+def cleanup_old_logs(force=False):
+    """Delete conversation logs older than the retention period (5 days by default)
     
-    if not os.path.exists(db_path):
-        return
+    Runs when the last cleanup is older than interval_hours in
+    ~/.conversation-logger/retention.json, or when force is set.
+    """
+    import sqlite3
+    from veritas_hooks.retention import Retention
     
+    retention = Retention()
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Delete messages older than 5 days
-        five_days_ago = (datetime.now() - timedelta(days=5)).isoformat()
-        cursor.execute("""
-            DELETE FROM messages 
-            WHERE timestamp < ?
-        """, (five_days_ago,))
-        
-        # Delete activities older than 5 days
-        cursor.execute("""
-            DELETE FROM activities 
-            WHERE timestamp < ?
-        """, (five_days_ago,))
-        
-        # Delete old sessions with no messages
-        cursor.execute("""
-            DELETE FROM sessions 
-            WHERE start_time < ? 
-            AND id NOT IN (SELECT DISTINCT session_id FROM messages)
-        """, (five_days_ago,))
-        
-        changes = conn.total_changes
-        conn.commit()
-        conn.close()
-        
+        summary = retention.run(max_seconds=0) if force else retention.run_if_due()
+    except (OSError, sqlite3.Error) as e:
+        print(f"Note: Could not clean old logs: {e}", file=sys.stderr)
+        return None
+    
+    if summary:
+        changes = sum(summary["deleted"].values())
         if changes > 0:
             print(f"✓ Cleaned up {changes} old log entries", file=sys.stderr)
-        
-    except Exception as e:
-        print(f"Note: Could not clean old logs: {e}", file=sys.stderr)
+    return summary
 
 def main():
     """Main hook execution"""
+    if '--cleanup' in sys.argv[1:]:
+        summary = cleanup_old_logs(force=True)
+        if summary:
+            print(json.dumps(summary, indent=2))
+        return
+    if '--enable-incremental-vacuum' in sys.argv[1:]:
+        from veritas_hooks.retention import Retention
+        enabled = Retention().enable_incremental_vacuum()
+        print("✓ Incremental vacuum enabled" if enabled else "Note: Could not enable incremental vacuum",
+              file=sys.stderr)
+        return
+    
+    timing.start('auto-conversation-logger')
     
     # Get conversation content from environment or stdin
-    user_input = os.environ.get('CLAUDE_USER_MESSAGE', '')
+    event = read_hook_input()
+    user_input = os.environ.get('CLAUDE_USER_MESSAGE', '') or event.get('prompt', '')
     assistant_output = os.environ.get('CLAUDE_ASSISTANT_MESSAGE', '')
     tools_used = os.environ.get('CLAUDE_TOOLS_USED', '').split(',') if os.environ.get('CLAUDE_TOOLS_USED') else []
+    project_path = event.get('cwd') or os.environ.get('CLAUDE_PROJECT_DIR') or os.getcwd()
+    session_id = session_id_for(event, project_path)
     
-    # Log user message if present
-    if user_input:
-        log_to_mcp('user', user_input, [])
-    
-    # Log assistant response if present
-    if assistant_output:
-        log_to_mcp('assistant', assistant_output, tools_used)
+    with timing.phase('log_write'):
+        # Log user message if present
+        if user_input:
+            log_message(session_id, 'user', user_input, [], project_path)
+        
+        # Log assistant response if present
+        if assistant_output:
+            log_message(session_id, 'assistant', assistant_output, tools_used, project_path)
+        
+        # Both messages go in one transaction (or one spool append if the DB is
+        # locked); a run with no messages still drains an earlier spool
+        writer = get_writer()
+        spooled = writer.spooled
+        try:
+            if writer.flush():
+                index_new_rows(writer)
+        except OSError as e:
+            print(f"Note: Could not log conversation: {e}", file=sys.stderr)
+        busy = writer.spooled > spooled
+        if busy:
+            print("Note: conversations.db is busy; messages spooled for the next run", file=sys.stderr)
     
-    # Clean up old logs periodically
-    if datetime.now().hour == 2:  # Run cleanup at 2 AM
-        cleanup_old_logs()
+    # Clean up old logs once the retention interval has elapsed, unless the
+    # database was just found locked
+    if not busy:
+        with timing.phase('cleanup'):
+            cleanup_old_logs()
     
     # For SessionEnd hook, just mark completion
     print("✓ Conversation logged", file=sys.stderr)
+    timing.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+VERITAS Change Watcher
+Journals modified markdown files in the configured Obsidian vaults and the
+project directory, so post-command.py only verifies what actually changed.
+
+Uses inotify on Linux and falls back to polling elsewhere (or with --poll).
+"""
+
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks.change_journal import ChangeJournal, create_watcher, watch_roots, watch_skip
+from veritas_hooks.context import load_context
+from veritas_hooks.daemon import daemonize, read_live_pid, remove_pid_file, write_pid_file
+
+
+def main():
+    """CLI interface for the change watcher"""
+    if len(sys.argv) < 2 or sys.argv[1] not in ("run", "start", "stop", "status"):
+        print("Usage: change-watcher.py run|start|stop|status [--poll] [--interval SECONDS]")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    force_poll = "--poll" in sys.argv
+    interval = 2.0
+    if "--interval" in sys.argv:
+        interval = float(sys.argv[sys.argv.index("--interval") + 1])
+
+    context = load_context()
+    project_root = context.root
+    journal = ChangeJournal(project_root)
+    pid = read_live_pid(journal.pid_path)
+
+    if command == "status":
+        if pid:
+            print(f"Change watcher running (pid {pid})")
+        else:
+            print("Change watcher not running")
+            sys.exit(1)
+        return
+
+    if command == "stop":
+        if pid:
+            import os
+            os.kill(pid, signal.SIGTERM)
+            print(f"Change watcher stopped (pid {pid})")
+        else:
+            print("Change watcher not running")
+        return
+
+    if pid:
+        print(f"Change watcher already running (pid {pid})")
+        return
+
+    roots = watch_roots(project_root, context.vaults())
+    watcher = create_watcher(roots, journal, force_poll, interval, watch_skip(project_root))
+    print(f"Watching {len(roots)} root(s) with {type(watcher).__name__}:")
+    for root in roots:
+        print(f"  {root}")
+    sys.stdout.flush()
+
+    if command == "start":
+        daemonize(project_root / ".claude" / "logs" / "change-watcher.log")
+
+    write_pid_file(journal.pid_path)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        remove_pid_file(journal.pid_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+VERITAS Citation Report
+Extracts every PMID citation, with its position and attached verification
+tag, from the notes in the configured vaults (or the paths given), in one
+pass per file across a process pool. PMIDs are deduplicated across all files
+and checked once each against the local PubMed index (pmid-index.py) and the
+PubMed cache (pubmed-cache.py), then a per-file report lists untagged,
+unknown and mismatched citations.
+
+Usage: citation-report.py [OPTIONS] [PATH ...]
+  --json            Per-file reports and the summary as JSON lines
+  --pmids FILE      Write the distinct PMIDs to FILE ('-' for stdout), one
+                    comma-separated esummary batch per line
+  --missing         With --pmids, only PMIDs neither the index nor the cache has
+  --batch-size N    PMIDs per batch line (default 200)
+  --workers N       Extraction processes (default: CPU count)
+  --db PATH         PMID index (default ~/.veritas/pmid-index.db, or
+                    pmid_index.path in .claude/config/verification.json)
+  --cache PATH      PubMed cache (default ~/.veritas/pubmed-cache.db, or
+                    pubmed_cache.path in verification.json)
+
+Exits 1 when any citation is untagged, unknown or mismatched.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks.citations import DEFAULT_BATCH_SIZE, CitationReport, collect_files, extract_files
+from veritas_hooks.context import load_context
+from veritas_hooks.pmid_index import DEFAULT_INDEX_PATH, PMIDIndex
+from veritas_hooks.pubmed_cache import DEFAULT_CACHE_PATH, PubMedCache
+
+
+def configured_path(section, default):
+    """Database path from the project's verification.json, if set"""
+    try:
+        return Path(os.path.expanduser(load_context().verification[section]['path']))
+    except (KeyError, TypeError):
+        return default
+
+
+def main():
+    """CLI interface for the citation report"""
+    args = sys.argv[1:]
+    as_json = False
+    pmids_path = None
+    missing_only = False
+    batch_size = DEFAULT_BATCH_SIZE
+    workers = os.cpu_count() or 1
+    db_path = None
+    cache_path = None
+    targets = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--json":
+            as_json = True
+        elif arg == "--pmids":
+            pmids_path = args.pop(0)
+        elif arg == "--missing":
+            missing_only = True
+        elif arg == "--batch-size":
+            batch_size = max(1, int(args.pop(0)))
+        elif arg == "--workers":
+            workers = max(1, int(args.pop(0)))
+        elif arg == "--db":
+            db_path = Path(os.path.expanduser(args.pop(0)))
+        elif arg == "--cache":
+            cache_path = Path(os.path.expanduser(args.pop(0)))
+        elif arg in ("-h", "--help"):
+            print(__doc__.strip())
+            return
+        else:
+            targets.append(os.path.abspath(os.path.expanduser(arg)))
+
+    if not targets:
+        targets = load_context().vaults()
+        if not targets:
+            print("No Obsidian vaults configured in .claude/project.json", file=sys.stderr)
+            sys.exit(0)
+
+    started = time.perf_counter()
+    files = sorted(set(collect_files(targets)))
+    report = CitationReport()
+    errors = 0
+    for path, citations, error in extract_files(files, workers):
+        if error:
+            errors += 1
+            print(f"Note: Could not read {path}: {error}", file=sys.stderr)
+        report.add(path, citations)
+    extracted = time.perf_counter()
+
+    # One batched lookup for every distinct PMID in the vault
+    index = PMIDIndex(db_path or configured_path('pmid_index', DEFAULT_INDEX_PATH))
+    cache = PubMedCache(cache_path or configured_path('pubmed_cache', DEFAULT_CACHE_PATH))
+    if index.exists() or cache.exists():
+        report.check(index if index.exists() else None, cache if cache.exists() else None)
+
+    reports = [report.file_report(path) for path in files if report.files.get(path)]
+    failed = False
+    # With --pmids - stdout carries only the lookup list
+    out = sys.stderr if pmids_path == '-' else sys.stdout
+    for file_report in reports:
+        if file_report['issues']:
+            failed = True
+        if as_json:
+            print(json.dumps(file_report), file=out)
+            continue
+        levels = ', '.join(f"{level} {count}" for level, count in file_report['levels'].items() if count)
+        print(f"{file_report['file']}: {file_report['citations']} citation(s) ({levels})", file=out)
+        for issue in file_report['issues']:
+            problem = 'no verification tag' if issue['level'] is None and 'cited' in issue else ''
+            if issue['status'] in ('unknown_pmid', 'not_in_pubmed', 'mismatch'):
+                detail = {'unknown_pmid': 'not in PubMed index',
+                          'not_in_pubmed': 'PubMed has no such PMID'}.get(issue['status']) or \
+                    f"PubMed has {issue['indexed']}"
+                problem = f"{problem}; {detail}" if problem else detail
+            print(f"  - Line {issue['line']}: PMID {issue['pmid']} - {problem}", file=out)
+
+    summary = report.summary(reports)
+    if pmids_path:
+        exclude = report.records if missing_only and report.records is not None else ()
+        batches = report.lookup_batches(batch_size, exclude)
+        text = ''.join(batch + '\n' for batch in batches)
+        if pmids_path == '-':
+            sys.stdout.write(text)
+        else:
+            with open(pmids_path, 'w') as f:
+                f.write(text)
+        summary['lookup_batches'] = len(batches)
+
+    if as_json:
+        print(json.dumps(dict(summary, summary=True)), file=out)
+    elapsed = time.perf_counter() - started
+    print("=" * 50, file=sys.stderr)
+    print(f"Citation report: {len(files)} file(s) in {elapsed:.2f}s "
+          f"(extraction {extracted - started:.2f}s)", file=sys.stderr)
+    print(f"  Citations: {summary['citations']}  Distinct PMIDs: {summary['distinct_pmids']}  "
+          f"Read errors: {errors}", file=sys.stderr)
+    print("  Levels: " + ', '.join(f"{level} {count}" for level, count in summary['levels'].items()),
+          file=sys.stderr)
+    if report.records is not None:
+        print("  Index: " + ', '.join(f"{status} {count}" for status, count in sorted(summary['statuses'].items())),
+              file=sys.stderr)
+    else:
+        print(f"  Index: none at {index.db_path} or {cache.db_path}; PMIDs were not checked", file=sys.stderr)
+    if 'lookup_batches' in summary:
+        print(f"  Lookup list: {summary['lookup_batches']} batch(es) of up to {batch_size} PMIDs", file=sys.stderr)
+    print("=" * 50, file=sys.stderr)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+VERITAS Conversation Search
+Ranked full-text search over the messages and activities logged in
+~/.conversation-logger/conversations.db, with highlighted snippets. The
+FTS5 index is brought up to date (new rows only) before each query.
+
+Usage: conversation-search.py [OPTIONS] [TERM ...]
+  --any             Match any term instead of all of them
+  --pmid N          Only rows mentioning PMID N
+  --tool NAME       Only messages whose tools_used includes NAME
+  --activities      Search activities instead of messages
+  --all             Search messages and activities
+  --since DAYS|DATE Only rows from the last DAYS days, or on/after YYYY-MM-DD
+  --limit N         Number of results (default 20)
+  --raw             Pass the terms through as an FTS5 query expression
+  --json            Print results as JSON lines
+  --sync            Only update the index
+  --rebuild         Reindex every row from scratch
+
+Example: conversation-search.py --since 5 MFI cutoff
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks import conversation_search
+from veritas_hooks.conversation_db import DEFAULT_DB_PATH, ConversationWriter
+
+
+def parse_since(value):
+    """Lower timestamp bound in the database's UTC 'YYYY-MM-DD HH:MM:SS' format"""
+    if value.isdigit():
+        start = datetime.now(timezone.utc) - timedelta(days=int(value))
+        return start.strftime('%Y-%m-%d %H:%M:%S')
+    return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d %H:%M:%S')
+
+
+def main():
+    """CLI interface for conversation search"""
+    args = sys.argv[1:]
+    if not args or args[0] in ("-h", "--help"):
+        print(__doc__.strip())
+        return
+
+    options = {"any": False, "pmid": None, "tool": None, "sources": ("messages",), "since": None,
+               "limit": conversation_search.DEFAULT_LIMIT, "raw": False, "json": False}
+    command = "search"
+    terms = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--any":
+            options["any"] = True
+        elif arg == "--pmid":
+            options["pmid"] = args.pop(0)
+        elif arg == "--tool":
+            options["tool"] = args.pop(0)
+        elif arg == "--activities":
+            options["sources"] = ("activities",)
+        elif arg == "--all":
+            options["sources"] = ("messages", "activities")
+        elif arg == "--since":
+            options["since"] = parse_since(args.pop(0))
+        elif arg == "--limit":
+            options["limit"] = max(1, int(args.pop(0)))
+        elif arg == "--raw":
+            options["raw"] = True
+        elif arg == "--json":
+            options["json"] = True
+        elif arg in ("--sync", "--rebuild"):
+            command = arg[2:]
+        else:
+            terms.append(arg)
+
+    if not os.path.exists(DEFAULT_DB_PATH):
+        print(f"No conversation database at {DEFAULT_DB_PATH}", file=sys.stderr)
+        sys.exit(1)
+    conn = ConversationWriter().connect()
+
+    started = time.perf_counter()
+    if command == "rebuild":
+        tables = conversation_search.rebuild(conn)
+        print(f"Rebuilt the index for {', '.join(tables) or 'no tables'} in "
+              f"{time.perf_counter() - started:.2f}s", file=sys.stderr)
+        return
+    counts = conversation_search.sync(conn)
+    if not counts and not conversation_search.ensure_fts(conn):
+        print("This SQLite build has no FTS5 support", file=sys.stderr)
+        sys.exit(1)
+    if command == "sync":
+        print(f"Indexed {sum(counts.values())} new row(s) in {time.perf_counter() - started:.2f}s",
+              file=sys.stderr)
+        return
+
+    if options["raw"]:
+        query = " ".join(terms)
+    else:
+        query = conversation_search.build_query(terms, options["any"], options["pmid"], options["tool"])
+    if not query:
+        print("Nothing to search for; give terms, --pmid or --tool", file=sys.stderr)
+        sys.exit(2)
+    # Tool names are a messages column
+    sources = ("messages",) if options["tool"] else options["sources"]
+
+    try:
+        results = conversation_search.search(conn, query, sources, options["since"], options["limit"])
+    except sqlite3.OperationalError as e:
+        print(f"Invalid query {query!r}: {e}", file=sys.stderr)
+        sys.exit(2)
+    for result in results:
+        if options["json"]:
+            print(json.dumps(result))
+        else:
+            snippet = " ".join(result["snippet"].split())
+            print(f"{result['timestamp']}  {result['kind'] or '':<10} {(result['session_id'] or '')[:8]}  {snippet}")
+    print(f"{len(results)} result(s) in {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
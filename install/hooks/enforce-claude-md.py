@@ -7,42 +7,25 @@ Runs before every response to reinforce critical requirements
 
 import os
 import sys
-from pathlib import Path
 
-def find_project_root():
-    """Find the project root directory by looking for CLAUDE.md"""
-    # Get the directory where this script is located
-    script_path = Path(__file__).resolve()
-    script_dir = script_path.parent
-    
-    # If we're in .claude/hooks/, go up two levels to project root
-    if script_dir.name == "hooks" and script_dir.parent.name == ".claude":
-        project_root = script_dir.parent.parent
-        if (project_root / "CLAUDE.md").exists():
-            return project_root
-    
-    # Fallback: search upward from script directory  
-    current = script_dir
-    while current != current.parent:
-        if (current / "CLAUDE.md").exists():
-            return current
-        current = current.parent
-    
-    # Last resort: check current working directory
-    if (Path.cwd() / "CLAUDE.md").exists():
-        return Path.cwd()
-    
-    return Path.cwd()
+# Runs before every response: keep to os and sys, no pathlib or json
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from veritas_hooks import timing
+from veritas_hooks.paths import project_root_dir
 
 def enforce_claude_md():
     """Display critical CLAUDE.md requirements that must be followed"""
     
+    timing.start('enforce-claude-md')
     # Check if CLAUDE.md exists
-    project_root = find_project_root()
-    claude_md_path = project_root / "CLAUDE.md"
+    with timing.phase('root_discovery'):
+        project_root = project_root_dir()
+    claude_md_path = os.path.join(project_root, "CLAUDE.md")
     
-    if not claude_md_path.exists():
+    if not os.path.exists(claude_md_path):
         print("WARNING: CLAUDE.md not found! Critical instructions missing!", file=sys.stderr)
+        timing.finish(project_root)
         return
     
     # Output enforcement reminder (will be injected into context)
@@ -84,6 +67,7 @@ WARNING: FAILURE TO START WITH SEQUENTIAL THINKING = CONSTITUTIONAL VIOLATION
 """
     
     print(enforcement)
+    timing.finish(project_root)
 
 if __name__ == "__main__":
     enforce_claude_md()
\ No newline at end of file
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+VERITAS Hook Client
+Forwards a hook event to hook-server.py and replays its output.
+Falls back to running the hook script directly when no server is listening.
+
+Usage: hook-client.py <hook-name> [hook args...]
+Example: python3 .claude/hooks/hook-client.py post-command
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from veritas_hooks import FORWARDED_ENV, HOOKS_DIR, hook_socket_path, socket_is_trusted
+
+# Seconds to wait on each connect/recv; a hung or stalled listener falls back
+# to running the hook here
+CLIENT_TIMEOUT = 30
+
+
+def run_directly(hook, args):
+    """Replace this process with the hook script itself"""
+    script = os.path.join(HOOKS_DIR, f"{hook}.py")
+    os.execv(sys.executable, [sys.executable, script] + args)
+
+
+def record_timing(hook, started):
+    """Record the client's end-to-end latency, including interpreter startup"""
+    from veritas_hooks import timing
+    if not timing.enabled():
+        return
+    from veritas_hooks.paths import is_project_root, project_root_dir
+    project_root = project_root_dir()
+    if not is_project_root(project_root):
+        return
+    startup = timing.process_age() or 0.0
+    elapsed = time.perf_counter() - started
+    try:
+        timing.write_records(timing.ring_path(project_root), [
+            (time.time(), hook, "client_startup", startup),
+            (time.time(), hook, "client_total", startup + elapsed),
+        ])
+    except OSError:
+        pass
+
+
+def main():
+    started = time.perf_counter()
+    if len(sys.argv) < 2:
+        print("Usage: hook-client.py <hook-name> [args...]", file=sys.stderr)
+        sys.exit(1)
+
+    hook, args = sys.argv[1], sys.argv[2:]
+
+    # Only talk to a socket this user owns, in a directory only this user can write
+    socket_path = hook_socket_path()
+    if socket_path is None or not socket_is_trusted(socket_path):
+        run_directly(hook, args)
+
+    import socket
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(CLIENT_TIMEOUT)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        run_directly(hook, args)
+
+    import json
+    stdin_data = None if sys.stdin is None or sys.stdin.isatty() else sys.stdin.read()
+    request = {
+        "hook": hook,
+        "args": args,
+        "stdin": stdin_data,
+        "env": {name: os.environ[name] for name in FORWARDED_ENV if name in os.environ},
+        "cwd": os.getcwd(),
+    }
+    try:
+        client.sendall(json.dumps(request).encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+        data = b"".join(iter(lambda: client.recv(65536), b""))
+        response = json.loads(data)
+    except (OSError, ValueError):
+        # Server died or timed out mid-request; stdin is already consumed, so replay it
+        import subprocess
+        script = os.path.join(HOOKS_DIR, f"{hook}.py")
+        result = subprocess.run([sys.executable, script] + args, input=stdin_data, text=True)
+        sys.exit(result.returncode)
+    finally:
+        client.close()
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stdout.flush()
+    record_timing(hook, started)
+    sys.exit(response.get("exit_code", 0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+VERITAS Hook Server
+Long-lived process that keeps the hook modules and their verifier, router
+and enforcer instances warm, so each hook event skips interpreter startup,
+project root discovery, config parsing and regex compilation.
+
+hook-client.py forwards events over a Unix socket; when the server is not
+running the client executes the hook script directly instead.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks import FORWARDED_ENV, hook_socket_path, timing
+from veritas_hooks.daemon import daemonize
+from veritas_hooks.loader import hook_script_path, load_hook
+from veritas_hooks.paths import find_project_root
+
+# Hooks served in-process: entry point, warm instance factory and the
+# config files (relative to the project root) that invalidate the instance
+HOOKS = {
+    "post-command": {
+        "entry": "main",
+        "factory": "HLAOutputVerifier",
+        "configs": [".claude/config/verification.json", ".claude/project.json"],
+    },
+    "task-router": {
+        "entry": "main",
+        "factory": "TaskRouter",
+        "configs": [".claude/agents/hla-research-director.md", ".claude/project.json"],
+    },
+    "obsidian-enforcer": {
+        "entry": "main",
+        "factory": "ObsidianEnforcer",
+        "configs": [".claude/config/verification.json", ".claude/project.json"],
+    },
+    "enforce-claude-md": {
+        "entry": "enforce_claude_md",
+        "factory": None,
+        "configs": ["CLAUDE.md"],
+    },
+    "pre-compact": {
+        "entry": "main",
+        "factory": None,
+        "configs": [],
+    },
+    "auto-conversation-logger": {
+        "entry": "main",
+        "factory": None,
+        "configs": [],
+    },
+    "project-context": {
+        "entry": "main",
+        "factory": None,
+        "configs": [],
+    },
+}
+
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class WarmHook:
+    """A loaded hook module plus its cached instance"""
+
+    def __init__(self, name, spec, project_root):
+        self.name = name
+        self.spec = spec
+        self.watched = [hook_script_path(name)] + [
+            str(project_root / rel) for rel in spec["configs"]
+        ]
+        self.module = None
+        self.instance = None
+        self.stamps = None
+
+    def refresh(self):
+        """Reload the module and rebuild the instance if any watched file changed"""
+        stamps = [_mtime(path) for path in self.watched]
+        if stamps == self.stamps:
+            return
+        reload_module = self.module is None or stamps[0] != self.stamps[0]
+        if reload_module:
+            self.module = load_hook(self.name, reload=True)
+        self.instance = None
+        if self.spec["factory"]:
+            self.instance = getattr(self.module, self.spec["factory"])()
+        self.stamps = stamps
+
+    def run(self):
+        entry = getattr(self.module, self.spec["entry"])
+        if self.instance is not None:
+            return entry(self.instance)
+        return entry()
+
+
+class HookServer:
+    """Serves hook events one at a time over a Unix socket"""
+
+    def __init__(self, socket_path, idle_timeout=3600):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.project_root = find_project_root()
+        self.hooks = {}
+        self.running = False
+
+    def get_hook(self, name):
+        if name not in self.hooks:
+            self.hooks[name] = WarmHook(name, HOOKS[name], self.project_root)
+        hook = self.hooks[name]
+        hook.refresh()
+        return hook
+
+    def handle(self, request):
+        """Run one hook event with the client's argv, stdin, env and cwd"""
+        if request.get("command") == "shutdown":
+            self.running = False
+            return {"stdout": "", "stderr": "", "exit_code": 0}
+        if request.get("command") == "ping":
+            return {"stdout": "pong\n", "stderr": "", "exit_code": 0}
+
+        name = request.get("hook")
+        if name not in HOOKS:
+            return {"stdout": "", "stderr": f"Unknown hook: {name}\n", "exit_code": 2}
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        saved_argv, saved_stdin = sys.argv, sys.stdin
+        saved_env, saved_cwd = dict(os.environ), os.getcwd()
+        exit_code = 0
+        try:
+            sys.argv = [hook_script_path(name)] + list(request.get("args", []))
+            sys.stdin = io.StringIO(request.get("stdin") or "")
+            # The client forwards only FORWARDED_ENV; the rest stays the server's own
+            env = request.get("env")
+            if isinstance(env, dict):
+                for key in FORWARDED_ENV:
+                    os.environ.pop(key, None)
+                os.environ.update((key, str(value)) for key, value in env.items() if key in FORWARDED_ENV)
+            if request.get("cwd"):
+                os.chdir(request["cwd"])
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    self.get_hook(name).run()
+                except SystemExit as e:
+                    if isinstance(e.code, int):
+                        exit_code = e.code
+                    elif e.code is not None:
+                        print(e.code, file=sys.stderr)
+                        exit_code = 1
+                except Exception:
+                    traceback.print_exc()
+                    exit_code = 1
+                    # Drop the cached state in case the failure left it inconsistent
+                    self.hooks.pop(name, None)
+        finally:
+            sys.argv, sys.stdin = saved_argv, saved_stdin
+            os.environ.clear()
+            os.environ.update(saved_env)
+            with contextlib.suppress(OSError):
+                os.chdir(saved_cwd)
+
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+    def serve_connection(self, conn):
+        chunks, size = [], 0
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > MAX_REQUEST_BYTES:
+                raise ValueError("request too large")
+            chunks.append(chunk)
+        response = self.handle(json.loads(b"".join(chunks)))
+        conn.sendall(json.dumps(response).encode("utf-8"))
+
+    def serve_forever(self):
+        """Listen until shutdown or idle timeout; OSError if the socket cannot be bound"""
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        server.settimeout(self.idle_timeout or None)
+
+        # Preload the hooks so the first event is already warm
+        for name in HOOKS:
+            with contextlib.suppress(Exception):
+                self.get_hook(name)
+
+        self.running = True
+        try:
+            while self.running:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    break  # Idle: let the next client fall back and restart us
+                with conn:
+                    conn.settimeout(30)
+                    try:
+                        self.serve_connection(conn)
+                    except Exception as e:
+                        print(f"hook-server: request failed: {e}", file=sys.stderr)
+        finally:
+            server.close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+
+
+def send_command(socket_path, command, timeout=5):
+    """Send a control command (ping/shutdown) to a running server"""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(socket_path)
+        client.sendall(json.dumps({"command": command}).encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+        data = b"".join(iter(lambda: client.recv(65536), b""))
+        return json.loads(data)
+    finally:
+        client.close()
+
+
+def main():
+    """CLI interface for the hook server"""
+    if len(sys.argv) < 2 or sys.argv[1] not in ("run", "start", "stop", "status"):
+        print("Usage: hook-server.py run|start|stop|status [--idle-timeout SECONDS]")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    idle_timeout = 3600
+    if "--idle-timeout" in sys.argv:
+        idle_timeout = int(sys.argv[sys.argv.index("--idle-timeout") + 1])
+    socket_path = hook_socket_path()
+    if socket_path is None:
+        print("No private runtime directory for the hook socket ($XDG_RUNTIME_DIR/veritas or ~/.veritas/run)",
+              file=sys.stderr)
+        sys.exit(1)
+
+    if command in ("status", "stop"):
+        try:
+            send_command(socket_path, "ping" if command == "status" else "shutdown")
+        except OSError:
+            print(f"Hook server not running ({socket_path})")
+            sys.exit(1 if command == "status" else 0)
+        print(f"Hook server {'running' if command == 'status' else 'stopped'} ({socket_path})")
+        return
+
+    if command == "start":
+        with contextlib.suppress(OSError):
+            send_command(socket_path, "ping", timeout=1)
+            print(f"Hook server already running ({socket_path})")
+            return
+        daemonize(find_project_root() / ".claude" / "logs" / "hook-server.log")
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    timing.in_server = True
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] hook-server listening on {socket_path}")
+    sys.stdout.flush()
+    try:
+        HookServer(socket_path, idle_timeout).serve_forever()
+    except OSError as e:
+        print(f"hook-server: cannot listen on {socket_path}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+VERITAS Hook Stats
+Reports hook latency percentiles from the timing ring buffer that the hooks
+write to .claude/state/hook-timings.bin (see veritas_hooks/timing.py).
+
+One row per hook and phase: run count, p50/p95/p99 and max in milliseconds.
+"total" covers a whole hook run; "client_total" is the end-to-end latency
+seen through hook-client.py, including interpreter startup.
+
+Usage: hook-stats.py [--hook NAME] [--since HOURS] [--json]
+"""
+
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks import timing
+from veritas_hooks.paths import find_project_root
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(records, hook_filter=None, since=None):
+    """Group (timestamp, hook, phase, seconds) records into percentile rows"""
+    groups = defaultdict(list)
+    for timestamp, hook, phase, seconds in records:
+        if hook_filter and hook != hook_filter:
+            continue
+        if since is not None and timestamp < since:
+            continue
+        groups[(hook, phase)].append(seconds * 1000)
+
+    rows = []
+    for (hook, phase), values in sorted(groups.items()):
+        values.sort()
+        rows.append({
+            'hook': hook,
+            'phase': phase,
+            'runs': len(values),
+            'p50_ms': round(percentile(values, 50), 3),
+            'p95_ms': round(percentile(values, 95), 3),
+            'p99_ms': round(percentile(values, 99), 3),
+            'max_ms': round(values[-1], 3),
+        })
+    return rows
+
+
+def main():
+    """CLI interface for hook timing stats"""
+    args = sys.argv[1:]
+    hook_filter = None
+    since = None
+    as_json = False
+    while args:
+        arg = args.pop(0)
+        if arg == "--hook":
+            hook_filter = args.pop(0)
+        elif arg == "--since":
+            since = time.time() - float(args.pop(0)) * 3600
+        elif arg == "--json":
+            as_json = True
+        elif arg in ("-h", "--help"):
+            print(__doc__.strip())
+            return
+        else:
+            print(f"Unknown argument: {arg}", file=sys.stderr)
+            sys.exit(2)
+
+    path = timing.ring_path(find_project_root())
+    rows = summarize(timing.read_records(path), hook_filter, since)
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        print(f"No timings recorded in {path}")
+        return
+
+    print(f"{'HOOK':<26}{'PHASE':<18}{'RUNS':>6}{'P50 ms':>10}{'P95 ms':>10}{'P99 ms':>10}{'MAX ms':>10}")
+    for row in rows:
+        print(f"{row['hook']:<26}{row['phase']:<18}{row['runs']:>6}"
+              f"{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}{row['max_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+VERITAS Wiki-Link Index
+Builds and queries the index of note names, aliases and [[links]] in the
+project's Obsidian vaults, which post-command.py and obsidian-enforcer.py use
+to flag dangling links and suggest the closest existing notes.
+
+Commands:
+  refresh         Reindex notes added, changed or removed since the last run
+  check FILE ...  Print the dangling links in each file as JSON lines
+  dangling        Print every dangling link in the vaults as JSON lines
+  stats           Print the number of indexed notes, names and links
+
+Options: --db PATH (default .claude/cache/wiki-links.db, or link_index.path in
+.claude/config/verification.json)
+
+Usage: link-index.py refresh|check|dangling|stats [--db PATH] [ARGS ...]
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks.context import load_context
+from veritas_hooks.link_index import LinkIndex, open_index
+
+
+def main():
+    """CLI interface for the wiki-link index"""
+    args = sys.argv[1:]
+    db_path = None
+    if "--db" in args:
+        position = args.index("--db")
+        db_path = Path(os.path.expanduser(args[position + 1]))
+        del args[position:position + 2]
+    if not args or args[0] in ("-h", "--help"):
+        print(__doc__.strip())
+        return
+
+    command, args = args[0], args[1:]
+    index = open_index(load_context())
+    if index is None:
+        print("No Obsidian vaults configured for this project (or link_index is disabled)",
+              file=sys.stderr)
+        sys.exit(1)
+    if db_path is not None:
+        index = LinkIndex(db_path, index.vaults)
+
+    if command == "refresh":
+        started = time.perf_counter()
+        counts = index.refresh()
+        print(f"{index.db_path}: {counts['notes']} note(s), {counts['updated']} reindexed, "
+              f"{counts['removed']} removed in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    elif command == "check":
+        index.refresh()
+        status = 0
+        for path in args:
+            try:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    dangling = index.check_text(f.read(), refresh=False)
+            except OSError as e:
+                print(f"{path}: {e}", file=sys.stderr)
+                status = 2
+                continue
+            for link in dangling:
+                print(json.dumps(dict(link, path=path)))
+            if dangling and not status:
+                status = 1
+        sys.exit(status)
+    elif command == "dangling":
+        index.refresh()
+        for path, line, column, target in index.dangling():
+            print(json.dumps({'path': path, 'line': line, 'column': column, 'target': target,
+                              'suggestions': index.suggest(target)}))
+    elif command == "stats":
+        stats = index.stats()
+        print(f"{index.db_path}: {stats['notes']} note(s), {stats['names']} name(s), "
+              f"{stats['links']} link(s)")
+    else:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
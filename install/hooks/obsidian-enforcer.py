@@ -2,24 +2,41 @@
 """
 Obsidian MCP Enforcer
 Automatically routes all Obsidian-related operations to correct MCP tools
+
+Batch mode fixes and validates many notes in one run:
+  obsidian-enforcer.py batch [--write] [--workers N] [--chunk-size N] [PATH ...]
+Directories and files given as PATHs are expanded to their .md notes;
+without PATHs, JSON lines are read from stdin, each {"path": ...} or
+{"content": ...} with optional "filename" and "type". One JSON result per
+operation is written to stdout, and --write rewrites changed files in place.
+Results list dangling wiki links when the project has a vault link index.
 """
 
 import json
+import os
 import sys
 import re
-from pathlib import Path
 from typing import Dict, List, Optional
 
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from veritas_hooks import timing
+
+# The Markdown fixer and outline parser are imported by the commands that
+# need them; "check" on a non-Obsidian operation exits without them
+DATE_NAME_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+SPACED_LINK_RE = re.compile(r'\[\[([A-Za-z\s]+)\]\]')
+
 class ObsidianEnforcer:
     """Enforces Obsidian MCP usage for vault operations"""
     
     def __init__(self):
-        # Use Path.home() for dynamic user directory
-        home = Path.home()
+        # Expand ~ for dynamic user directory
+        obsidian = os.path.join(os.path.expanduser("~"), "Library/CloudStorage/Box-Box/Obsidian")
         self.vault_paths = {
-            "research_questions": str(home / "Library/CloudStorage/Box-Box/Obsidian/HLA Antibodies/Research Questions/"),
-            "concepts": str(home / "Library/CloudStorage/Box-Box/Obsidian/HLA Antibodies/Concepts/"),
-            "journal": str(home / "Library/CloudStorage/Box-Box/Obsidian/Research Journal/Daily/")
+            "research_questions": os.path.join(obsidian, "HLA Antibodies/Research Questions"),
+            "concepts": os.path.join(obsidian, "HLA Antibodies/Concepts"),
+            "journal": os.path.join(obsidian, "Research Journal/Daily")
         }
         
         self.file_naming_rules = {
@@ -39,24 +56,22 @@ class ObsidianEnforcer:
         
         self.wiki_link_pattern = r"\[\[([A-Za-z_\s]+)\]\]"
         
+        # Vault link index, opened on first use (False when unavailable)
+        self._link_index = None
+        
     def detect_content_type(self, content: str, filename: str = "") -> str:
         """Determine what type of Obsidian content this is"""
         
-        # Check by tags in frontmatter
-        if "tags: [research-question" in content:
-            return "research_question"
-        elif "tags: [concept" in content:
-            return "concept"
-        elif "tags: [daily-log" in content:
-            return "journal"
-        
-        # Check by content patterns
-        if "## Direct Answer" in content and "## Evidence-Based Key Points" in content:
-            return "research_question"
-        elif "## Key Innovation" in content and "## Clinical Benefits" in content:
-            return "concept"
-        elif "## Session Summary" in content:
-            return "journal"
+        from veritas_hooks.outline import TEMPLATES, parse_outline
+        
+        # Frontmatter tags, then the template's section headings, from one
+        # pass over the note
+        outline = parse_outline(content)
+        if outline.tag_template:
+            return outline.tag_template
+        for name, template in TEMPLATES.items():
+            if all(outline.has_heading(marker) for marker in template['markers']):
+                return name
         
         # Check by filename
         if filename:
@@ -64,7 +79,7 @@ class ObsidianEnforcer:
                 return "research_question"
             elif any(term in filename for term in ["Protocol", "Method", "Analysis"]):
                 return "concept"
-            elif re.match(r"\d{4}-\d{2}-\d{2}", filename):
+            elif DATE_NAME_RE.match(filename):
                 return "journal"
         
         return "unknown"
@@ -104,31 +119,34 @@ class ObsidianEnforcer:
             link_text = match.group(1)
             return f"[[{link_text.replace(' ', '_')}]]"
         
-        content = re.sub(r'\[\[([A-Za-z\s]+)\]\]', replace_spaces, content)
+        content = SPACED_LINK_RE.sub(replace_spaces, content)
         return content
     
+    def link_index(self):
+        """Wiki-link index for the project's vaults, or None"""
+        if self._link_index is None:
+            from veritas_hooks.context import load_context
+            from veritas_hooks.link_index import open_index
+            self._link_index = open_index(load_context()) or False
+        return self._link_index or None
+    
+    def check_wiki_links(self, content: str, refresh: bool = True) -> Optional[List[Dict]]:
+        """Dangling wiki links with their closest existing notes; None without a vault index"""
+        import sqlite3
+        index = self.link_index()
+        if index is None:
+            return None
+        try:
+            return index.check_text(content, refresh)
+        except sqlite3.Error:
+            return None
+    
     def fix_formatting(self, content: str) -> str:
-        """Fix common formatting issues"""
-        # Replace escaped newlines with actual newlines
-        content = content.replace('\\n', '\n')
-        
-        # Fix table formatting (ensure spaces around pipes)
-        lines = content.split('\n')
-        fixed_lines = []
-        for line in lines:
-            if '|' in line and not line.startswith('```'):
-                # Add spaces around pipes if missing
-                line = re.sub(r'\|([^\s|])', r'| \1', line)
-                line = re.sub(r'([^\s|])\|', r'\1 |', line)
-            fixed_lines.append(line)
-        content = '\n'.join(fixed_lines)
-        
-        # Replace HTML entities with actual symbols
-        content = content.replace('&gt;', '>')
-        content = content.replace('&lt;', '<')
-        content = content.replace('&amp;', '&')
-        
-        return content
+        """Fix common formatting issues outside code and frontmatter"""
+        from veritas_hooks.markdown import fix_markdown
+        # Escaped newlines, table pipes and HTML entities, fixed in one pass
+        # that leaves fenced code, inline code and YAML frontmatter untouched
+        return fix_markdown(content)
     
     def get_correct_path(self, content_type: str) -> str:
         """Get the correct vault path for this content type"""
@@ -154,6 +172,9 @@ class ObsidianEnforcer:
         # Get correct path
         base_path = self.get_correct_path(content_type)
         
+        # Links to notes that don't exist, with the closest existing names
+        dangling = self.check_wiki_links(content)
+        
         return {
             "tool": "mcp__obsidian-rest-hla__test_request",
             "parameters": {
@@ -166,7 +187,8 @@ class ObsidianEnforcer:
             },
             "validation": validation,
             "content_type": content_type,
-            "full_path": f"{base_path}{filename}"
+            "full_path": f"{base_path}{filename}",
+            "dangling_links": dangling or []
         }
     
     def enforce_compliance(self, operation: Dict) -> Dict:
@@ -188,10 +210,10 @@ class ObsidianEnforcer:
                 if "content" in operation:
                     content_type = self.detect_content_type(
                         operation["content"], 
-                        Path(operation["path"]).name
+                        os.path.basename(operation["path"])
                     )
                     result["mcp_command"] = self.generate_mcp_command(
-                        Path(operation["path"]).name,
+                        os.path.basename(operation["path"]),
                         operation["content"],
                         content_type
                     )
@@ -200,19 +222,85 @@ class ObsidianEnforcer:
         
         return result
 
-def main():
+def refresh_link_index():
+    """Bring the vault link index up to date before a batch run"""
+    import sqlite3
+    index = ObsidianEnforcer().link_index()
+    if index is not None:
+        try:
+            index.refresh()
+        except sqlite3.Error:
+            pass
+        index.close()
+
+def batch(args):
+    """Fix and validate many notes; JSON results go to stdout, a summary to stderr"""
+    import time
+    from veritas_hooks import note_batch
+    
+    workers = os.cpu_count() or 1
+    chunk_size = 16
+    write = False
+    targets = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--workers":
+            workers = max(1, int(args.pop(0)))
+        elif arg == "--chunk-size":
+            chunk_size = max(1, int(args.pop(0)))
+        elif arg == "--write":
+            write = True
+        else:
+            targets.append(os.path.abspath(os.path.expanduser(arg)))
+    
+    if targets:
+        items = note_batch.iter_note_operations(targets)
+    else:
+        items = note_batch.iter_operations(sys.stdin)
+    
+    started = time.perf_counter()
+    refresh_link_index()
+    counts = {"notes": 0, "changed": 0, "written": 0, "invalid_names": 0, "dangling_links": 0, "errors": 0}
+    for result in note_batch.run(items, workers, chunk_size, write):
+        counts["notes"] += 1
+        if "error" in result:
+            counts["errors"] += 1
+        else:
+            counts["changed"] += result["changed"]
+            counts["written"] += result["written"]
+            if result["validation"] and not result["validation"]["valid"]:
+                counts["invalid_names"] += 1
+            counts["dangling_links"] += len(result.get("dangling_links", ()))
+        sys.stdout.write(json.dumps(result) + "\n")
+    
+    elapsed = time.perf_counter() - started
+    print("=" * 50, file=sys.stderr)
+    print(f"Obsidian batch: {counts['notes']} note(s) in {elapsed:.2f}s with {workers} worker(s)", file=sys.stderr)
+    print(f"  Changed: {counts['changed']}  Written: {counts['written']}  "
+          f"Invalid names: {counts['invalid_names']}  Dangling links: {counts['dangling_links']}  "
+          f"Errors: {counts['errors']}", file=sys.stderr)
+    print("=" * 50, file=sys.stderr)
+    sys.exit(1 if counts["errors"] else 0)
+
+def main(enforcer=None):
     """CLI interface for the enforcer"""
     if len(sys.argv) < 2:
-        print("Usage: obsidian-enforcer.py check|fix|validate")
+        print("Usage: obsidian-enforcer.py check|fix|validate|batch")
         sys.exit(1)
     
     command = sys.argv[1]
-    enforcer = ObsidianEnforcer()
+    if command == "batch":
+        batch(sys.argv[2:])
+        return
+    timing.start('obsidian-enforcer')
+    with timing.phase('init'):
+        enforcer = enforcer or ObsidianEnforcer()
     
     if command == "check":
         # Read operation from stdin
         operation = json.loads(sys.stdin.read())
-        result = enforcer.enforce_compliance(operation)
+        with timing.phase('check'):
+            result = enforcer.enforce_compliance(operation)
         print(json.dumps(result, indent=2))
     
     elif command == "validate":
@@ -223,15 +311,19 @@ def main():
         
         filename = sys.argv[2]
         content_type = sys.argv[3]
-        result = enforcer.validate_filename(filename, content_type)
+        with timing.phase('validate'):
+            result = enforcer.validate_filename(filename, content_type)
         print(json.dumps(result, indent=2))
     
     elif command == "fix":
         # Fix formatting in content
         content = sys.stdin.read()
-        fixed = enforcer.fix_formatting(content)
-        fixed = enforcer.fix_wiki_links(fixed)
+        with timing.phase('fix'):
+            fixed = enforcer.fix_formatting(content)
+            fixed = enforcer.fix_wiki_links(fixed)
         print(fixed)
+    
+    timing.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
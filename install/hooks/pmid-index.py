@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+VERITAS PMID Index
+Builds and queries the local PubMed metadata index that post-command.py uses
+to confirm cited PMIDs exist and match their first author and year.
+
+Commands:
+  load FILE ...   Load PubMed baseline/update XML (.xml, .xml.gz) or JSON
+                  exports (esummary output, a JSON list, or JSON lines)
+  lookup PMID ... Print indexed records as JSON lines
+  stats           Print the number of indexed articles
+
+Options: --db PATH (default ~/.veritas/pmid-index.db, or pmid_index.path in
+.claude/config/verification.json)
+
+Usage: pmid-index.py load|lookup|stats [--db PATH] [ARGS ...]
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks.context import load_context
+from veritas_hooks.pmid_index import DEFAULT_INDEX_PATH, PMIDIndex
+
+
+def configured_path():
+    """Index path from the project's verification.json, if set"""
+    try:
+        return Path(os.path.expanduser(load_context().verification['pmid_index']['path']))
+    except (KeyError, TypeError):
+        return DEFAULT_INDEX_PATH
+
+
+def main():
+    """CLI interface for the PMID index"""
+    args = sys.argv[1:]
+    db_path = None
+    if "--db" in args:
+        position = args.index("--db")
+        db_path = Path(os.path.expanduser(args[position + 1]))
+        del args[position:position + 2]
+    if not args or args[0] in ("-h", "--help"):
+        print(__doc__.strip())
+        return
+
+    command, args = args[0], args[1:]
+    index = PMIDIndex(db_path or configured_path())
+
+    if command == "load":
+        total = 0
+        for path in args:
+            started = time.perf_counter()
+            upserted, deleted = index.load(path)
+            total += upserted
+            print(f"{path}: {upserted} loaded, {deleted} deleted in "
+                  f"{time.perf_counter() - started:.1f}s", file=sys.stderr)
+        print(f"Index {index.db_path}: {index.count()} article(s)", file=sys.stderr)
+    elif command in ("lookup", "stats"):
+        if not index.exists():
+            print(f"No index at {index.db_path}; build it with: pmid-index.py load FILE ...",
+                  file=sys.stderr)
+            sys.exit(1)
+        if command == "stats":
+            print(f"{index.db_path}: {index.count()} article(s)")
+            return
+        pmids = [int(pmid) for pmid in args if pmid.isdigit()]
+        records = index.lookup(pmids)
+        for pmid in pmids:
+            record = records.get(pmid)
+            if record is None:
+                print(json.dumps({'pmid': pmid, 'found': False}))
+            else:
+                first_author, year, epub_year = record
+                print(json.dumps({'pmid': pmid, 'found': True, 'first_author': first_author,
+                                  'year': year, 'epub_year': epub_year}))
+    else:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,56 +7,19 @@ echo "=================================="
 echo "VERITAS Constitutional Enforcement"
 echo "=================================="
 
-# Function to find project root (where CLAUDE.md exists)
-find_project_root() {
-    # Get the directory where this script is located
-    local script_dir="$(cd "$(dirname "$0")" && pwd)"
-    
-    # If we're in .claude/hooks/, go up two levels to project root
-    if [[ "$script_dir" == *"/.claude/hooks" ]]; then
-        local project_root="$(cd "$script_dir/../.." && pwd)"
-        if [ -f "$project_root/CLAUDE.md" ]; then
-            echo "$project_root"
-            return 0
-        fi
-    fi
-    
-    # Fallback: search upward from current directory
-    local current_dir="$script_dir"
-    while [ "$current_dir" != "/" ]; do
-        if [ -f "$current_dir/CLAUDE.md" ]; then
-            echo "$current_dir"
-            return 0
-        fi
-        current_dir="$(dirname "$current_dir")"
-    done
-    
-    # Last resort: check current working directory
-    if [ -f "$(pwd)/CLAUDE.md" ]; then
-        echo "$(pwd)"
-        return 0
-    fi
-    
-    return 1
+# Project root and project.json fields, parsed once by veritas_hooks.context
+# and cached between runs (PROJECT_ROOT, PROJECT_FOUND, PROJECT_TITLE, ...)
+load_project_variables() {
+    local hook_dir="$(cd "$(dirname "$0")" && pwd)"
+    eval "$(python3 "$hook_dir/hook-client.py" project-context --shell < /dev/null)"
 }
 
 # Function to load project context if available
 load_project_context() {
-    local project_root="$1"
-    local project_json="$project_root/.claude/project.json"
-    
-    if [ -f "$project_json" ]; then
-        # Extract project info using grep and sed (portable)
-        PROJECT_TITLE=$(grep -o '"title"[[:space:]]*:[[:space:]]*"[^"]*"' "$project_json" | sed 's/.*: *"\(.*\)"/\1/')
-        PROJECT_ICON=$(grep -o '"icon"[[:space:]]*:[[:space:]]*"[^"]*"' "$project_json" | sed 's/.*: *"\(.*\)"/\1/')
-        PROJECT_NAME=$(grep -o '"name"[[:space:]]*:[[:space:]]*"[^"]*"' "$project_json" | sed 's/.*: *"\(.*\)"/\1/')
-        PROJECT_TYPE=$(grep -o '"type"[[:space:]]*:[[:space:]]*"[^"]*"' "$project_json" | sed 's/.*: *"\(.*\)"/\1/')
-        
-        if [ -n "$PROJECT_TITLE" ]; then
-            echo "$PROJECT_TITLE Pre-Command Check"
-            echo "Project: $PROJECT_NAME"
-            return 0
-        fi
+    if [ -n "$PROJECT_TITLE" ]; then
+        echo "$PROJECT_TITLE Pre-Command Check"
+        echo "Project: $PROJECT_NAME"
+        return 0
     fi
     
     # Default if no project context
@@ -97,33 +60,16 @@ EOF
 
 # Function to display project-specific context
 display_project_context() {
-    local project_json="$1"
-    
-    if [ ! -f "$project_json" ]; then
-        return 1
-    fi
-    
     # Check if medical research project
-    if grep -q '"type"[[:space:]]*:[[:space:]]*"medical_research"' "$project_json"; then
+    if [ -n "$PROJECT_MEDICAL" ]; then
         echo ""
         echo "PROJECT CONTEXT:"
         
-        # Extract and display grant details if present
-        if grep -q '"grant_details"' "$project_json"; then
-            GRANT_TYPE=$(grep -A5 '"grant_details"' "$project_json" | grep '"type"' | sed 's/.*: *"\(.*\)".*/\1/')
-            SUBMISSION=$(grep -A5 '"grant_details"' "$project_json" | grep '"submission"' | sed 's/.*: *"\(.*\)".*/\1/')
-            
-            [ -n "$GRANT_TYPE" ] && echo "- Grant: $GRANT_TYPE"
-            [ -n "$SUBMISSION" ] && echo "- Submission: $SUBMISSION"
-        fi
-        
-        # Extract focus if present
-        FOCUS=$(grep -o '"focus"[[:space:]]*:[[:space:]]*"[^"]*"' "$project_json" | sed 's/.*: *"\(.*\)"/\1/')
-        [ -n "$FOCUS" ] && echo "- Focus: $FOCUS"
-        
-        # Extract stage if present
-        STAGE=$(grep -o '"stage"[[:space:]]*:[[:space:]]*"[^"]*"' "$project_json" | sed 's/.*: *"\(.*\)"/\1/')
-        [ -n "$STAGE" ] && echo "- Stage: $STAGE"
+        # Grant details, focus and stage if present
+        [ -n "$GRANT_TYPE" ] && echo "- Grant: $GRANT_TYPE"
+        [ -n "$GRANT_SUBMISSION" ] && echo "- Submission: $GRANT_SUBMISSION"
+        [ -n "$PROJECT_FOCUS" ] && echo "- Focus: $PROJECT_FOCUS"
+        [ -n "$PROJECT_STAGE" ] && echo "- Stage: $PROJECT_STAGE"
         
         echo ""
         echo "STRICT ENFORCEMENT MODE: Medical/Scientific"
@@ -206,14 +152,14 @@ echo "Running pre-command checks..."
 echo ""
 
 # Find project root
-PROJECT_ROOT=$(find_project_root)
-if [ $? -ne 0 ]; then
+load_project_variables
+if [ -z "$PROJECT_FOUND" ]; then
     echo "⚠️  WARNING: Not in a VERITAS project (no CLAUDE.md found)"
     PROJECT_ROOT="."
 fi
 
 # Load project context if available
-load_project_context "$PROJECT_ROOT"
+load_project_context
 
 # Check for CLAUDE.md
 check_claude_md "$PROJECT_ROOT"
@@ -222,7 +168,7 @@ check_claude_md "$PROJECT_ROOT"
 display_veritas_requirements
 
 # Display project-specific context
-display_project_context "$PROJECT_ROOT/.claude/project.json"
+display_project_context
 
 # Check command context
 check_command_context
@@ -2,7 +2,13 @@
 """
 Pre-Compact Hook - Automatic Conversation Logger
 Triggers when Claude Code is about to compact the conversation.
-This captures the full conversation before summarization.
+This captures the full conversation before summarization: the lines added
+to the session transcript since the last checkpoint are stored gzip-compressed
+under ~/.conversation-logger/checkpoints and logged as a pre_compact activity.
+
+Usage: pre-compact.py [--list [SESSION_ID] | --restore SESSION_ID]
+  --list [SESSION_ID]   Checkpointed sessions, or one session's checkpoints
+  --restore SESSION_ID  Write the session's checkpointed transcript to stdout
 """
 
 import os
@@ -10,30 +16,96 @@ import json
 import sys
 from datetime import datetime
 
-def log_conversation_before_compact():
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from veritas_hooks import timing
+
+_writer = None
+
+def get_writer():
+    """One conversations.db writer per process; the hook server reuses its connection"""
+    global _writer
+    if _writer is None:
+        from veritas_hooks.conversation_db import ConversationWriter
+        _writer = ConversationWriter()
+    return _writer
+
+def read_hook_input():
+    """PreCompact event JSON from stdin (session_id, transcript_path, trigger, cwd), or {}"""
+    if sys.stdin is None or sys.stdin.isatty():
+        return {}
+    try:
+        data = json.loads(sys.stdin.read() or "{}")
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def checkpoint_transcript(event, project_path):
+    """Store the transcript's new lines as a compressed checkpoint and log it
+
+    Returns the checkpoint entry, or None when the event has no readable
+    transcript.
     """
-    Logs the current conversation to conversation-logger MCP
-    This runs right before compaction, capturing the full conversation
+    from veritas_hooks.checkpoint import CheckpointStore
+
+    transcript_path = event.get('transcript_path')
+    if not transcript_path or not os.path.isfile(os.path.expanduser(transcript_path)):
+        return None
+    session_id = str(event.get('session_id') or os.environ.get('CLAUDE_SESSION_ID') or 'unknown')
+    store = CheckpointStore()
+    try:
+        entry = store.capture(session_id, os.path.expanduser(transcript_path),
+                              trigger=event.get('trigger', 'auto'), project_path=project_path)
+    except OSError as e:
+        print(f"Note: Could not checkpoint the transcript: {e}", file=sys.stderr)
+        return None
+
+    if entry['segment']:
+        print(f"✓ Checkpoint: {entry['lines']} new transcript line(s), {entry['turns']} turn(s), "
+              f"{entry['bytes'] / 1024:.0f} KB stored as {entry['stored_bytes'] / 1024:.0f} KB", file=sys.stderr)
+    else:
+        print("✓ Checkpoint: no new transcript lines since the last one", file=sys.stderr)
+
+    # Recorded as an activity so the checkpoint shows up in conversation search
+    writer = get_writer()
+    writer.log_activity(
+        session_id, 'pre_compact',
+        f"Transcript checkpoint before {entry['trigger']} compaction: "
+        f"{entry.get('lines', 0)} new line(s), {entry.get('turns', 0)} turn(s)",
+        dict({key: entry.get(key) for key in ('segment', 'start', 'end', 'lines', 'turns', 'bytes', 'stored_bytes')},
+             manifest=store.manifest_path(session_id)),
+        project_path=project_path)
+    writer.flush()
+    return entry
+
+def log_conversation_before_compact(event=None):
+    """
+    Checkpoints the transcript before compaction
+    Falls back to asking Claude to log via the conversation-logger MCP when
+    the hook event carries no transcript path
     """
+    event = event or {}
 
     # Get conversation context from environment
     conversation_length = os.environ.get('CLAUDE_CONVERSATION_LENGTH', '0')
     context_used = os.environ.get('CLAUDE_CONTEXT_USED_PERCENT', '0')
-    project_path = os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
+    project_path = event.get('cwd') or os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
 
     # Log to stderr (visible to user)
     print(f"⚠ Conversation compacting at {context_used}% context usage", file=sys.stderr)
     print(f"📝 Auto-logging conversation before compaction...", file=sys.stderr)
 
-    # Output special format that Claude Code can use to invoke MCP tool
-    # This is a hint to Claude to log the conversation
-    output = {
-        "systemMessage": "IMPORTANT: Before compacting, please log this conversation using the conversation-logger MCP tool. Use mcp__conversation-logger__log_activity with activity_type='pre_compact' and include the current conversation summary.",
-        "additionalContext": f"Conversation about to compact at {context_used}% context. Project: {project_path}",
-        "suggestedAction": "log_conversation"
-    }
+    entry = checkpoint_transcript(event, project_path)
+    if entry is None:
+        # Output special format that Claude Code can use to invoke MCP tool
+        # This is a hint to Claude to log the conversation
+        output = {
+            "systemMessage": "IMPORTANT: Before compacting, please log this conversation using the conversation-logger MCP tool. Use mcp__conversation-logger__log_activity with activity_type='pre_compact' and include the current conversation summary.",
+            "additionalContext": f"Conversation about to compact at {context_used}% context. Project: {project_path}",
+            "suggestedAction": "log_conversation"
+        }
 
-    print(json.dumps(output, indent=2))
+        print(json.dumps(output, indent=2))
 
     # Also create a marker file
     marker_dir = os.path.expanduser("~/.conversation-logger")
@@ -45,18 +117,85 @@ def log_conversation_before_compact():
             "timestamp": datetime.now().isoformat(),
             "context_used": context_used,
             "project_path": project_path,
-            "conversation_length": conversation_length
+            "conversation_length": conversation_length,
+            "session_id": event.get('session_id'),
+            "checkpoint": entry and entry['segment']
         }, f, indent=2)
 
     print(f"✓ Compact marker created", file=sys.stderr)
 
+    # Catch the search index up with what the MCP server logged this session
+    index_conversations()
+
+def index_conversations():
+    """Sync the conversation search index with conversations.db, if it exists"""
+    import sqlite3
+    from veritas_hooks import conversation_search
+    from veritas_hooks.conversation_db import DEFAULT_DB_PATH
+
+    if not os.path.exists(DEFAULT_DB_PATH):
+        return
+    try:
+        counts = conversation_search.sync(get_writer().connect())
+    except sqlite3.Error as e:
+        print(f"Note: Could not update the conversation search index: {e}", file=sys.stderr)
+        return
+    if sum(counts.values()):
+        print(f"✓ Indexed {sum(counts.values())} logged row(s) for search", file=sys.stderr)
+
+def list_checkpoints(session_id=None):
+    """Print the checkpoints of one session, or a line per checkpointed session"""
+    from veritas_hooks.checkpoint import CheckpointStore
+
+    store = CheckpointStore()
+    for sid in [session_id] if session_id else store.session_ids():
+        manifest = store.manifest(sid)
+        if manifest is None:
+            print(f"No checkpoints for session {sid}", file=sys.stderr)
+            continue
+        segments = [entry for entry in manifest["checkpoints"] if entry.get("segment")]
+        if not session_id:
+            print(f"{manifest['session_id']}  {len(manifest['checkpoints'])} checkpoint(s), "
+                  f"{sum(entry['lines'] for entry in segments)} line(s)  {manifest.get('transcript_path', '')}")
+            continue
+        for entry in manifest["checkpoints"]:
+            if entry.get("segment"):
+                print(f"{entry['timestamp']}  {entry.get('trigger', ''):<6}  lines {entry['lines']:>6}  "
+                      f"turns {entry['turns']:>5}  {entry['segment'][:12]}")
+            else:
+                print(f"{entry['timestamp']}  {entry.get('trigger', ''):<6}  (no new lines)")
+
+def restore_transcript(session_id):
+    """Write a session's checkpointed transcript to stdout"""
+    from veritas_hooks.checkpoint import CheckpointStore
+
+    data = CheckpointStore().transcript(session_id)
+    if data is None:
+        print(f"No checkpoints for session {session_id}", file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.buffer.write(data)
+
 def main():
     """Main hook execution"""
+    args = sys.argv[1:]
+    if args and args[0] == '--list':
+        list_checkpoints(args[1] if len(args) > 1 else None)
+        return
+    if args and args[0] == '--restore':
+        if len(args) < 2:
+            print("Usage: pre-compact.py --restore SESSION_ID", file=sys.stderr)
+            sys.exit(2)
+        restore_transcript(args[1])
+        return
+
+    timing.start('pre-compact')
     try:
-        log_conversation_before_compact()
+        with timing.phase('log_write'):
+            log_conversation_before_compact(read_hook_input())
     except Exception as e:
         print(f"Note: Pre-compact logging hook error: {e}", file=sys.stderr)
         # Don't fail the hook - compaction should still proceed
+    timing.finish()
 
 if __name__ == "__main__":
     main()
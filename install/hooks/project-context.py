@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+VERITAS Project Context
+Prints the project context shared by the hooks (root, project.json,
+verification.json and the domain expert agent file), as cached by
+veritas_hooks.context.
+
+  --shell  NAME='value' assignments for the shell hooks to eval
+  --json   The parsed context as JSON (default)
+
+Usage: project-context.py [--shell|--json]
+"""
+
+import json
+import shlex
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks.context import load_context
+
+
+def shell_variables(context):
+    """Variables pre-command.sh used to grep out of project.json"""
+    def text(value):
+        return "" if value is None else str(value)
+
+    return [
+        ("PROJECT_ROOT", str(context.root)),
+        ("PROJECT_FOUND", "1" if context.has_claude_md else ""),
+        ("PROJECT_TITLE", text(context.value("title"))),
+        ("PROJECT_ICON", text(context.value("icon"))),
+        ("PROJECT_NAME", text(context.value("name"))),
+        ("PROJECT_TYPE", text(context.project_type)),
+        ("PROJECT_MEDICAL", "1" if context.is_medical else ""),
+        ("PROJECT_FOCUS", text(context.value("focus"))),
+        ("PROJECT_STAGE", text(context.value("stage"))),
+        ("GRANT_TYPE", text(context.grant_detail("type"))),
+        ("GRANT_SUBMISSION", text(context.grant_detail("submission"))),
+    ]
+
+
+def main():
+    """CLI interface for the project context"""
+    context = load_context()
+    if "--shell" in sys.argv[1:]:
+        for name, value in shell_variables(context):
+            print(f"{name}={shlex.quote(value)}")
+        return
+    print(json.dumps({
+        "root": str(context.root),
+        "has_claude_md": context.has_claude_md,
+        "project": context.project,
+        "verification": context.verification,
+        "agent_fields": context.agent_fields(),
+        "vaults": context.vaults(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+VERITAS PubMed Cache
+Fills and inspects the offline cache of PubMed summaries that post-command.py
+and citation-report.py consult for PMIDs the local index does not have.
+Only PMIDs that are not cached, or whose entry has expired, are requested
+from E-utilities esummary, in batches paced to NCBI's rate limits
+(PUBMED_API_KEY and PUBMED_EMAIL are used when set; PUBMED_ESUMMARY_URL
+replaces the NCBI endpoint).
+
+Commands:
+  warm [PATH ...]  Fetch every PMID cited in PATH (default: the configured
+                   vaults) that is not cached yet
+  fetch PMID ...   Fetch the given PMIDs if they are not cached yet
+  import FILE ...  Cache esummary JSON saved from another client
+  lookup PMID ...  Print cached entries as JSON lines
+  stats            Print entry counts
+  prune            Trim the cache to max_entries, least recently used first
+
+Options:
+  --db PATH        Cache path (default ~/.veritas/pubmed-cache.db, or
+                   pubmed_cache.path in .claude/config/verification.json)
+  --force          With warm or fetch, refresh entries that have not expired
+  --workers N      Extraction processes for warm (default: CPU count)
+
+Usage: pubmed-cache.py warm|fetch|import|lookup|stats|prune [OPTIONS] [ARGS ...]
+"""
+
+import json
+import os
+import sys
+import time
+import urllib.error
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks.citations import collect_files, extract_files
+from veritas_hooks.context import load_context
+from veritas_hooks.pubmed_cache import DEFAULT_CACHE_PATH, ESummaryFetcher, PubMedCache, load_settings
+
+
+def configured_cache():
+    """The cache at the path and with the settings in the project's verification.json"""
+    config = load_context().verification.get('pubmed_cache')
+    config = config if isinstance(config, dict) else {}
+    path = Path(os.path.expanduser(config.get('path', str(DEFAULT_CACHE_PATH))))
+    return PubMedCache(path, load_settings(config))
+
+
+def cited_pmids(targets, workers):
+    """Distinct PMIDs cited in the notes under targets"""
+    files = sorted(set(collect_files(targets)))
+    pmids = set()
+    for path, citations, error in extract_files(files, workers):
+        if error:
+            print(f"Note: Could not read {path}: {error}", file=sys.stderr)
+        pmids.update(citation[2] for citation in citations)
+    return files, pmids
+
+
+def refresh(cache, pmids, force):
+    """Fetch what the cache lacks; exits 1 on a network error"""
+    started = time.perf_counter()
+    pending = sorted(pmids) if force else cache.expired(pmids)
+    print(f"{len(pmids)} PMID(s), {len(pmids) - len(pending)} cached, {len(pending)} to fetch",
+          file=sys.stderr)
+    try:
+        fetched, missing = cache.refresh(pending, ESummaryFetcher(), force=True)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"esummary request failed: {e}; batches fetched so far are cached", file=sys.stderr)
+        sys.exit(1)
+    if pending:
+        print(f"Fetched {fetched} summaries, {missing} PMID(s) not in PubMed in "
+              f"{time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+def main():
+    """CLI interface for the PubMed cache"""
+    args = sys.argv[1:]
+    cache = None
+    force = False
+    workers = os.cpu_count() or 1
+    if "--db" in args:
+        position = args.index("--db")
+        cache = PubMedCache(Path(os.path.expanduser(args[position + 1])))
+        del args[position:position + 2]
+    if "--workers" in args:
+        position = args.index("--workers")
+        workers = max(1, int(args[position + 1]))
+        del args[position:position + 2]
+    if "--force" in args:
+        force = True
+        args.remove("--force")
+    if not args or args[0] in ("-h", "--help"):
+        print(__doc__.strip())
+        return
+
+    command, args = args[0], args[1:]
+    cache = cache or configured_cache()
+
+    if command == "warm":
+        targets = [os.path.abspath(os.path.expanduser(arg)) for arg in args] or load_context().vaults()
+        if not targets:
+            print("No Obsidian vaults configured in .claude/project.json", file=sys.stderr)
+            sys.exit(0)
+        files, pmids = cited_pmids(targets, workers)
+        print(f"{len(files)} note(s) scanned", file=sys.stderr)
+        refresh(cache, pmids, force)
+    elif command == "fetch":
+        refresh(cache, {int(pmid) for pmid in args if pmid.isdigit()}, force)
+    elif command == "import":
+        for path in args:
+            print(f"{path}: {cache.import_file(path)} summaries cached", file=sys.stderr)
+    elif command in ("lookup", "stats", "prune"):
+        if not cache.exists():
+            print(f"No cache at {cache.db_path}; fill it with: pubmed-cache.py warm", file=sys.stderr)
+            sys.exit(1)
+        if command == "stats":
+            print(f"{cache.db_path}: " + ', '.join(f"{key} {value}" for key, value in cache.stats().items()))
+        elif command == "prune":
+            print(f"Removed {cache.prune()} entr(ies)")
+        else:
+            for pmid in (int(pmid) for pmid in args if pmid.isdigit()):
+                entry = cache.get(pmid)
+                print(json.dumps(entry if entry is not None else {'pmid': pmid, 'cached': False}))
+    else:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,14 @@ Task Router - Enforces correct tool usage based on task type
 Prevents filesystem operations when Obsidian MCP should be used
 """
 
+import os
 import sys
-import json
-import re
-from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from veritas_hooks import timing
+from veritas_hooks.context import load_context
+from veritas_hooks.lexicon import Lexicon
 
 class TaskRouter:
     def __init__(self):
@@ -19,63 +23,28 @@ class TaskRouter:
         ]
         
     def load_config(self):
-        """Load agent configuration"""
-        # Find project root dynamically
-        project_root = self._find_project_root()
-        agent_path = project_root / ".claude" / "agents" / "hla-research-director.md"
-        if agent_path.exists():
-            return agent_path.read_text()
-        return ""
+        """Load agent configuration from the shared project context"""
+        with timing.phase('context_load'):
+            context = load_context()
+        self.project_root = context.root_dir
+        # Default phrases plus the project's own terms from project.json
+        # ("task_router": {"lexicon": {"obsidian_task": ["crossmatch", ...]}})
+        router_config = context.project.get('task_router')
+        self.lexicon = Lexicon(router_config.get('lexicon') if isinstance(router_config, dict) else None)
+        return context.agent_text
     
-    def _find_project_root(self):
-        """Find the project root directory by looking for CLAUDE.md"""
-        # Get the directory where this script is located
-        script_path = Path(__file__).resolve()
-        script_dir = script_path.parent
-        
-        # If we're in .claude/hooks/, go up two levels to project root
-        if script_dir.name == "hooks" and script_dir.parent.name == ".claude":
-            project_root = script_dir.parent.parent
-            if (project_root / "CLAUDE.md").exists():
-                return project_root
-        
-        # Fallback: search upward from script directory
-        current = script_dir
-        while current != current.parent:
-            if (current / "CLAUDE.md").exists():
-                return current
-            current = current.parent
-        
-        # Last resort: check current working directory
-        if (Path.cwd() / "CLAUDE.md").exists():
-            return Path.cwd()
-        
-        return Path.cwd()
+    def classify(self, user_input):
+        """Task type plus per-category scores and matched phrase spans"""
+        return self.lexicon.classify(user_input)
     
     def detect_task_type(self, user_input):
         """Determine what type of task is being requested"""
-        input_lower = user_input.lower()
-        
-        # Research question and Rules indicators
-        if any(phrase in input_lower for phrase in [
-            "research question", "add to obsidian", "create concept",
-            "vault", "obsidian", "template", "wiki link",
-            "rule", "algorithm rule", "epitope", "mfi threshold",
-            "vendor specific", "serologic", "rule_epitope", "rule_mfi"
-        ]):
-            return "obsidian_task"
-        
-        # Code/analysis indicators
-        if any(phrase in input_lower for phrase in [
-            "analyze", "code", "implement", "debug", "test"
-        ]):
-            return "code_task"
-            
-        return "general_task"
+        return self.lexicon.classify(user_input)['task_type']
     
     def get_required_tools(self, task_type):
         """Return the required tools for this task type"""
         if task_type == "obsidian_task":
+            obsidian = os.path.join(os.path.expanduser("~"), "Library/CloudStorage/Box-Box/Obsidian")
             return {
                 "required": [
                     "mcp__sequential-thinking__sequentialthinking",
@@ -88,10 +57,10 @@ class TaskRouter:
                     "Edit"
                 ],
                 "paths": {
-                    "research_questions": str(Path.home() / "Library/CloudStorage/Box-Box/Obsidian/HLA Antibodies/Research Questions/"),
-                    "concepts": str(Path.home() / "Library/CloudStorage/Box-Box/Obsidian/HLA Antibodies/Concepts/"),
-                    "rules": str(Path.home() / "Library/CloudStorage/Box-Box/Obsidian/HLA Antibodies/Rules/"),
-                    "journal": str(Path.home() / "Library/CloudStorage/Box-Box/Obsidian/Research Journal/Daily/")
+                    "research_questions": os.path.join(obsidian, "HLA Antibodies/Research Questions"),
+                    "concepts": os.path.join(obsidian, "HLA Antibodies/Concepts"),
+                    "rules": os.path.join(obsidian, "HLA Antibodies/Rules"),
+                    "journal": os.path.join(obsidian, "Research Journal/Daily")
                 }
             }
         return {"required": [], "forbidden": []}
@@ -151,22 +120,25 @@ THIS IS MANDATORY - VIOLATIONS WILL BE REJECTED
 """
         return ""
 
-def main():
+def main(router=None):
     """Main execution"""
+    timing.start('task-router')
     # Get user input from environment or stdin
     user_input = sys.stdin.read() if not sys.stdin.isatty() else ""
     
-    router = TaskRouter()
-    task_type = router.detect_task_type(user_input)
+    router = router or TaskRouter()
+    with timing.phase('classify'):
+        task_type = router.detect_task_type(user_input)
     
     if task_type == "obsidian_task":
         enforcement = router.generate_enforcement_message(task_type, user_input)
         print(enforcement)
         
         # Set environment variable to track enforcement
-        import os
         os.environ['TASK_TYPE'] = 'obsidian_task'
         os.environ['ENFORCE_OBSIDIAN_MCP'] = '1'
+    
+    timing.finish(router.project_root)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+VERITAS Verification Log
+Queries the audit trail that post-command.py appends to
+.claude/logs/verification.jsonl (and its rotated verification.N.jsonl files).
+
+Commands:
+  query   Print matching records as JSON lines (default)
+  summary Count runs, failures and findings by type for the matching records
+  import  Merge legacy verification_<timestamp>.json files into the store
+          (--remove deletes them once imported)
+
+Filters: --since DATE, --until DATE (ISO dates or datetimes), --file SUBSTRING,
+--type FINDING_TYPE, --failed, --limit N
+
+Usage: verification-log.py [query|summary|import] [filters] [--remove]
+"""
+
+import json
+import sys
+from collections import Counter
+from datetime import datetime, time as day_time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks.audit_log import AuditLog, parse_timestamp
+from veritas_hooks.paths import find_project_root
+
+
+def parse_bound(value, end_of_day=False):
+    """A bare date covers the whole day: --until 2025-08-27 includes that day"""
+    stamp = parse_timestamp(value)
+    if len(value) == 10 and end_of_day:
+        stamp = datetime.combine(stamp.date(), day_time.max)
+    return stamp
+
+
+def matches(record, file_filter, type_filter, failed_only):
+    if failed_only and record.get('passed', True):
+        return False
+    if file_filter and file_filter not in (record.get('file') or ''):
+        return False
+    if type_filter:
+        findings = record.get('violations', []) + record.get('warnings', [])
+        if not any(finding.get('type') == type_filter for finding in findings):
+            return False
+    return True
+
+
+def import_legacy(audit, log_dir, remove=False):
+    """Merge legacy per-run JSON files into the store, keeping time order"""
+    legacy = sorted(log_dir.glob("verification_*.json"))
+    merged = []
+    for path in legacy:
+        try:
+            with open(path, 'r') as f:
+                record = json.load(f)
+            record['timestamp'] = parse_timestamp(record['timestamp']).isoformat(timespec='microseconds')
+        except (OSError, ValueError, KeyError, TypeError):
+            print(f"Skipping unreadable {path.name}", file=sys.stderr)
+            continue
+        record.setdefault('file', None)
+        merged.append(record)
+    imported = len(merged)
+
+    # Readers rely on records being in time order, so rewrite the store
+    if imported:
+        merged.extend(audit.records())
+        merged.sort(key=lambda record: parse_timestamp(record['timestamp']))
+        for path in audit.files():
+            path.unlink()
+        for record in merged:
+            audit.append(record)
+        audit.flush()
+    if remove:
+        for path in legacy:
+            path.unlink(missing_ok=True)
+    print(f"Imported {imported} of {len(legacy)} legacy log file(s)", file=sys.stderr)
+
+
+def main():
+    """CLI interface for the verification audit log"""
+    args = sys.argv[1:]
+    command = "query"
+    if args and args[0] in ("query", "summary", "import"):
+        command = args.pop(0)
+
+    since = until = file_filter = type_filter = None
+    failed_only = False
+    remove = False
+    limit = None
+    while args:
+        arg = args.pop(0)
+        if arg == "--since":
+            since = parse_bound(args.pop(0))
+        elif arg == "--until":
+            until = parse_bound(args.pop(0), end_of_day=True)
+        elif arg == "--file":
+            file_filter = args.pop(0)
+        elif arg == "--type":
+            type_filter = args.pop(0)
+        elif arg == "--failed":
+            failed_only = True
+        elif arg == "--limit":
+            limit = max(0, int(args.pop(0)))
+        elif arg == "--remove":
+            remove = True
+        elif arg in ("-h", "--help"):
+            print(__doc__.strip())
+            return
+        else:
+            print(f"Unknown argument: {arg}", file=sys.stderr)
+            sys.exit(2)
+
+    log_dir = find_project_root() / ".claude" / "logs"
+    audit = AuditLog(log_dir)
+
+    if command == "import":
+        import_legacy(audit, log_dir, remove)
+        return
+
+    shown = 0
+    runs = failed = 0
+    counts = Counter()
+    for record in audit.records(since, until):
+        if not matches(record, file_filter, type_filter, failed_only):
+            continue
+        if command == "query":
+            sys.stdout.write(json.dumps(record) + "\n")
+        else:
+            runs += 1
+            failed += 0 if record.get('passed', True) else 1
+            for finding in record.get('violations', []) + record.get('warnings', []):
+                counts[finding.get('type', 'unknown')] += 1
+        shown += 1
+        if limit is not None and shown >= limit:
+            break
+
+    if command == "summary":
+        print(f"Runs: {runs}  Failed: {failed}")
+        for finding_type, count in counts.most_common():
+            print(f"  {finding_type}: {count}")
+
+
+if __name__ == "__main__":
+    main()
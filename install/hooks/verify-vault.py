@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+VERITAS Vault Verifier
+Runs the HLAOutputVerifier checks over every markdown note in the Obsidian
+vaults listed in .claude/project.json (or the paths given on the command
+line), fanned out across a process pool.
+
+Results stream to stdout as JSON lines, one per file; a throughput summary
+is printed to stderr. Exits 1 when any file has violations.
+
+The per-block result cache is off by default: a full sweep touches every
+note once, so cache writes cost more than they save. Pass --use-cache for
+repeated sweeps over mostly unchanged vaults.
+
+Usage: verify-vault.py [--workers N] [--chunk-size N] [--use-cache] [PATH ...]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from veritas_hooks.change_journal import walk_markdown
+from veritas_hooks.loader import load_hook
+from veritas_hooks.context import load_context
+from veritas_hooks.link_index import open_index
+
+_verifier = None
+_use_cache = False
+
+
+def _init_worker(use_cache):
+    """Build one warm verifier per worker process"""
+    global _verifier, _use_cache
+    _verifier = load_hook("post-command").HLAOutputVerifier()
+    _use_cache = use_cache
+
+
+def verify_file(path):
+    """Verify one note; returns a JSON-serializable result"""
+    started = time.perf_counter()
+    try:
+        _verifier.reset()
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            size = os.fstat(f.fileno()).st_size
+            cacheable = _use_cache and size <= _verifier.cache_max_file_bytes
+            passed = _verifier.run_checks(f, path=path, cache=cacheable)
+        return {
+            'file': path,
+            'bytes': size,
+            'passed': passed,
+            'violations': _verifier.violations,
+            'warnings': _verifier.warnings,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)
+        }
+    except Exception as e:
+        return {'file': path, 'bytes': 0, 'passed': False, 'error': str(e),
+                'violations': [], 'warnings': []}
+
+
+def collect_files(targets):
+    """Expand vault directories into .md files; plain files are kept as-is"""
+    for target in targets:
+        if os.path.isdir(target):
+            for path, _mtime in walk_markdown(target):
+                yield path
+        elif os.path.isfile(target):
+            yield target
+
+
+def main():
+    """CLI interface for vault verification"""
+    args = sys.argv[1:]
+    workers = os.cpu_count() or 1
+    chunk_size = 8
+    use_cache = False
+    targets = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--workers":
+            workers = max(1, int(args.pop(0)))
+        elif arg == "--chunk-size":
+            chunk_size = max(1, int(args.pop(0)))
+        elif arg == "--use-cache":
+            use_cache = True
+        elif arg in ("-h", "--help"):
+            print(__doc__.strip())
+            return
+        else:
+            targets.append(os.path.abspath(os.path.expanduser(arg)))
+
+    if not targets:
+        targets = load_context().vaults()
+        if not targets:
+            print("No Obsidian vaults configured in .claude/project.json", file=sys.stderr)
+            sys.exit(0)
+
+    files = sorted(set(collect_files(targets)))
+    started = time.perf_counter()
+    # Refresh the wiki-link index once so workers only read it
+    link_index = open_index(load_context())
+    if link_index is not None:
+        try:
+            link_index.refresh()
+        except sqlite3.Error:
+            pass
+        link_index.close()
+    total_bytes = 0
+    failed = 0
+    errors = 0
+    total_violations = 0
+    total_warnings = 0
+
+    with ProcessPoolExecutor(max_workers=min(workers, max(1, len(files))),
+                             initializer=_init_worker, initargs=(use_cache,)) as pool:
+        for result in pool.map(verify_file, files, chunksize=chunk_size):
+            total_bytes += result['bytes']
+            total_violations += len(result['violations'])
+            total_warnings += len(result['warnings'])
+            if 'error' in result:
+                errors += 1
+            if not result['passed']:
+                failed += 1
+            sys.stdout.write(json.dumps(result) + "\n")
+
+    elapsed = time.perf_counter() - started
+    rate = len(files) / elapsed if elapsed > 0 else 0.0
+    throughput = total_bytes / 1e6 / elapsed if elapsed > 0 else 0.0
+    print("=" * 50, file=sys.stderr)
+    print(f"Vault verification: {len(files)} file(s) in {elapsed:.2f}s with {workers} worker(s)", file=sys.stderr)
+    print(f"  Passed: {len(files) - failed}  Failed: {failed}  Errors: {errors}", file=sys.stderr)
+    print(f"  Violations: {total_violations}  Warnings: {total_warnings}", file=sys.stderr)
+    print(f"  Throughput: {rate:.1f} files/s, {throughput:.2f} MB/s", file=sys.stderr)
+    print("=" * 50, file=sys.stderr)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
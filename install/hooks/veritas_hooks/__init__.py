@@ -0,0 +1,78 @@
+"""
+VERITAS hook support package
+Shared helpers used by the hook scripts in this directory.
+Kept import-light: hooks on the before-every-tool path import this module.
+"""
+
+import os
+import stat
+
+# Directory holding the hook scripts (.claude/hooks/ once installed)
+HOOKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Environment variables the hooks read; hook-client.py forwards only these
+# to the server, never the whole environment
+FORWARDED_ENV = (
+    'HOME',
+    'CLAUDE_PROJECT_DIR',
+    'CLAUDE_SESSION_ID',
+    'CLAUDE_USER_MESSAGE',
+    'CLAUDE_ASSISTANT_MESSAGE',
+    'CLAUDE_TOOLS_USED',
+    'CLAUDE_CONVERSATION_LENGTH',
+    'CLAUDE_CONTEXT_USED_PERCENT',
+    'TASK_TYPE',
+    'ENFORCE_OBSIDIAN_MCP',
+    'VERITAS_HOOK_TIMINGS',
+)
+
+
+def is_private(path):
+    """True when path is owned by this user and not group- or world-writable"""
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return info.st_uid == os.getuid() and not info.st_mode & 0o022
+
+
+def runtime_dir():
+    """Per-user 0700 directory for the hook socket and the context snapshot
+
+    $XDG_RUNTIME_DIR/veritas, else ~/.veritas/run. None when it cannot be
+    created or belongs to someone else; callers then do without it.
+    """
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    path = os.path.join(base, 'veritas') if base else os.path.join(os.path.expanduser('~'), '.veritas', 'run')
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+            return None
+        if info.st_mode & 0o077:
+            os.chmod(path, 0o700)
+    except OSError:
+        return None
+    return path
+
+
+def hook_socket_path():
+    """Unix socket used by hook-server.py for this hooks directory, or None"""
+    override = os.environ.get('VERITAS_HOOK_SOCKET')
+    if override:
+        return override
+    directory = runtime_dir()
+    if directory is None:
+        return None
+
+    import zlib
+    # One server per installed hooks directory; keep the path short because
+    # macOS limits AF_UNIX paths to 104 bytes. crc32 rather than hashlib,
+    # whose import alone costs the client milliseconds
+    digest = zlib.crc32(HOOKS_DIR.encode('utf-8'))
+    return os.path.join(directory, f"hooks-{digest:08x}.sock")
+
+
+def socket_is_trusted(path):
+    """True when the socket and its directory both belong to this user alone"""
+    return is_private(os.path.dirname(path) or '.') and is_private(path)
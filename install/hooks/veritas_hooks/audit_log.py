@@ -0,0 +1,139 @@
+"""
+Append-only, size-rotated JSONL audit store for verification results
+Replaces one verification_<timestamp>.json file per run. Records are
+buffered and written in batches; the live file rotates to
+verification.1.jsonl ... verification.N.jsonl once it exceeds max_bytes.
+"""
+
+import atexit
+import fcntl
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+DEFAULT_BATCH_SIZE = 50
+# Buffered records older than this are flushed on the next append
+DEFAULT_FLUSH_SECONDS = 5.0
+
+
+def parse_timestamp(value):
+    """Parse ISO timestamps and the legacy %Y%m%d_%H%M%S format"""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.strptime(value, "%Y%m%d_%H%M%S")
+
+
+class AuditLog:
+    """Batched writer and reader for one rotated JSONL log"""
+
+    def __init__(self, log_dir, name="verification", max_bytes=DEFAULT_MAX_BYTES,
+                 backups=DEFAULT_BACKUPS, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_seconds=DEFAULT_FLUSH_SECONDS):
+        self.log_dir = Path(log_dir)
+        self.name = name
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.path = self.log_dir / f"{name}.jsonl"
+        self.lock_path = self.log_dir / f".{name}.lock"
+        self.buffer = []
+        self.buffered_since = None
+        self._pid = os.getpid()
+        atexit.register(self.flush)
+
+    def rotated_path(self, index):
+        return self.log_dir / f"{self.name}.{index}.jsonl"
+
+    def append(self, record):
+        """Queue a record; written once the batch fills or ages out"""
+        if not self.buffer:
+            self.buffered_since = time.monotonic()
+        self.buffer.append(json.dumps(record, separators=(',', ':')) + "\n")
+        if (len(self.buffer) >= self.batch_size
+                or time.monotonic() - self.buffered_since >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        """Write buffered records in one append, rotating first if needed"""
+        if not self.buffer or os.getpid() != self._pid:
+            return  # Nothing to do, or a forked child holding the parent's buffer
+        data = "".join(self.buffer).encode("utf-8")
+        self.buffer = []
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(data) > self.max_bytes:
+                self._rotate()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    def _rotate(self):
+        oldest = self.rotated_path(self.backups)
+        if oldest.exists():
+            oldest.unlink()
+        for index in range(self.backups - 1, 0, -1):
+            source = self.rotated_path(index)
+            if source.exists():
+                source.rename(self.rotated_path(index + 1))
+        if self.backups > 0:
+            self.path.rename(self.rotated_path(1))
+        else:
+            self.path.unlink()
+
+    def files(self):
+        """Existing log files, oldest first"""
+        candidates = [self.rotated_path(i) for i in range(self.backups, 0, -1)] + [self.path]
+        return [path for path in candidates if path.exists()]
+
+    @staticmethod
+    def _last_timestamp(path):
+        """Timestamp of the final record, read from the end of the file"""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            f.seek(max(0, end - 65536))
+            lines = f.read().splitlines()
+        for line in reversed(lines):
+            try:
+                return parse_timestamp(json.loads(line)["timestamp"])
+            except (ValueError, KeyError, TypeError):
+                continue
+        return None
+
+    def records(self, since=None, until=None):
+        """Yield stored records in time order, skipping files that end before since"""
+        self.flush()
+        since = parse_timestamp(since) if since else None
+        until = parse_timestamp(until) if until else None
+        for path in self.files():
+            if since is not None:
+                last = self._last_timestamp(path)
+                if last is not None and last < since:
+                    continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        stamp = parse_timestamp(record["timestamp"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if since is not None and stamp < since:
+                        continue
+                    if until is not None and stamp > until:
+                        return
+                    yield record
@@ -0,0 +1,322 @@
+"""
+Markdown change journal for the configured Obsidian vaults
+change-watcher.py appends modified .md paths here as they change (inotify
+on Linux, periodic polling elsewhere); post-command.py drains the journal
+instead of walking the disk on every event.
+"""
+
+import fcntl
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from .daemon import read_live_pid
+
+# Directories never worth watching inside a vault
+SKIP_DIRS = {".git", ".obsidian", ".trash", ".Trash", "node_modules", "__pycache__"}
+
+# Top-level project directories holding hooks, agents, installers and docs
+# rather than research output; their markdown is not verified
+PROJECT_SKIP_DIRS = (".claude", ".git", "install")
+
+# Compact the journal once it has been fully drained and grown past this
+COMPACT_BYTES = 1024 * 1024
+
+
+def resolve_vault_path(vault):
+    """Resolve a project.json vault entry the same way post-command.sh does"""
+    vault = os.path.expanduser(vault.strip())
+    if os.path.isabs(vault) and os.path.isdir(vault):
+        return vault
+    # Relative entries (e.g. "/Obsidian/HLA Antibodies") live under Box
+    return os.path.join(str(Path.home()), "Library/CloudStorage/Box-Box", vault.lstrip("/"))
+
+
+def configured_vaults(project):
+    """Existing vault directories from a parsed project.json"""
+    if not isinstance(project, dict):
+        return []
+    enforcement = project.get("enforcement")
+    vaults = (enforcement.get("obsidian_vaults") if isinstance(enforcement, dict) else None) \
+        or project.get("obsidian_vaults") or []
+    roots = []
+    for vault in vaults:
+        if not isinstance(vault, str) or not vault.strip():
+            continue
+        path = resolve_vault_path(vault)
+        if os.path.isdir(path) and path not in roots:
+            roots.append(path)
+    return roots
+
+
+def vault_roots(project_root):
+    """Existing Obsidian vault directories listed in .claude/project.json"""
+    project_json = Path(project_root) / ".claude" / "project.json"
+    try:
+        with open(project_json, 'r') as f:
+            project = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return configured_vaults(project)
+
+
+def watch_roots(project_root, vaults=None):
+    """Directories whose markdown changes are journaled: vaults plus the project"""
+    roots = list(vault_roots(project_root) if vaults is None else vaults)
+    project_root = str(project_root)
+    if project_root not in roots:
+        roots.append(project_root)
+    return roots
+
+
+def watch_skip(project_root):
+    """Directories under the project root left out of the journal (PROJECT_SKIP_DIRS)"""
+    return frozenset(os.path.join(str(project_root), name) for name in PROJECT_SKIP_DIRS)
+
+
+def walk_markdown(root, skip=()):
+    """Yield (path, mtime) for every .md file below root"""
+    for path, stat in walk_markdown_stats(root, skip):
+        yield path, stat.st_mtime
+
+
+def walk_markdown_stats(root, skip=()):
+    """Yield (path, stat_result) for every .md file below root, outside the skip directories"""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS and entry.path not in skip:
+                                stack.append(entry.path)
+                        elif entry.name.endswith(".md") and entry.is_file():
+                            yield entry.path, entry.stat()
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def recent_markdown(roots, max_age=120, skip=()):
+    """One-off scan of roots for .md files modified in the last max_age seconds"""
+    cutoff = time.time() - max_age
+    recent = {}
+    for root in roots:
+        for path, mtime in walk_markdown(root, skip):
+            if mtime >= cutoff:
+                recent[path] = mtime
+    return recent
+
+
+class ChangeJournal:
+    """Append-only log of (mtime, path) records with a consumer cursor"""
+
+    def __init__(self, project_root):
+        self.state_dir = Path(project_root) / ".claude" / "state"
+        self.journal_path = self.state_dir / "changes.log"
+        self.cursor_path = self.state_dir / "changes.cursor"
+        self.pid_path = self.state_dir / "change-watcher.pid"
+
+    def watcher_running(self):
+        """True when a change-watcher.py process is feeding this journal"""
+        return read_live_pid(self.pid_path) is not None
+
+    def record(self, changes):
+        """Append changes, an iterable of (path, mtime) pairs"""
+        lines = "".join(f"{mtime:.6f}\t{path}\n" for path, mtime in changes if "\n" not in path)
+        if not lines:
+            return
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(lines)
+
+    def drain(self):
+        """Return {path: mtime} recorded since the last drain and advance the cursor"""
+        try:
+            f = open(self.journal_path, 'r+', encoding='utf-8')
+        except FileNotFoundError:
+            return {}
+
+        changes = {}
+        with f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                offset = int(self.cursor_path.read_text().strip())
+            except (OSError, ValueError):
+                offset = 0
+            size = os.fstat(f.fileno()).st_size
+            if offset > size:
+                offset = 0  # Journal was replaced underneath us
+
+            f.seek(offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # Partial write; pick it up next time
+                offset += len(line.encode('utf-8'))
+                mtime, _, path = line.rstrip("\n").partition("\t")
+                try:
+                    changes[path] = max(float(mtime), changes.get(path, 0.0))
+                except ValueError:
+                    continue
+
+            if offset >= size and size > COMPACT_BYTES:
+                f.truncate(0)
+                offset = 0
+            self.cursor_path.write_text(f"{offset}\n")
+
+        # Deleted or renamed-away files have nothing left to verify
+        return {path: mtime for path, mtime in changes.items() if os.path.isfile(path)}
+
+
+class PollingWatcher:
+    """Portable fallback: rescans the roots every interval seconds"""
+
+    def __init__(self, roots, journal, interval=2.0, skip=()):
+        self.roots = roots
+        self.journal = journal
+        self.interval = interval
+        self.skip = skip
+        self.snapshot = {}
+
+    def scan(self):
+        current = {}
+        for root in self.roots:
+            for path, mtime in walk_markdown(root, self.skip):
+                current[path] = mtime
+        return current
+
+    def run(self):
+        self.snapshot = self.scan()
+        while True:
+            time.sleep(self.interval)
+            current = self.scan()
+            changed = [(path, mtime) for path, mtime in current.items()
+                       if self.snapshot.get(path) != mtime]
+            self.journal.record(changed)
+            self.snapshot = current
+
+
+class InotifyWatcher:
+    """Linux inotify watcher; records each .md file as it is closed or moved in"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+
+    def __init__(self, roots, journal, skip=()):
+        import ctypes
+        import ctypes.util
+
+        self.roots = roots
+        self.journal = journal
+        self.skip = skip
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = self.libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+
+    @staticmethod
+    def available():
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+            return hasattr(libc, "inotify_init1")
+        except OSError:
+            return False
+
+    def add_tree(self, root):
+        """Watch root and every subdirectory; journal the .md files already there"""
+        stack = [root]
+        found = []
+        while stack:
+            current = stack.pop()
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(current), self.WATCH_MASK)
+            if wd < 0:
+                continue  # Vanished or unreadable
+            self.watches[wd] = current
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False) and entry.name not in SKIP_DIRS \
+                                and entry.path not in self.skip:
+                            stack.append(entry.path)
+                        elif entry.name.endswith(".md"):
+                            found.append(entry.path)
+            except OSError:
+                continue
+        return found
+
+    def record_paths(self, paths):
+        changes = []
+        for path in paths:
+            try:
+                changes.append((path, os.stat(path).st_mtime))
+            except OSError:
+                continue
+        self.journal.record(changes)
+
+    def run(self):
+        import struct
+
+        for root in self.roots:
+            self.add_tree(root)
+
+        header = struct.Struct("iIII")
+        while True:
+            buf = os.read(self.fd, 64 * 1024)
+            changed = []
+            pos = 0
+            while pos + header.size <= len(buf):
+                wd, mask, _cookie, length = header.unpack_from(buf, pos)
+                name = buf[pos + header.size:pos + header.size + length].rstrip(b"\0")
+                pos += header.size + length
+
+                if mask & self.IN_Q_OVERFLOW:
+                    # Kernel dropped events: fall back to one full rescan
+                    for root in self.roots:
+                        changed.extend(path for path, _ in walk_markdown(root, self.skip))
+                    continue
+                if mask & self.IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+
+                directory = self.watches.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & self.IN_ISDIR:
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO) and os.path.basename(path) not in SKIP_DIRS \
+                            and path not in self.skip:
+                        # New directory: watch it and pick up files written before the watch existed
+                        changed.extend(self.add_tree(path))
+                elif path.endswith(".md") and mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO):
+                    changed.append(path)
+            self.record_paths(dict.fromkeys(changed))
+
+
+def create_watcher(roots, journal, force_poll=False, interval=2.0, skip=()):
+    """inotify where available, polling otherwise"""
+    if not force_poll and InotifyWatcher.available():
+        try:
+            return InotifyWatcher(roots, journal, skip)
+        except OSError:
+            pass
+    return PollingWatcher(roots, journal, interval, skip)
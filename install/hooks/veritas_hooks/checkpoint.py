@@ -0,0 +1,168 @@
+"""
+Conversation checkpoints captured before compaction
+pre-compact.py copies the session transcript (JSON lines, append-only) into
+a content-addressed store under ~/.conversation-logger/checkpoints:
+
+    objects/ab/cdef...jsonl.gz   gzip segment, named by the SHA-256 of its text
+    sessions/<session>.json      manifest: the session's segments, in order
+
+Each checkpoint stores only the lines appended since the previous one, so
+disk use grows with new turns rather than with the transcript size. The
+manifest remembers where the last segment ended and a CRC of the bytes just
+before that point; if the transcript no longer matches (rewritten or
+truncated), the next segment starts again from the top.
+"""
+
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import time
+import zlib
+
+from .conversation_db import LOGGER_DIR
+
+CHECKPOINT_DIR = os.path.join(LOGGER_DIR, "checkpoints")
+
+# Bytes before a segment's end that must be unchanged to append after it
+TAIL_BYTES = 4096
+COMPRESS_LEVEL = 6
+# Transcript line types that are conversation turns
+TURN_TYPES = ("user", "assistant")
+
+
+def _safe_name(session_id):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in session_id)[:128] or "unknown"
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _tail_crc(f, end):
+    start = max(0, end - TAIL_BYTES)
+    f.seek(start)
+    return zlib.crc32(f.read(end - start))
+
+
+def count_turns(data):
+    """Number of user/assistant entries in a block of transcript lines"""
+    turns = 0
+    for line in data.splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and entry.get("type") in TURN_TYPES:
+            turns += 1
+    return turns
+
+
+class CheckpointStore:
+    """Content-addressed, per-session incremental transcript checkpoints"""
+
+    def __init__(self, root=CHECKPOINT_DIR):
+        self.root = root
+        self.objects = os.path.join(root, "objects")
+        self.sessions = os.path.join(root, "sessions")
+
+    def manifest_path(self, session_id):
+        return os.path.join(self.sessions, f"{_safe_name(session_id)}.json")
+
+    def object_path(self, digest):
+        return os.path.join(self.objects, digest[:2], f"{digest[2:]}.jsonl.gz")
+
+    def manifest(self, session_id):
+        try:
+            with open(self.manifest_path(session_id), "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if isinstance(manifest, dict) else None
+
+    def session_ids(self):
+        try:
+            names = sorted(os.listdir(self.sessions))
+        except OSError:
+            return []
+        return [name[:-5] for name in names if name.endswith(".json")]
+
+    def put(self, data):
+        """Store a segment; returns (digest, compressed bytes written, 0 if already stored)"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # mtime=0 keeps the archive bytes a function of the content alone
+        compressed = gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+        _write_atomic(path, compressed)
+        return digest, len(compressed)
+
+    def get(self, digest):
+        with open(self.object_path(digest), "rb") as f:
+            return gzip.decompress(f.read())
+
+    def capture(self, session_id, transcript_path, **info):
+        """Checkpoint the lines added to transcript_path since the session's last checkpoint
+
+        Extra keyword arguments (trigger, project_path, ...) are recorded in
+        the checkpoint entry. Returns the entry, with "segment": None when
+        nothing new was written.
+        """
+        os.makedirs(self.sessions, exist_ok=True)
+        with open(f"{self.manifest_path(session_id)}.lock", "a") as lock:
+            # Two compactions of one session would otherwise race on the manifest
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            manifest = self.manifest(session_id) or {"session_id": session_id, "checkpoints": []}
+            last = next((entry for entry in reversed(manifest["checkpoints"]) if entry.get("segment")), None)
+
+            with open(transcript_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                start = 0
+                if last and last["end"] <= size and _tail_crc(f, last["end"]) == last["tail_crc"]:
+                    start = last["end"]
+                f.seek(start)
+                data = f.read(size - start)
+                # A half-written last line waits for the next checkpoint
+                data = data[:data.rfind(b"\n") + 1]
+                end = start + len(data)
+                tail_crc = _tail_crc(f, end) if data else None
+
+            entry = dict(info, timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+                         transcript_path=transcript_path, segment=None)
+            if data:
+                digest, stored = self.put(data)
+                entry.update(segment=digest, start=start, end=end, tail_crc=tail_crc,
+                             lines=data.count(b"\n"), turns=count_turns(data),
+                             bytes=len(data), stored_bytes=stored)
+            manifest["transcript_path"] = transcript_path
+            manifest["checkpoints"].append(entry)
+            _write_atomic(self.manifest_path(session_id),
+                          json.dumps(manifest, indent=2).encode("utf-8"))
+        return entry
+
+    def transcript(self, session_id):
+        """The checkpointed transcript text, rebuilt from the session's segments"""
+        manifest = self.manifest(session_id)
+        if manifest is None:
+            return None
+        parts = []
+        for entry in manifest["checkpoints"]:
+            if not entry.get("segment"):
+                continue
+            if entry["start"] == 0:
+                parts = []  # The transcript was rewritten; this segment is complete
+            parts.append(self.get(entry["segment"]))
+        return b"".join(parts)
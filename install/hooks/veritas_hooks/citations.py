@@ -0,0 +1,193 @@
+"""
+Bulk citation extraction and verification-level reporting
+Each note is read once: every PMID reference is recorded with its line,
+column, cited author and year, and the verification tag attached to it
+([FT-VERIFIED], [ABSTRACT-VERIFIED] or [NEEDS-FT-REVIEW] later on the same
+line, before the next citation). Frontmatter and fenced code are skipped.
+In-text citations "(Author et al., Year, PMID: N)" need a tag; bare
+"PMID: N" entries, as in reference lists, do not.
+
+CitationReport merges the per-file results, deduplicates PMIDs across the
+whole vault and checks each distinct PMID once against the local PubMed
+index (then the PubMed cache for any it lacks), so a vault citing a paper
+fifty times costs one lookup, not fifty.
+"""
+
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+from .change_journal import walk_markdown
+from .outline import OPAQUE_KINDS, OutlineState
+from .pmid_index import author_matches
+from .rules import VERIFICATION_LEVELS, line_citations
+
+# PMIDs per esummary request in the lookup list
+DEFAULT_BATCH_SIZE = 200
+
+
+def extract_citations(lines):
+    """[[line, column, pmid, author, year, level], ...] for an iterable of lines
+
+    author and year are None for a bare "PMID: N" reference; level is the
+    attached verification tag without brackets, or None.
+    """
+    citations = []
+    outline = OutlineState()
+    classify = outline.classify
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if classify(line) in OPAQUE_KINDS or 'PMID:' not in line:
+            continue
+        citations.extend([number, *ref] for ref in line_citations(line))
+    return citations
+
+
+def extract_file(path):
+    """extract_citations over one file, streamed"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return extract_citations(f)
+
+
+def collect_files(targets):
+    """Expand directories into .md files; plain files are kept as-is"""
+    for target in targets:
+        if os.path.isdir(target):
+            for path, _mtime in walk_markdown(target):
+                yield path
+        elif os.path.isfile(target):
+            yield target
+
+
+def _extract(path):
+    try:
+        return path, extract_file(path), None
+    except OSError as e:
+        return path, [], str(e)
+
+
+def extract_files(files, workers=1):
+    """Yield (path, citations, error) for each file, across a process pool when workers > 1"""
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            yield from pool.map(_extract, files, chunksize=32)
+    else:
+        yield from map(_extract, files)
+
+
+class CitationReport:
+    """Citations from many files, deduplicated by PMID for one batched lookup"""
+
+    def __init__(self):
+        self.files = {}
+        # pmid -> number of citations across all files
+        self.occurrences = {}
+        self.records = None
+
+    def add(self, path, citations):
+        self.files[path] = citations
+        for citation in citations:
+            self.occurrences[citation[2]] = self.occurrences.get(citation[2], 0) + 1
+
+    @property
+    def total(self):
+        return sum(len(citations) for citations in self.files.values())
+
+    def pmids(self):
+        """Distinct PMIDs cited anywhere, sorted"""
+        return sorted(self.occurrences)
+
+    def lookup_batches(self, batch_size=DEFAULT_BATCH_SIZE, exclude=()):
+        """Distinct PMIDs (minus exclude) in comma-joined batches, ready for esummary"""
+        pmids = [pmid for pmid in self.pmids() if pmid not in exclude]
+        return [','.join(str(pmid) for pmid in pmids[i:i + batch_size])
+                for i in range(0, len(pmids), batch_size)]
+
+    def check(self, index=None, cache=None):
+        """Look every distinct PMID up in a PMIDIndex, then the PubMedCache for the rest
+
+        records maps PMIDs to (first_author, year, epub_year), or to None when
+        the cache knows PubMed has no such PMID; it stays None if neither
+        source could be read.
+        """
+        records = {}
+        checked = False
+        pmids = self.pmids()
+        if index is not None:
+            try:
+                records.update(index.lookup(pmids))
+                checked = True
+            except sqlite3.Error:
+                pass
+        if cache is not None:
+            try:
+                records.update(cache.lookup([pmid for pmid in pmids if pmid not in records], stale_ok=True))
+                checked = True
+            except sqlite3.Error:
+                pass
+        self.records = records if checked else None
+        return self.records
+
+    def status(self, citation):
+        """verified, unknown_pmid, not_in_pubmed, mismatch, or unchecked (no index or cache)"""
+        _line, _column, pmid, author, year, _level = citation
+        if self.records is None:
+            return 'unchecked'
+        if pmid not in self.records:
+            return 'unknown_pmid'
+        record = self.records[pmid]
+        if record is None:
+            return 'not_in_pubmed'
+        first_author, indexed_year, epub_year = record
+        if author is not None and ((first_author and not author_matches(author, first_author)) or
+                                   (indexed_year and year not in (indexed_year, epub_year))):
+            return 'mismatch'
+        return 'verified'
+
+    def file_report(self, path):
+        """Per-file counts by verification level and status, plus the problem citations"""
+        citations = self.files[path]
+        levels = {level[1:-1]: 0 for level in VERIFICATION_LEVELS}
+        levels['untagged'] = 0
+        levels['reference'] = 0
+        statuses = {}
+        issues = []
+        for citation in citations:
+            line, column, pmid, author, year, level = citation
+            untagged = level is None and author is not None
+            levels[level or ('untagged' if untagged else 'reference')] += 1
+            status = self.status(citation)
+            statuses[status] = statuses.get(status, 0) + 1
+            if untagged or status in ('unknown_pmid', 'not_in_pubmed', 'mismatch'):
+                issue = {'line': line, 'column': column, 'pmid': pmid, 'level': level, 'status': status}
+                if author is not None:
+                    issue['cited'] = f"{author} et al., {year}"
+                if status == 'mismatch':
+                    first_author, indexed_year, _epub_year = self.records[pmid]
+                    issue['indexed'] = f"{first_author} et al., {indexed_year}"
+                issues.append(issue)
+        return {
+            'file': path,
+            'citations': len(citations),
+            'distinct_pmids': len({citation[2] for citation in citations}),
+            'levels': levels,
+            'statuses': statuses,
+            'issues': issues,
+        }
+
+    def summary(self, reports=None):
+        """Vault-wide totals; reports are file_report() results already computed"""
+        levels = {}
+        statuses = {}
+        for report in reports if reports is not None else map(self.file_report, self.files):
+            for level, count in report['levels'].items():
+                levels[level] = levels.get(level, 0) + count
+            for status, count in report['statuses'].items():
+                statuses[status] = statuses.get(status, 0) + count
+        return {
+            'files': len(self.files),
+            'citations': self.total,
+            'distinct_pmids': len(self.occurrences),
+            'levels': levels,
+            'statuses': statuses,
+        }
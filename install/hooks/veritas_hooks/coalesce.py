@@ -0,0 +1,118 @@
+"""
+Coalescing for post-command.py runs
+One write can fire post-command.py from several hook matchers in a row.
+Runs take an exclusive lock on .claude/state/post-command.lock, so
+concurrent invocations queue instead of verifying in parallel, and record
+each verified file's outcome under a (path, content hash) key. A later run
+that finds the same file with the same content inside the debounce window
+reuses that outcome instead of re-verifying and re-logging it.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+DEFAULT_WINDOW_SECONDS = 120
+
+# Longest a run waits for the lock before verifying without it; stays well
+# inside the hooks' 10 s timeout
+DEFAULT_LOCK_WAIT_SECONDS = 5.0
+LOCK_POLL_SECONDS = 0.05
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """Hash of a file's bytes"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RunCoalescer:
+    """Run lock plus recently verified (path, content hash) outcomes"""
+
+    def __init__(self, project_root, window_seconds=DEFAULT_WINDOW_SECONDS,
+                 lock_wait_seconds=DEFAULT_LOCK_WAIT_SECONDS):
+        self.state_dir = Path(project_root) / ".claude" / "state"
+        self.lock_path = self.state_dir / "post-command.lock"
+        self.results_path = self.state_dir / "post-command-results.json"
+        self.window_seconds = window_seconds
+        self.lock_wait_seconds = lock_wait_seconds
+        self.results = {}
+        self.dirty = False
+
+    @contextlib.contextmanager
+    def locked(self):
+        """Hold the run lock, waiting up to lock_wait_seconds; yields whether it was taken"""
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'a') as lock:
+            deadline = time.monotonic() + self.lock_wait_seconds
+            while True:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        acquired = False  # A stuck run must not block this one past the timeout
+                        break
+                    time.sleep(LOCK_POLL_SECONDS)
+            try:
+                self.load()
+                yield acquired
+                self.save()
+            finally:
+                if acquired:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def load(self):
+        """Read the outcomes recorded by earlier runs, dropping expired ones"""
+        try:
+            with open(self.results_path, 'r') as f:
+                results = json.load(f)
+        except (OSError, ValueError):
+            results = {}
+        cutoff = time.time() - self.window_seconds
+        self.results = {path: entry for path, entry in results.items()
+                        if isinstance(entry, dict) and entry.get('at', 0) >= cutoff} \
+            if isinstance(results, dict) else {}
+        self.dirty = False
+
+    def lookup(self, path, digest):
+        """The recorded outcome for path if its content is unchanged and recent, else None"""
+        entry = self.results.get(str(path))
+        if entry is None or entry.get('digest') != digest:
+            return None
+        if entry.get('at', 0) < time.time() - self.window_seconds:
+            return None
+        return entry
+
+    def record(self, path, digest, passed, violations=0, warnings=0):
+        self.results[str(path)] = {
+            'digest': digest,
+            'at': time.time(),
+            'passed': passed,
+            'violations': violations,
+            'warnings': warnings,
+        }
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = self.results_path.with_name(f"{self.results_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(self.results, f)
+            os.replace(tmp, self.results_path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        self.dirty = False
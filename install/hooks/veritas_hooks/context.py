@@ -0,0 +1,208 @@
+"""
+Project context shared by the VERITAS hooks
+Resolves the project root once and parses .claude/project.json,
+.claude/config/verification.json and the domain expert agent file. The result
+is kept in memory and in a small JSON snapshot in the per-user 0700 runtime
+directory (see runtime_dir); both are checked
+with one stat() per source file, so a hook run whose sources are unchanged
+skips the directory walk and the parsing.
+"""
+
+import json
+import os
+import re
+
+from . import HOOKS_DIR, is_private, runtime_dir
+from .paths import project_root_dir
+
+SNAPSHOT_VERSION = 1
+
+PROJECT_FILE = os.path.join(".claude", "project.json")
+VERIFICATION_FILE = os.path.join(".claude", "config", "verification.json")
+AGENT_FILE = os.path.join(".claude", "agents", "hla-research-director.md")
+
+# "- **Research Focus**: ..." bullets in the agent file
+AGENT_FIELD_RE = re.compile(r'^- \*\*([^*]+)\*\*:\s*(.+)$', re.MULTILINE)
+
+_current = None
+
+
+def snapshot_path():
+    """Snapshot file for this hooks directory, or None without a runtime directory"""
+    directory = runtime_dir()
+    if directory is None:
+        return None
+    # crc32 rather than hashlib, whose import alone costs milliseconds; the
+    # snapshot records HOOKS_DIR, so a collision only forces a rebuild
+    import zlib
+    digest = zlib.crc32(HOOKS_DIR.encode('utf-8'))
+    return os.path.join(directory, f"context-{digest:08x}.json")
+
+
+def read_snapshot(path):
+    """Snapshot data, ignoring a file this user does not own or others can write"""
+    if path is None or not is_private(path):
+        return None
+    return _read_json(path)
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def iter_values(data, key):
+    """Values stored under key anywhere in data, in document order"""
+    if isinstance(data, dict):
+        for name, value in data.items():
+            if name == key:
+                yield value
+            yield from iter_values(value, key)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iter_values(value, key)
+
+
+def first_value(data, key):
+    """First string or number under key, as the shell hooks' grep found it"""
+    for value in iter_values(data, key):
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            return value
+    return None
+
+
+class ProjectContext:
+    """Project root plus its parsed configuration files"""
+
+    def __init__(self, root, has_claude_md, project, verification, agent_text, stamps):
+        self.root_dir = str(root)
+        self._root = None
+        self.has_claude_md = has_claude_md
+        self.project = project if isinstance(project, dict) else {}
+        self.verification = verification if isinstance(verification, dict) else {}
+        self.agent_text = agent_text
+        # Source path -> [mtime_ns, size], or None for a missing file
+        self.stamps = stamps
+
+    @property
+    def root(self):
+        """Project root as a Path; pathlib is imported on first use"""
+        if self._root is None:
+            from pathlib import Path
+            self._root = Path(self.root_dir)
+        return self._root
+
+    @classmethod
+    def build(cls):
+        """Resolve the root and parse every source file"""
+        root = project_root_dir()
+        sources = [os.path.join(root, name)
+                   for name in ("CLAUDE.md", PROJECT_FILE, VERIFICATION_FILE, AGENT_FILE)]
+        # Stamp before reading so a write during the read is caught next time
+        stamps = {path: _stamp(path) for path in sources}
+        try:
+            with open(sources[3], 'r') as f:
+                agent_text = f.read()
+        except OSError:
+            agent_text = ""
+        return cls(root, stamps[sources[0]] is not None, _read_json(sources[1]),
+                   _read_json(sources[2]), agent_text, stamps)
+
+    @classmethod
+    def from_snapshot(cls, data):
+        if not isinstance(data, dict) or data.get('version') != SNAPSHOT_VERSION \
+                or data.get('hooks_dir') != HOOKS_DIR:
+            return None
+        try:
+            return cls(data['root'], True, data['project'], data['verification'],
+                       data['agent_text'], data['stamps'])
+        except KeyError:
+            return None
+
+    def to_snapshot(self):
+        return {
+            'version': SNAPSHOT_VERSION,
+            'hooks_dir': HOOKS_DIR,
+            'root': self.root_dir,
+            'project': self.project,
+            'verification': self.verification,
+            'agent_text': self.agent_text,
+            'stamps': self.stamps,
+        }
+
+    def is_current(self):
+        """True while every source file is unchanged on disk"""
+        # Without CLAUDE.md the root is the cwd, which can differ per call
+        if not self.has_claude_md:
+            return False
+        return all(_stamp(path) == stamp for path, stamp in self.stamps.items())
+
+    @property
+    def project_type(self):
+        return first_value(self.project, 'type')
+
+    @property
+    def is_medical(self):
+        """True when project.json declares a medical_research project"""
+        return 'medical_research' in iter_values(self.project, 'type')
+
+    def value(self, key):
+        """First value for key anywhere in project.json"""
+        return first_value(self.project, key)
+
+    def grant_detail(self, key):
+        for details in iter_values(self.project, 'grant_details'):
+            if isinstance(details, dict):
+                return first_value(details, key)
+        return None
+
+    def agent_fields(self):
+        """Bold-labelled bullet fields from the agent file"""
+        return {name.strip(): value.strip() for name, value in AGENT_FIELD_RE.findall(self.agent_text)}
+
+    def vaults(self):
+        """Existing Obsidian vault directories configured in project.json"""
+        from .change_journal import configured_vaults
+        return configured_vaults(self.project)
+
+    def save(self):
+        """Write the snapshot atomically; a failed write only costs a rebuild"""
+        path = snapshot_path()
+        if path is None:
+            return
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(self.to_snapshot(), f)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def load_context():
+    """Current project context: in-process copy, then the snapshot, then a rebuild"""
+    global _current
+    if _current is not None and _current.is_current():
+        return _current
+
+    context = ProjectContext.from_snapshot(read_snapshot(snapshot_path()))
+    if context is None or not context.is_current():
+        context = ProjectContext.build()
+        if context.has_claude_md:
+            context.save()
+    _current = context
+    return context
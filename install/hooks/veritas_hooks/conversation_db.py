@@ -0,0 +1,221 @@
+"""
+Direct writer for the conversation-logger database
+auto-conversation-logger.py appends messages and activities to the
+conversations.db schema that the Node MCP logger uses. Rows are buffered and
+committed together in one WAL-mode transaction, using prepared INSERTs and a
+busy timeout so both writers can share the file. When the database stays
+locked, the batch is appended to a JSON-lines spool instead, and the next
+flush that reaches the database drains the spool first.
+"""
+
+import atexit
+import fcntl
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+LOGGER_DIR = os.path.expanduser("~/.conversation-logger")
+DEFAULT_DB_PATH = os.path.join(LOGGER_DIR, "conversations.db")
+DEFAULT_SPOOL_PATH = os.path.join(LOGGER_DIR, "spool.jsonl")
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_BUSY_TIMEOUT_MS = 1000
+
+# Same tables as conversation-logger/index.js
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id TEXT PRIMARY KEY,
+        start_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+        end_time DATETIME,
+        project_path TEXT,
+        summary TEXT
+    );
+    CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        role TEXT,
+        content TEXT,
+        tools_used TEXT,
+        files_modified TEXT,
+        FOREIGN KEY (session_id) REFERENCES sessions (id)
+    );
+    CREATE TABLE IF NOT EXISTS activities (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        activity_type TEXT,
+        description TEXT,
+        metadata TEXT,
+        FOREIGN KEY (session_id) REFERENCES sessions (id)
+    );
+"""
+
+# Queued row lengths: kind, session, project, timestamp, then the table's columns
+ROW_LENGTHS = {"message": 8, "activity": 7}
+
+INSERT_SESSION = "INSERT OR IGNORE INTO sessions (id, start_time, project_path) VALUES (?, ?, ?)"
+END_SESSION = "UPDATE sessions SET end_time = ? WHERE id = ? AND (end_time IS NULL OR end_time < ?)"
+INSERT_MESSAGE = ("INSERT INTO messages (session_id, timestamp, role, content, tools_used, files_modified) "
+                  "VALUES (?, ?, ?, ?, ?, ?)")
+INSERT_ACTIVITY = ("INSERT INTO activities (session_id, timestamp, activity_type, description, metadata) "
+                   "VALUES (?, ?, ?, ?, ?)")
+
+
+def utc_timestamp():
+    """Now in SQLite's CURRENT_TIMESTAMP format, as the Node logger stores it"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class ConversationWriter:
+    """Batched appends to conversations.db, spooled while the database is locked"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, spool_path=DEFAULT_SPOOL_PATH,
+                 batch_size=DEFAULT_BATCH_SIZE, busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS):
+        self.db_path = db_path
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.busy_timeout_ms = busy_timeout_ms
+        # Queued rows: ["message", session, project, timestamp, ...] or ["activity", ...]
+        self.buffer = []
+        self.spooled = 0
+        self._conn = None
+        self._conn_pid = None
+        self._pid = os.getpid()
+        atexit.register(self._flush_at_exit)
+
+    def connect(self):
+        """Shared connection with the schema in place, reopened after a fork"""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000)
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn, self._conn_pid = conn, os.getpid()
+        return conn
+
+    def close(self):
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def log_message(self, session_id, role, content, tools_used=(), files_modified=(), project_path=None):
+        self._queue(["message", session_id, project_path, utc_timestamp(), role, content,
+                     json.dumps(list(tools_used)), json.dumps(list(files_modified))])
+
+    def log_activity(self, session_id, activity_type, description, metadata=None, project_path=None):
+        self._queue(["activity", session_id, project_path, utc_timestamp(), activity_type,
+                     description, json.dumps(metadata or {})])
+
+    def _queue(self, row):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def _flush_at_exit(self):
+        # Rows only: draining the spool here could wait out a locked database
+        if self.buffer:
+            self.flush()
+
+    def flush(self):
+        """Commit buffered rows (and any spool) in one transaction, or spool them
+
+        Returns True when the rows reached the database.
+        """
+        if os.getpid() != self._pid:
+            return False  # A forked child holding the parent's buffer
+        if not self.buffer:
+            if not self.spool_pending():
+                return False
+            try:
+                self.drain_spool()
+                return True
+            except sqlite3.Error:
+                self.close()
+                return False
+        rows, self.buffer = self.buffer, []
+        try:
+            conn = self.connect()
+            self.drain_spool(conn)
+            self._insert(conn, rows)
+            return True
+        except sqlite3.Error:
+            self.close()
+            self._spool(rows)
+            return False
+
+    @staticmethod
+    def _insert(conn, rows):
+        sessions = {}
+        messages = []
+        activities = []
+        for row in rows:
+            kind, session_id, project_path, timestamp = row[:4]
+            if session_id in sessions:
+                first, project, last = sessions[session_id]
+                sessions[session_id] = (min(first, timestamp), project or project_path, max(last, timestamp))
+            else:
+                sessions[session_id] = (timestamp, project_path, timestamp)
+            if kind == "message":
+                messages.append([session_id, timestamp] + row[4:])
+            else:
+                activities.append([session_id, timestamp] + row[4:])
+        # executemany runs each statement once prepared, for the whole batch
+        with conn:
+            conn.executemany(INSERT_SESSION, [(session_id, first, project_path)
+                                              for session_id, (first, project_path, _last) in sessions.items()])
+            conn.executemany(INSERT_MESSAGE, messages)
+            conn.executemany(INSERT_ACTIVITY, activities)
+            conn.executemany(END_SESSION, [(last, session_id, last)
+                                           for session_id, (_first, _project, last) in sessions.items()])
+
+    def _spool(self, rows):
+        """Append rows to the spool in one write"""
+        data = "".join(json.dumps(row, separators=(',', ':')) + "\n" for row in rows).encode("utf-8")
+        os.makedirs(os.path.dirname(self.spool_path), exist_ok=True)
+        fd = os.open(self.spool_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        self.spooled += len(rows)
+
+    def spool_pending(self):
+        try:
+            return os.path.getsize(self.spool_path) > 0
+        except OSError:
+            return False
+
+    def drain_spool(self, conn=None):
+        """Insert spooled rows, then empty the spool; returns the number drained"""
+        if not self.spool_pending():
+            return 0
+        conn = conn or self.connect()
+        fd = os.open(self.spool_path, os.O_RDWR)
+        try:
+            # Appenders wait on this lock, so nothing lands between read and truncate
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            with os.fdopen(os.dup(fd), "r", encoding="utf-8") as f:
+                rows = []
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write from a crashed appender
+                    if isinstance(row, list) and len(row) == ROW_LENGTHS.get(row[0] if row else None):
+                        rows.append(row)
+            if rows:
+                self._insert(conn, rows)
+            os.ftruncate(fd, 0)
+        finally:
+            os.close(fd)
+        return len(rows)
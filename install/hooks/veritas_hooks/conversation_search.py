@@ -0,0 +1,163 @@
+"""
+Full-text search over the conversation-logger database
+FTS5 tables index messages (content, tools used, role) and activities
+(description, metadata, type) as external-content tables, so the text is
+stored once, in the original rows. The hooks sync them incrementally: a
+per-table high-water mark records the last indexed rowid, and each sync
+inserts only newer rows. AFTER DELETE and AFTER UPDATE triggers keep indexed
+rows in step with their content rows whoever changes them (Python retention,
+or the Node cleanup job and watcher). Queries are ranked with bm25 and
+return snippets.
+"""
+
+import sqlite3
+
+# table -> (FTS table, indexed columns); column names match the content table
+FTS_TABLES = {
+    "messages": ("messages_fts", ("content", "tools_used", "role")),
+    "activities": ("activities_fts", ("description", "metadata", "activity_type")),
+}
+
+# Rows indexed per transaction while catching up
+SYNC_BATCH = 5000
+
+SNIPPET_TOKENS = 12
+DEFAULT_LIMIT = 20
+
+
+def quote(term):
+    """An FTS5 string literal, so user input is never parsed as query syntax"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_query(terms, any_term=False, pmid=None, tool=None):
+    """FTS5 MATCH expression: the terms (all, or any), plus PMID and tool filters"""
+    parts = []
+    terms = [term for term in terms if term.strip()]
+    if terms:
+        joined = (' OR ' if any_term else ' ').join(quote(term) for term in terms)
+        parts.append(f'({joined})' if any_term and len(terms) > 1 else joined)
+    if pmid:
+        parts.append(quote(str(pmid)))
+    if tool:
+        parts.append(f'tools_used : {quote(tool)}')
+    return ' '.join(parts)
+
+
+def create_triggers(conn, table):
+    """Triggers that drop (and on UPDATE re-add) index entries for changed rows
+
+    External-content tables need the old column values to remove a row, and
+    removing a row that was never indexed corrupts the index, so they only
+    fire for rows at or below the high-water mark.
+    """
+    fts, columns = FTS_TABLES[table]
+    column_list = ', '.join(columns)
+    indexed = f"old.id <= COALESCE((SELECT last_rowid FROM fts_state WHERE name = '{table}'), 0)"
+    remove = (f"INSERT INTO {fts} ({fts}, rowid, {column_list}) "
+              f"VALUES ('delete', old.id, {', '.join('old.' + column for column in columns)});")
+    add = (f"INSERT INTO {fts} (rowid, {column_list}) "
+           f"VALUES (new.id, {', '.join('new.' + column for column in columns)});")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} "
+                 f"WHEN {indexed} BEGIN {remove} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} "
+                 f"WHEN {indexed} BEGIN {remove} {add} END")
+
+
+def ensure_fts(conn):
+    """Create the FTS tables and their triggers for content tables that exist;
+    returns the synced table names
+
+    Returns an empty list when this SQLite build lacks FTS5.
+    """
+    existing = {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+    tables = []
+    try:
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS fts_state (name TEXT PRIMARY KEY, last_rowid INTEGER NOT NULL)")
+            for table, (fts, columns) in FTS_TABLES.items():
+                if table not in existing:
+                    continue
+                if fts not in existing:
+                    conn.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5({', '.join(columns)}, "
+                                 f"content='{table}', content_rowid='id', tokenize='porter unicode61')")
+                elif f"{fts}_ad" not in existing:
+                    # An index from before the triggers may hold entries for rows
+                    # deleted behind its back; rebuild it once
+                    conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+                    conn.execute("INSERT OR REPLACE INTO fts_state (name, last_rowid) VALUES (?, ?)",
+                                 (table, conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]))
+                create_triggers(conn, table)
+                tables.append(table)
+    except sqlite3.OperationalError as e:
+        if 'fts5' in str(e):
+            return []
+        raise
+    return tables
+
+
+def high_water_mark(conn, table):
+    row = conn.execute("SELECT last_rowid FROM fts_state WHERE name = ?", (table,)).fetchone()
+    return row[0] if row else 0
+
+
+def sync(conn, batch=SYNC_BATCH):
+    """Index rows added since the last sync; returns {table: rows indexed}"""
+    counts = {}
+    for table in ensure_fts(conn):
+        fts, columns = FTS_TABLES[table]
+        column_list = ', '.join(columns)
+        counts[table] = 0
+        while True:
+            with conn:
+                mark = high_water_mark(conn, table)
+                last = conn.execute(f"SELECT MAX(id) FROM (SELECT id FROM {table} WHERE id > ? ORDER BY id LIMIT ?)",
+                                    (mark, batch)).fetchone()[0]
+                if last is None:
+                    break
+                added = conn.execute(f"INSERT INTO {fts} (rowid, {column_list}) "
+                                     f"SELECT id, {column_list} FROM {table} WHERE id > ? AND id <= ?",
+                                     (mark, last)).rowcount
+                conn.execute("INSERT OR REPLACE INTO fts_state (name, last_rowid) VALUES (?, ?)", (table, last))
+            counts[table] += added
+    return counts
+
+
+def rebuild(conn):
+    """Reindex every row from scratch"""
+    tables = ensure_fts(conn)
+    with conn:
+        for table in tables:
+            fts, _columns = FTS_TABLES[table]
+            conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+            conn.execute("INSERT OR REPLACE INTO fts_state (name, last_rowid) VALUES (?, ?)",
+                         (table, conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]))
+    return tables
+
+
+def search(conn, query, sources=("messages",), since=None, limit=DEFAULT_LIMIT):
+    """Ranked matches for an FTS5 query, best first
+
+    since is a 'YYYY-MM-DD[ HH:MM:SS]' lower bound on the row timestamp.
+    Each result has source, id, session_id, timestamp, kind (role or
+    activity type), snippet and score (bm25; lower is better).
+    """
+    results = []
+    for table in sources:
+        fts, columns = FTS_TABLES[table]
+        kind = columns[-1]
+        sql = (f"SELECT t.id, t.session_id, t.timestamp, t.{kind}, "
+               f"snippet({fts}, -1, '[', ']', '...', {SNIPPET_TOKENS}), bm25({fts}) "
+               f"FROM {fts} JOIN {table} t ON t.id = {fts}.rowid WHERE {fts} MATCH ?")
+        params = [query]
+        if since:
+            sql += " AND t.timestamp >= ?"
+            params.append(since)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        for row_id, session_id, timestamp, kind_value, snippet, score in conn.execute(sql, params):
+            results.append({'source': table, 'id': row_id, 'session_id': session_id,
+                            'timestamp': timestamp, 'kind': kind_value, 'snippet': snippet,
+                            'score': round(score, 4)})
+    results.sort(key=lambda result: result['score'])
+    return results[:limit]
@@ -0,0 +1,44 @@
+"""
+Helpers for the long-running VERITAS hook tools (hook server, change watcher)
+"""
+
+import os
+
+
+def daemonize(log_path):
+    """Detach from the launching terminal (double fork)"""
+    if os.fork() > 0:
+        os._exit(0)
+    os.setsid()
+    if os.fork() > 0:
+        os._exit(0)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    log = open(log_path, "a")
+    devnull = open(os.devnull, "r")
+    os.dup2(devnull.fileno(), 0)
+    os.dup2(log.fileno(), 1)
+    os.dup2(log.fileno(), 2)
+
+
+def write_pid_file(pid_path):
+    """Record the current process id; removed again by remove_pid_file"""
+    pid_path.parent.mkdir(parents=True, exist_ok=True)
+    pid_path.write_text(f"{os.getpid()}\n")
+
+
+def remove_pid_file(pid_path):
+    try:
+        if int(pid_path.read_text().strip()) == os.getpid():
+            pid_path.unlink()
+    except (OSError, ValueError):
+        pass
+
+
+def read_live_pid(pid_path):
+    """Return the pid recorded in pid_path if that process is still alive"""
+    try:
+        pid = int(pid_path.read_text().strip())
+        os.kill(pid, 0)
+        return pid
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,154 @@
+"""
+Task classification lexicon behind TaskRouter
+Every category's phrases are merged into one prefix trie and compiled into a
+single regex, so a prompt is scanned once however many phrases (or
+per-project domain terms) the lexicon holds. The regex finds the longest
+phrase starting at each position, and each match counts every phrase it
+begins with, so overlapping phrases ("rule" in "rule_mfi", "vault" in a
+project's "vault export") each score as a substring search would. Results
+carry the matched spans and a weighted score per category and are memoized
+by input text.
+"""
+
+import re
+from collections import OrderedDict
+
+# Category -> phrases, in priority order: the first category with a match wins
+DEFAULT_LEXICON = {
+    # Research question and Rules indicators
+    "obsidian_task": [
+        "research question", "add to obsidian", "create concept",
+        "vault", "obsidian", "template", "wiki link",
+        "rule", "algorithm rule", "epitope", "mfi threshold",
+        "vendor specific", "serologic", "rule_epitope", "rule_mfi",
+    ],
+    # Code/analysis indicators
+    "code_task": [
+        "analyze", "code", "implement", "debug", "test",
+    ],
+}
+
+DEFAULT_TASK = "general_task"
+
+# Spans kept per result; scores still count every occurrence
+MAX_SPANS = 64
+MEMO_SIZE = 256
+
+
+def _trie_pattern(node):
+    """Regex for a trie node: {char: child}, with '' marking a phrase end"""
+    ends = '' in node
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    if len(branches) == 1 and not ends:
+        return branches[0]
+    # Longer phrases are tried first, so "rule_mfi" wins over "rule"
+    body = '(?:' + '|'.join(branches) + ')'
+    return body + '?' if ends else body
+
+
+def compile_phrases(phrases, flags=0):
+    """Zero-width regex matching at every position where one of the
+    (lowercase) phrases starts; group 1 is the longest phrase found there"""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    if not trie:
+        return None
+    return re.compile('(?=(' + _trie_pattern(trie) + '))', flags)
+
+
+def merge_lexicon(base, extra):
+    """Add a project's {category: [phrase, ...] or {phrase: weight}} to base"""
+    merged = OrderedDict((category, dict(phrases)) for category, phrases in base.items())
+    for category, phrases in (extra or {}).items():
+        if isinstance(phrases, str):
+            phrases = [phrases]
+        if isinstance(phrases, list):
+            phrases = {phrase: 1.0 for phrase in phrases if isinstance(phrase, str)}
+        if not isinstance(phrases, dict):
+            continue
+        target = merged.setdefault(category, {})
+        for phrase, weight in phrases.items():
+            if isinstance(phrase, str) and phrase.strip() and isinstance(weight, (int, float)):
+                target[phrase.strip().lower()] = float(weight)
+    return merged
+
+
+class Lexicon:
+    """Compiled phrase table: one scan yields spans and per-category scores"""
+
+    def __init__(self, extra=None):
+        base = OrderedDict((category, {phrase: 1.0 for phrase in phrases})
+                           for category, phrases in DEFAULT_LEXICON.items())
+        self.categories = merge_lexicon(base, extra)
+        # phrase -> (category, weight); the first category listing a phrase owns it
+        self.phrases = {}
+        for category, phrases in self.categories.items():
+            for phrase, weight in phrases.items():
+                self.phrases.setdefault(phrase, (category, weight))
+        # matched text -> (category, weight) of every phrase it begins with
+        self.prefixes = {}
+        # Scanning lowercased text is several times faster than IGNORECASE;
+        # the case-insensitive pattern is only for text whose length changes
+        # when lowercased, where lowered offsets would not match the input
+        self.pattern = compile_phrases(self.phrases)
+        self.folding_pattern = None
+        self.memo = OrderedDict()
+
+    def classify(self, text):
+        """Return {'task_type', 'scores', 'matches'} for text
+
+        scores count every occurrence of every phrase, overlapping ones
+        included. matches are (start, end, phrase, category) tuples,
+        leftmost-longest and non-overlapping, capped at MAX_SPANS. Each call
+        returns a new dict, so callers may modify it.
+        """
+        # Keyed by the text itself, so colliding hashes cannot share a result;
+        # the memo stores immutable values and hands out fresh containers
+        memoized = self.memo.get(text)
+        if memoized is not None:
+            self.memo.move_to_end(text)
+            task_type, scores, matches = memoized
+            return {'task_type': task_type, 'scores': dict(scores), 'matches': list(matches)}
+
+        scores = dict.fromkeys(self.categories, 0.0)
+        matches = []
+        if self.pattern is not None:
+            span_end = 0
+            for match in self._finditer(text):
+                found = match.group(1).lower()
+                owners = self.prefixes.get(found)
+                if owners is None:
+                    owners = self.prefixes[found] = self._owners(found)
+                if not owners:
+                    continue
+                for category, weight in owners:
+                    scores[category] += weight
+                start, end = match.span(1)
+                if start >= span_end and len(matches) < MAX_SPANS:
+                    matches.append((start, end, found, owners[-1][0]))
+                    span_end = end
+
+        task_type = next((category for category, score in scores.items() if score > 0), DEFAULT_TASK)
+        self.memo[text] = (task_type, tuple(scores.items()), tuple(matches))
+        if len(self.memo) > MEMO_SIZE:
+            self.memo.popitem(last=False)
+        return {'task_type': task_type, 'scores': scores, 'matches': matches}
+
+    def _owners(self, found):
+        """(category, weight) of each phrase that found begins with"""
+        return [self.phrases[found[:i]] for i in range(1, len(found) + 1) if found[:i] in self.phrases]
+
+    def _finditer(self, text):
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return self.pattern.finditer(lowered)
+        if self.folding_pattern is None:
+            self.folding_pattern = compile_phrases(self.phrases, re.IGNORECASE)
+        return self.folding_pattern.finditer(text)
@@ -0,0 +1,423 @@
+"""
+Wiki-link graph index for the configured Obsidian vaults
+A SQLite file records every note's name, its frontmatter aliases and its
+outgoing [[links]]. refresh() stats the vaults and reparses only notes whose
+mtime or size changed; it is the explicit rebuild (link-index.py, batch and
+vault runs). Between rebuilds post-command.py passes the notes the change
+journal reports to update(), so a check rarely walks the vaults: only when
+it is about to report a dangling link and the last refresh is older than
+max_age_minutes, which picks up notes synced or created while no session
+was running. Link targets are resolved against an in-memory set of
+normalized names, and dangling links get the closest existing names as
+suggestions.
+"""
+
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from .change_journal import walk_markdown_stats
+from .markdown import closes_fence, fence_marker, frontmatter_end, split_code_spans
+
+INDEX_NAME = "wiki-links.db"
+
+# [[target]], [[target#heading]], [[target|alias]] and ![[embeds]]; in tables
+# the alias pipe is escaped as \|
+WIKI_LINK_RE = re.compile(r'\[\[([^\[\]\n]+?)\]\]')
+TARGET_END_RE = re.compile(r'\\?\||#')
+ATTACHMENT_RE = re.compile(r'\.(?!md$)[A-Za-z0-9]{1,5}$', re.IGNORECASE)
+SPACES_RE = re.compile(r'\s+')
+ALIAS_KEYS = ("aliases:", "alias:")
+
+# Suggestions per dangling link, and the cap on suggestion searches per check
+SUGGESTIONS = 3
+MAX_SUGGESTED = 20
+
+# Paths per "IN (...)" query in update()
+PATH_CHUNK = 500
+
+# Age of the last refresh() after which a check that finds dangling links
+# refreshes before reporting them
+DEFAULT_MAX_AGE_MINUTES = 60
+
+
+def link_key(target):
+    """Normalized lookup key: basename, no .md, case-folded, _ read as a space"""
+    name = target.strip().rsplit('/', 1)[-1]
+    if name[-3:].lower() == '.md':
+        name = name[:-3]
+    return SPACES_RE.sub(' ', name.replace('_', ' ')).strip().casefold()
+
+
+def link_target(inner):
+    """Note part of a link's inner text, or None for same-note and attachment links"""
+    # A trailing backslash is left by an escaped table pipe
+    target = TARGET_END_RE.split(inner, 1)[0].rstrip(' \\').strip()
+    if not target or ATTACHMENT_RE.search(target):
+        return None
+    return target
+
+
+def line_links(line):
+    """(column, target) for each wiki link in a line, skipping inline code"""
+    links = []
+    offset = 0
+    for is_code, text in split_code_spans(line):
+        if not is_code and '[[' in text:
+            for match in WIKI_LINK_RE.finditer(text):
+                target = link_target(match.group(1))
+                if target is not None:
+                    links.append((offset + match.start() + 1, target))
+        offset += len(text)
+    return links
+
+
+def iter_links(lines, start=0, start_line=1):
+    """Yield (line, column, target) for wiki links outside fenced code"""
+    fence = None
+    for number, line in enumerate(lines[start:], start + start_line):
+        if fence is not None:
+            if closes_fence(line, fence):
+                fence = None
+            continue
+        if '`' in line or '~' in line:
+            marker = fence_marker(line)
+            if marker is not None:
+                fence = marker
+                continue
+        if '[[' in line:
+            for column, target in line_links(line):
+                yield number, column, target
+
+
+def _unquote(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        value = value[1:-1]
+    return value.strip()
+
+
+def parse_aliases(front):
+    """Aliases from frontmatter lines: inline [a, b], a scalar, or a - list"""
+    aliases = []
+    collecting = False
+    for line in front:
+        stripped = line.strip()
+        if collecting:
+            if stripped.startswith('- '):
+                aliases.append(_unquote(stripped[2:]))
+                continue
+            if not stripped:
+                continue
+            collecting = False
+        key = next((key for key in ALIAS_KEYS if stripped.lower().startswith(key)), None)
+        if key is None or line[:1].isspace():
+            continue
+        value = stripped[len(key):].strip()
+        if not value:
+            collecting = True
+        elif value.startswith('[') and value.endswith(']'):
+            aliases.extend(_unquote(item) for item in value[1:-1].split(','))
+        else:
+            aliases.append(_unquote(value))
+    return [alias for alias in aliases if alias]
+
+
+def parse_note(text):
+    """(aliases, [(line, column, target)]) for one note's text"""
+    lines = text.split('\n')
+    end = frontmatter_end(lines)
+    aliases = parse_aliases(lines[1:end - 1]) if end else []
+    # Frontmatter properties can hold links too, so every line is scanned
+    links = list(iter_links(lines[:end])) + list(iter_links(lines, end))
+    return aliases, links
+
+
+def open_index(context):
+    """LinkIndex for a project context, or None when disabled or without vaults"""
+    config = context.verification.get('link_index', {})
+    if not isinstance(config, dict) or not config.get('enabled', True):
+        return None
+    vaults = context.vaults()
+    if not vaults:
+        return None
+    path = config.get('path') or str(context.root / ".claude" / "cache" / INDEX_NAME)
+    max_age = config.get('max_age_minutes', DEFAULT_MAX_AGE_MINUTES)
+    if not isinstance(max_age, (int, float)):
+        max_age = DEFAULT_MAX_AGE_MINUTES
+    return LinkIndex(Path(os.path.expanduser(path)), vaults, max_age_seconds=max_age * 60)
+
+
+class LinkIndex:
+    """Note names, aliases and outgoing links for a set of vault directories"""
+
+    def __init__(self, db_path, vaults, max_age_seconds=DEFAULT_MAX_AGE_MINUTES * 60):
+        self.db_path = Path(db_path)
+        self.vaults = [os.path.abspath(vault) for vault in vaults]
+        self.max_age_seconds = max_age_seconds
+        self._conn = None
+        self._conn_pid = None
+        # Resolution set, reloaded when another process changes the index
+        self._keys = None
+        self._generation = None
+
+    def exists(self):
+        return self.db_path.exists()
+
+    def connect(self):
+        """Shared connection, reopened after a fork (e.g. in pool workers)"""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS notes (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS names (
+                key TEXT NOT NULL,
+                note_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_names_key ON names(key);
+            CREATE INDEX IF NOT EXISTS idx_names_note ON names(note_id);
+            CREATE TABLE IF NOT EXISTS links (
+                note_id INTEGER NOT NULL,
+                line INTEGER NOT NULL,
+                col INTEGER NOT NULL,
+                target TEXT NOT NULL,
+                target_key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_links_note ON links(note_id);
+            CREATE INDEX IF NOT EXISTS idx_links_key ON links(target_key);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self._conn, self._conn_pid = conn, os.getpid()
+        return conn
+
+    def close(self):
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def covers(self, path):
+        """True when path lies inside one of the indexed vaults"""
+        path = os.path.abspath(path)
+        return any(path == vault or path.startswith(vault + os.sep) for vault in self.vaults)
+
+    def _meta(self, conn, key, default=0):
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return type(default)(row[0]) if row else default
+
+    def refresh(self):
+        """Reindex notes added, changed or removed since the last refresh
+
+        Returns {'notes', 'updated', 'removed'}.
+        """
+        conn = self.connect()
+        now = time.time()
+
+        known = {path: (note_id, mtime_ns, size) for note_id, path, mtime_ns, size
+                 in conn.execute("SELECT id, path, mtime_ns, size FROM notes")}
+        changed = []
+        seen = set()
+        for vault in self.vaults:
+            for path, stat in walk_markdown_stats(vault):
+                seen.add(path)
+                entry = known.get(path)
+                if entry is None or entry[1] != stat.st_mtime_ns or entry[2] != stat.st_size:
+                    changed.append((path, stat, entry[0] if entry else None))
+        removed = [note_id for path, (note_id, _mtime, _size) in known.items() if path not in seen]
+        self._apply(conn, changed, removed, refreshed_at=now)
+        return {'notes': len(seen), 'updated': len(changed), 'removed': len(removed)}
+
+    def update(self, paths):
+        """Reindex just the given notes: created, changed, renamed to, or deleted
+
+        Paths outside the vaults or not ending in .md are ignored. Returns
+        {'updated', 'removed'}.
+        """
+        paths = sorted({os.path.abspath(path) for path in paths
+                        if path.endswith('.md') and self.covers(path)})
+        if not paths:
+            return {'updated': 0, 'removed': 0}
+        conn = self.connect()
+        known = {}
+        for i in range(0, len(paths), PATH_CHUNK):
+            chunk = paths[i:i + PATH_CHUNK]
+            known.update((path, (note_id, mtime_ns, size)) for note_id, path, mtime_ns, size in conn.execute(
+                f"SELECT id, path, mtime_ns, size FROM notes WHERE path IN ({','.join('?' * len(chunk))})",
+                chunk))
+        changed = []
+        removed = []
+        for path in paths:
+            entry = known.get(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                if entry is not None:
+                    removed.append(entry[0])
+                continue
+            if entry is None or entry[1] != stat.st_mtime_ns or entry[2] != stat.st_size:
+                changed.append((path, stat, entry[0] if entry else None))
+        self._apply(conn, changed, removed)
+        return {'updated': len(changed), 'removed': len(removed)}
+
+    def _apply(self, conn, changed, removed, refreshed_at=None):
+        """Reparse changed (path, stat, note_id or None) notes and drop removed note ids"""
+        with conn:
+            for path, stat, note_id in changed:
+                try:
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        aliases, links = parse_note(f.read())
+                except OSError:
+                    continue
+                name = os.path.basename(path)[:-3]
+                if note_id is None:
+                    note_id = conn.execute(
+                        "INSERT INTO notes (path, name, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                        (path, name, stat.st_mtime_ns, stat.st_size)).lastrowid
+                else:
+                    conn.execute("UPDATE notes SET mtime_ns = ?, size = ? WHERE id = ?",
+                                 (stat.st_mtime_ns, stat.st_size, note_id))
+                    self._delete_rows(conn, [note_id])
+                keys = {link_key(name)} | {link_key(alias) for alias in aliases}
+                conn.executemany("INSERT INTO names (key, note_id) VALUES (?, ?)",
+                                 [(key, note_id) for key in keys if key])
+                conn.executemany(
+                    "INSERT INTO links (note_id, line, col, target, target_key) VALUES (?, ?, ?, ?, ?)",
+                    [(note_id, line, column, target, link_key(target)) for line, column, target in links])
+            if removed:
+                self._delete_rows(conn, removed)
+                conn.executemany("DELETE FROM notes WHERE id = ?", [(note_id,) for note_id in removed])
+            if changed or removed:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)",
+                             (str(self._meta(conn, 'generation') + 1),))
+            if refreshed_at is not None:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('refreshed_at', ?)",
+                             (repr(refreshed_at),))
+
+    @staticmethod
+    def _delete_rows(conn, note_ids):
+        params = [(note_id,) for note_id in note_ids]
+        conn.executemany("DELETE FROM names WHERE note_id = ?", params)
+        conn.executemany("DELETE FROM links WHERE note_id = ?", params)
+
+    def keys(self):
+        """Set of every normalized note name and alias"""
+        conn = self.connect()
+        generation = self._meta(conn, 'generation')
+        if self._keys is None or generation != self._generation:
+            self._keys = frozenset(key for key, in conn.execute("SELECT DISTINCT key FROM names"))
+            self._generation = generation
+        return self._keys
+
+    def resolve(self, target):
+        """True when target names an indexed note or alias"""
+        return link_key(target) in self.keys()
+
+    def suggest(self, target, n=SUGGESTIONS):
+        """Names of the notes closest to an unresolved target"""
+        import difflib
+        key = link_key(target)
+        # Similar names have similar lengths; skip the rest before scoring
+        slack = max(3, len(key) // 3)
+        candidates = [candidate for candidate in self.keys() if abs(len(candidate) - len(key)) <= slack]
+        # Extra matches cover aliases that lead to an already suggested note
+        matches = difflib.get_close_matches(key, candidates, n=n * 2, cutoff=0.6)
+        if not matches:
+            return []
+        placeholders = ','.join('?' * len(matches))
+        names = {}
+        for key_, name in self.connect().execute(
+                f"SELECT names.key, notes.name FROM names JOIN notes ON notes.id = names.note_id "
+                f"WHERE names.key IN ({placeholders}) ORDER BY notes.name", matches):
+            names.setdefault(key_, name)
+        suggestions = []
+        for match in matches:
+            name = names.get(match)
+            if name is not None and name not in suggestions:
+                suggestions.append(name)
+        return suggestions[:n]
+
+    def built(self):
+        """True once a full refresh has indexed the vaults"""
+        return self._meta(self.connect(), 'refreshed_at', 0.0) > 0
+
+    def stale(self):
+        """True when the last full refresh is older than max_age_seconds"""
+        return time.time() - self._meta(self.connect(), 'refreshed_at', 0.0) >= self.max_age_seconds
+
+    def check(self, links, refresh=True):
+        """Dangling links among (line, column, target) tuples, with suggestions
+
+        With refresh, an index that was never built is built first. After
+        that it is kept current through update(); the notes that resolved
+        links point at are stat()ed, so a note deleted while no watcher was
+        journaling drops out here, and when some links are unresolved and
+        the index is stale it is refreshed once before they are reported.
+        """
+        if refresh and not self.built():
+            self.refresh()
+        keys = self.keys()
+        gone = self._missing_notes({link_key(link[2]) for link in links} & keys)
+        if gone:
+            self.update(gone)
+            keys = self.keys()
+        unresolved = [link for link in links if link_key(link[2]) not in keys]
+        if unresolved and refresh and self.stale():
+            self.refresh()
+            keys = self.keys()
+            unresolved = [link for link in unresolved if link_key(link[2]) not in keys]
+        dangling = []
+        suggestions = {}
+        for line, column, target in unresolved:
+            key = link_key(target)
+            if key not in suggestions:
+                suggestions[key] = self.suggest(target) if len(suggestions) < MAX_SUGGESTED else []
+            dangling.append({'line': line, 'column': column, 'target': target,
+                             'suggestions': suggestions[key]})
+        return dangling
+
+    def _missing_notes(self, keys):
+        """Indexed paths named by any of keys that no longer exist on disk"""
+        keys = sorted(keys)
+        paths = set()
+        conn = self.connect()
+        for i in range(0, len(keys), PATH_CHUNK):
+            chunk = keys[i:i + PATH_CHUNK]
+            paths.update(path for path, in conn.execute(
+                f"SELECT notes.path FROM names JOIN notes ON notes.id = names.note_id "
+                f"WHERE names.key IN ({','.join('?' * len(chunk))})", chunk))
+        return [path for path in paths if not os.path.exists(path)]
+
+    def check_text(self, text, refresh=True):
+        """Dangling wiki links in a note's text"""
+        return self.check(parse_note(text)[1], refresh)
+
+    def dangling(self):
+        """(path, line, column, target) for every indexed link with no matching note"""
+        return self.connect().execute(
+            "SELECT notes.path, links.line, links.col, links.target FROM links "
+            "JOIN notes ON notes.id = links.note_id "
+            "WHERE NOT EXISTS (SELECT 1 FROM names WHERE names.key = links.target_key) "
+            "ORDER BY notes.path, links.line, links.col").fetchall()
+
+    def stats(self):
+        conn = self.connect()
+        return {
+            'notes': conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0],
+            'names': conn.execute("SELECT COUNT(*) FROM names").fetchone()[0],
+            'links': conn.execute("SELECT COUNT(*) FROM links").fetchone()[0],
+            'refreshed_at': self._meta(conn, 'refreshed_at', 0.0),
+        }
@@ -0,0 +1,33 @@
+"""
+Loader for the dash-named hook scripts
+Hook scripts such as post-command.py cannot be imported with a plain
+import statement, so tools that reuse their classes load them here.
+"""
+
+import importlib.util
+import os
+import sys
+
+from . import HOOKS_DIR
+
+
+def hook_script_path(name):
+    """Absolute path of a hook script given its name without extension"""
+    return os.path.join(HOOKS_DIR, f"{name}.py")
+
+
+def load_hook(name, reload=False):
+    """Import a hook script (e.g. 'post-command') as a module"""
+    module_name = "veritas_hook_" + name.replace('-', '_')
+    if not reload and module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(module_name, hook_script_path(name))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
@@ -0,0 +1,172 @@
+"""
+Single-pass Markdown formatting fixer behind ObsidianEnforcer.fix_formatting
+Walks the note once, tracking YAML frontmatter, fenced code blocks and inline
+code spans, and applies every fix only to prose: escaped newlines become
+line breaks, pipes get surrounding spaces and &gt; &lt; &amp; are decoded.
+Output is collected as pieces and joined once, so a large note is copied a
+single time however many fixes it needs.
+"""
+
+import re
+
+# Lookarounds keep the replacements literal, which re applies without a
+# per-call template expansion
+PIPE_AFTER_RE = re.compile(r'\|(?=[^\s|])')
+PIPE_BEFORE_RE = re.compile(r'(?<=[^\s|])\|')
+BACKTICKS_RE = re.compile(r'`+')
+
+
+def fence_marker(line):
+    """(char, length) when line opens or closes a fenced code block"""
+    stripped = line.lstrip(' ')
+    if len(line) - len(stripped) > 3 or stripped[:3] not in ('```', '~~~'):
+        return None
+    char = stripped[0]
+    length = len(stripped) - len(stripped.lstrip(char))
+    # Backtick fences cannot have backticks in their info string
+    if char == '`' and '`' in stripped[length:]:
+        return None
+    return char, length
+
+
+def closes_fence(line, fence):
+    """True when line closes the fence opened with (char, length)"""
+    stripped = line.strip(' \t\r')
+    char, length = fence
+    return len(stripped) >= length and stripped == char * len(stripped) \
+        and len(line) - len(line.lstrip(' ')) <= 3
+
+
+def split_code_spans(line):
+    """[(is_code, text)] covering line; a backtick run needs a matching run to close
+
+    Runs of three or more backticks are left as text: they are fence markers
+    once escaped newlines are expanded.
+    """
+    if '`' not in line:
+        return [(False, line)]
+    segments = []
+    start = position = 0
+    while True:
+        opening = BACKTICKS_RE.search(line, position)
+        if opening is None:
+            break
+        run = opening.group()
+        if len(run) >= 3:
+            position = opening.end()
+            continue
+        # Find a closing run of exactly the same length
+        closing = BACKTICKS_RE.search(line, opening.end())
+        while closing is not None and closing.group() != run:
+            closing = BACKTICKS_RE.search(line, closing.end())
+        if closing is None:
+            position = opening.end()
+            continue
+        if opening.start() > start:
+            segments.append((False, line[start:opening.start()]))
+        segments.append((True, line[opening.start():closing.end()]))
+        start = position = closing.end()
+    if start < len(line):
+        segments.append((False, line[start:]))
+    return segments
+
+
+def fix_text(text, before='', after=''):
+    """Space pipes and decode entities in prose; before/after are the
+    characters next to text on its line (from neighbouring code spans)"""
+    if '|' in text:
+        # Neighbours only decide whether a pipe at either end needs a space
+        fixed = PIPE_BEFORE_RE.sub(' |', PIPE_AFTER_RE.sub('| ', before + text + after))
+        text = fixed[len(before):len(fixed) - len(after)]
+    if '&' in text:
+        text = text.replace('&gt;', '>').replace('&lt;', '<').replace('&amp;', '&')
+    return text
+
+
+def _fix_prose(segments):
+    """Apply the prose fixes to one logical line's segments"""
+    if len(segments) == 1:
+        is_code, text = segments[0]
+        return text if is_code else fix_text(text)
+    pieces = []
+    last = len(segments) - 1
+    for index, (is_code, text) in enumerate(segments):
+        if not is_code:
+            text = fix_text(text, segments[index - 1][1][-1:] if index > 0 else '',
+                            segments[index + 1][1][:1] if index < last else '')
+        pieces.append(text)
+    return ''.join(pieces)
+
+
+def _logical_lines(segments):
+    """Split a line's segments at every literal \\n in prose"""
+    current = []
+    for is_code, text in segments:
+        if is_code or '\\n' not in text:
+            current.append((is_code, text))
+            continue
+        parts = text.split('\\n')
+        current.append((False, parts[0]))
+        for part in parts[1:]:
+            yield current
+            current = [(False, part)]
+    yield current
+
+
+def _join(segments):
+    return ''.join(text for _is_code, text in segments)
+
+
+def frontmatter_end(lines):
+    """Index of the first line after a closed YAML frontmatter block, else 0"""
+    if not lines or lines[0].rstrip('\r') != '---':
+        return 0
+    for index in range(1, len(lines)):
+        if lines[index].rstrip('\r') in ('---', '...'):
+            return index + 1
+    # Never closed, so the opening --- is a horizontal rule
+    return 0
+
+
+def fix_markdown(content):
+    """Return content with escaped newlines, table pipes and HTML entities fixed in prose"""
+    lines = content.split('\n')
+    start = frontmatter_end(lines)
+
+    if '`' not in content and '~' not in content and '\\n' not in content:
+        # No code or escaped newlines anywhere: fix the prose lines in place
+        for index in range(start, len(lines)):
+            line = lines[index]
+            if '|' in line or '&' in line:
+                lines[index] = fix_text(line)
+        return '\n'.join(lines)
+
+    out = lines[:start]
+    fence = None
+    for index in range(start, len(lines)):
+        line = lines[index]
+        if fence is not None:
+            if closes_fence(line, fence):
+                fence = None
+            out.append(line)
+            continue
+        if not ('`' in line or '~' in line or '\\n' in line):
+            out.append(fix_text(line) if '|' in line or '&' in line else line)
+            continue
+
+        # Escaped newlines split a line into logical lines; a fence opened by
+        # one of them covers the rest
+        for segments in _logical_lines(split_code_spans(line)):
+            if fence is not None:
+                text = _join(segments)
+                if closes_fence(text, fence):
+                    fence = None
+                out.append(text)
+                continue
+            marker = fence_marker(_join(segments)) if not segments[0][0] else None
+            if marker is not None:
+                fence = marker
+                out.append(_join(segments))
+            else:
+                out.append(_fix_prose(segments))
+    return '\n'.join(out)
@@ -0,0 +1,129 @@
+"""
+Batch mode for obsidian-enforcer.py
+Runs detect_content_type, fix_formatting, fix_wiki_links,
+validate_filename and the dangling-link check over many notes in one
+invocation, fanned out across a process pool. Each worker builds one
+ObsidianEnforcer; rewrites go through a temporary file in the note's
+directory and os.replace, so a note is never left half-written.
+"""
+
+import json
+import os
+import stat
+import tempfile
+
+from .change_journal import walk_markdown
+from .loader import load_hook
+
+_enforcer = None
+_write = False
+
+
+def init_worker(write=False):
+    """Build one enforcer per worker process"""
+    global _enforcer, _write
+    _enforcer = load_hook("obsidian-enforcer").ObsidianEnforcer()
+    _write = write
+
+
+def write_atomic(path, text):
+    """Replace path with text, keeping its permissions"""
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def process(item):
+    """Fix and validate one note; item is an operation dict (see iter_operations)"""
+    path = item.get('path')
+    try:
+        inline = 'content' in item
+        if inline:
+            content = item['content']
+            if not isinstance(content, str):
+                raise TypeError("content must be a string")
+        else:
+            # Strict decoding: a note that is not UTF-8 is reported, never rewritten
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
+
+        filename = item.get('filename') or (os.path.basename(path) if path else "")
+        content_type = item.get('type') or _enforcer.detect_content_type(content, filename)
+        fixed = _enforcer.fix_wiki_links(_enforcer.fix_formatting(content))
+        result = {
+            'path': path,
+            'filename': filename,
+            'content_type': content_type,
+            'changed': fixed != content,
+            'validation': _enforcer.validate_filename(filename, content_type) if filename else None,
+            'written': False,
+        }
+        # The caller refreshes the link index once before the workers start
+        dangling = _enforcer.check_wiki_links(fixed, refresh=False)
+        if dangling is not None:
+            result['dangling_links'] = dangling
+        if inline:
+            result['content'] = fixed
+        elif _write and fixed != content:
+            write_atomic(path, fixed)
+            result['written'] = True
+        return result
+    except (OSError, TypeError, ValueError) as e:
+        return {'path': path, 'error': str(e)}
+
+
+def iter_operations(stream):
+    """Operations from JSON lines: {"path": ...} and/or {"content": ...},
+    optionally with "filename" and "type" to skip detection"""
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            item = {'error': f"line {number}: {e}"}
+        if not isinstance(item, dict) or not ('path' in item or 'content' in item or 'error' in item):
+            item = {'error': f"line {number}: expected an object with \"path\" or \"content\""}
+        yield item
+
+
+def iter_note_operations(targets):
+    """One operation per .md file below each directory; plain files are kept as-is"""
+    for target in targets:
+        if os.path.isdir(target):
+            for path, _mtime in sorted(walk_markdown(target)):
+                yield {'path': path}
+        else:
+            yield {'path': target}
+
+
+def run(items, workers=1, chunk_size=16, write=False):
+    """Yield one result per operation, in input order"""
+    if workers <= 1:
+        init_worker(write)
+        for item in items:
+            yield item if 'error' in item else process(item)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    items = list(items)
+    failed = {index: item for index, item in enumerate(items) if 'error' in item}
+    valid = [item for item in items if 'error' not in item]
+    with ProcessPoolExecutor(max_workers=min(workers, max(1, len(valid))),
+                             initializer=init_worker, initargs=(write,)) as pool:
+        results = pool.map(process, valid, chunksize=chunk_size)
+        for index in range(len(items)):
+            yield failed[index] if index in failed else next(results)
@@ -0,0 +1,280 @@
+"""
+One-pass Markdown outline for section-scoped verification
+OutlineState classifies each line as it is read (YAML frontmatter, fenced
+code, heading, table row, list item, blank or text) and tracks which note
+template the document follows and which section the line sits in. The
+rule engine asks it which rules the current section is exempt from, so
+those rules never run there. parse_outline() collects the same walk into
+an Outline of frontmatter, headings, fences, tables and list items.
+"""
+
+import hashlib
+import re
+
+from .markdown import closes_fence, fence_marker
+
+CLAIM_RULES = ('missing_pmid', 'unsupported_claim')
+
+# The note templates in templates/obsidian/: the frontmatter tag that marks a
+# note as using the template, the headings that identify it when the tag is
+# missing, and the H2/H3 sections exempt from rules. Exempt sections hold
+# open questions, reference lists, navigation or session bookkeeping rather
+# than claims that need a citation.
+TEMPLATES = {
+    'research_question': {
+        'tag': 'research-question',
+        'markers': ('Direct Answer', 'Evidence-Based Key Points'),
+        'exempt': {
+            'Knowledge Gaps': CLAIM_RULES,
+            'References': CLAIM_RULES,
+            'DOIs for Zotero': CLAIM_RULES,
+            'Related Concepts': CLAIM_RULES,
+        },
+    },
+    'concept': {
+        'tag': 'concept',
+        'markers': ('Key Innovation', 'Clinical Benefits'),
+        'exempt': {
+            'Implementation Guide': CLAIM_RULES,
+            'Quality Control': CLAIM_RULES,
+            'Related Concepts': CLAIM_RULES,
+            'Key References': CLAIM_RULES,
+        },
+    },
+    'journal': {
+        'tag': 'daily-log',
+        'markers': ('Session Summary',),
+        'exempt': {
+            'Session Summary': CLAIM_RULES,
+            'Technical Implementations': CLAIM_RULES,
+            'Problems Solved': CLAIM_RULES,
+            'Session Metrics': CLAIM_RULES,
+            'Next Actions': CLAIM_RULES,
+            'References': CLAIM_RULES,
+            'Navigation': CLAIM_RULES,
+        },
+    },
+}
+
+# Line kinds no rule looks at
+OPAQUE_KINDS = frozenset(['frontmatter', 'fence', 'code'])
+
+# Frontmatter phases
+OPENING, INSIDE, BODY = 0, 1, 2
+
+YAML_LINE_RE = re.compile(r'(?:\s|-(?:\s|$)|#|[^\s:][^:]*:(?:\s|$)|$)')
+HEADING_RE = re.compile(r'(#{1,6})(?:[ \t]+(.*?))?[ \t#]*$')
+ORDERED_ITEM_RE = re.compile(r'\d{1,9}[.)](?:\s|$)')
+NO_RULES = frozenset()
+
+
+def section_key(title):
+    """Heading text compared case- and spacing-insensitively"""
+    return ' '.join(title.split()).casefold()
+
+
+def scope_table(overrides=None):
+    """{template: {section key: frozenset of exempt rules}}
+
+    overrides ("section_rules" in verification.json) maps template names to
+    {section title: [rule, ...]}; an empty list re-enables every rule there.
+    Only the claim rules can be scoped; other rule ids are ignored.
+    """
+    table = {}
+    for name, template in TEMPLATES.items():
+        table[name] = {section_key(title): frozenset(rules) for title, rules in template['exempt'].items()}
+    for name, sections in (overrides or {}).items():
+        if name in table and isinstance(sections, dict):
+            for title, rules in sections.items():
+                table[name][section_key(title)] = frozenset(rules or ()) & frozenset(CLAIM_RULES)
+    return table
+
+
+def scope_signature(table):
+    """Stable digest of a scope table, for result cache keys"""
+    normalized = sorted((name, sorted((key, sorted(rules)) for key, rules in sections.items()))
+                        for name, sections in table.items())
+    return hashlib.sha1(repr(normalized).encode()).hexdigest()[:16]
+
+
+TAG_TEMPLATES = [(template['tag'], name) for name, template in TEMPLATES.items()]
+MARKER_TEMPLATES = {section_key(template['markers'][0]): name for name, template in TEMPLATES.items()}
+DEFAULT_SCOPES = scope_table()
+
+
+def template_for_tags(tags):
+    """Template named by a list of frontmatter tags, or None"""
+    for tag, name in TAG_TEMPLATES:
+        if tag in tags:
+            return name
+    return None
+
+
+def parse_tags(value):
+    """Tags from an inline YAML value: [a, b], "a, b" or a single word"""
+    value = value.strip().strip('[]')
+    return [tag.strip().strip('\'"').lstrip('#') for tag in re.split(r'[,\s]+', value) if tag.strip()]
+
+
+class OutlineState:
+    """Streaming line classifier; key() / from_key() carry it across cached blocks"""
+
+    __slots__ = ('frontmatter', 'fence', 'in_tags', 'template', 'h2', 'h3', 'scopes', 'skipped')
+
+    def __init__(self, scopes=None):
+        self.frontmatter = OPENING
+        self.fence = None
+        self.in_tags = False
+        self.template = None
+        self.h2 = None
+        self.h3 = None
+        self.scopes = DEFAULT_SCOPES if scopes is None else scopes
+        # Rules the current section is exempt from
+        self.skipped = NO_RULES
+
+    def key(self):
+        """JSON-friendly snapshot of everything that affects later lines"""
+        return [self.frontmatter, list(self.fence) if self.fence else None, self.in_tags,
+                self.template, self.h2, self.h3]
+
+    @classmethod
+    def from_key(cls, key, scopes=None):
+        state = cls(scopes)
+        if key:
+            state.frontmatter, fence, state.in_tags, state.template, state.h2, state.h3 = key
+            state.fence = tuple(fence) if fence else None
+            state._rescope()
+        return state
+
+    def _rescope(self):
+        sections = self.scopes.get(self.template)
+        if not sections:
+            self.skipped = NO_RULES
+            return
+        skipped = sections.get(self.h2, NO_RULES)
+        if self.h3 is not None and self.h3 in sections:
+            skipped = skipped | sections[self.h3]
+        self.skipped = skipped
+
+    def _frontmatter_line(self, line):
+        """Classify a line inside frontmatter; False when it ends the block"""
+        if line.rstrip() in ('---', '...'):
+            self.frontmatter = BODY
+            self.in_tags = False
+            return True
+        if not YAML_LINE_RE.match(line):
+            # Not YAML after all: the opening --- was a horizontal rule
+            self.frontmatter = BODY
+            self.in_tags = False
+            return False
+        if self.template is None:
+            if line.startswith('tags:'):
+                value = line[5:]
+                self.in_tags = not value.strip()
+                self.template = template_for_tags(parse_tags(value))
+            elif self.in_tags:
+                stripped = line.strip()
+                if stripped.startswith('- '):
+                    self.template = template_for_tags(parse_tags(stripped[2:]))
+                elif stripped:
+                    self.in_tags = False
+        return True
+
+    def _heading(self, level, title):
+        key = section_key(title)
+        if level <= 2:
+            self.h2 = key if level == 2 else None
+            self.h3 = None
+        elif level == 3:
+            self.h3 = key
+        if self.template is None:
+            self.template = MARKER_TEMPLATES.get(key)
+        self._rescope()
+
+    def classify(self, line):
+        """Kind of line: frontmatter, fence, code, heading, table, list, blank or text"""
+        if self.frontmatter != BODY:
+            if self.frontmatter == OPENING:
+                self.frontmatter = BODY
+                if line.rstrip() == '---':
+                    self.frontmatter = INSIDE
+                    return 'frontmatter'
+            elif self._frontmatter_line(line):
+                return 'frontmatter'
+        if self.fence is not None:
+            if closes_fence(line, self.fence):
+                self.fence = None
+                return 'fence'
+            return 'code'
+        stripped = line.lstrip()
+        if not stripped:
+            return 'blank'
+        first = stripped[0]
+        if first in '`~':
+            marker = fence_marker(line)
+            if marker is not None:
+                self.fence = marker
+                return 'fence'
+        elif first == '#' and line[0] == '#':
+            match = HEADING_RE.match(line)
+            if match:
+                self._heading(len(match.group(1)), match.group(2) or '')
+                return 'heading'
+        elif first == '|':
+            return 'table'
+        elif first in '-*+':
+            if stripped[1:2] in (' ', '\t', ''):
+                return 'list'
+        elif first.isdigit() and ORDERED_ITEM_RE.match(stripped):
+            return 'list'
+        return 'text'
+
+
+class Outline:
+    """Structure of one document; line numbers are 1-based"""
+
+    def __init__(self):
+        self.frontmatter = None      # (first line, last line)
+        self.template = None
+        self.tag_template = None     # Template named by the frontmatter tags
+        self.headings = []           # (line, level, title)
+        self.fences = []             # [first line, last line]
+        self.tables = []             # [first line, last line]
+        self.list_items = []         # line numbers
+
+    def has_heading(self, title):
+        key = section_key(title)
+        return any(section_key(text) == key for _line, _level, text in self.headings)
+
+
+def parse_outline(lines):
+    """Outline of a string or an iterable of lines, built in one pass"""
+    if isinstance(lines, str):
+        lines = lines.split('\n')
+    state = OutlineState()
+    outline = Outline()
+    previous = None
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        kind = state.classify(line)
+        if kind == 'frontmatter':
+            start = outline.frontmatter[0] if outline.frontmatter else number
+            outline.frontmatter = (start, number)
+            outline.tag_template = state.template
+        elif kind == 'heading':
+            match = HEADING_RE.match(line)
+            outline.headings.append((number, len(match.group(1)), (match.group(2) or '').strip()))
+        elif kind == 'fence' and state.fence is not None:
+            outline.fences.append([number, number])  # Opening marker
+        elif kind == 'fence' or kind == 'code':
+            outline.fences[-1][1] = number
+        elif kind == 'table':
+            if previous == 'table':
+                outline.tables[-1][1] = number
+            else:
+                outline.tables.append([number, number])
+        elif kind == 'list':
+            outline.list_items.append(number)
+        previous = kind
+    outline.template = state.template
+    return outline
@@ -0,0 +1,42 @@
+"""
+Project root discovery shared by the VERITAS hooks
+Plain os.path string handling: pathlib (with its re and urllib imports) is
+only loaded by callers that ask for a Path.
+"""
+
+import os
+
+from . import HOOKS_DIR
+
+
+def project_root_dir(start=None):
+    """Find the project root directory by looking for CLAUDE.md; returns a str"""
+    script_dir = os.path.realpath(start or HOOKS_DIR)
+
+    # If we're in .claude/hooks/, go up two levels to project root
+    parent = os.path.dirname(script_dir)
+    if os.path.basename(script_dir) == "hooks" and os.path.basename(parent) == ".claude":
+        project_root = os.path.dirname(parent)
+        if os.path.exists(os.path.join(project_root, "CLAUDE.md")):
+            return project_root
+
+    # Fallback: search upward from script directory
+    current = script_dir
+    while current != os.path.dirname(current):
+        if os.path.exists(os.path.join(current, "CLAUDE.md")):
+            return current
+        current = os.path.dirname(current)
+
+    # Last resort: check current working directory
+    return os.getcwd()
+
+
+def is_project_root(path):
+    """True for a directory with CLAUDE.md or .claude/, the only places hooks keep state"""
+    return os.path.exists(os.path.join(path, "CLAUDE.md")) or os.path.isdir(os.path.join(path, ".claude"))
+
+
+def find_project_root(start=None):
+    """project_root_dir() as a Path"""
+    from pathlib import Path
+    return Path(project_root_dir(start))
@@ -0,0 +1,254 @@
+"""
+Local PMID metadata index
+A SQLite table of PubMed records (first author, year, title, journal) loaded
+offline from PubMed baseline/update XML or JSON exports, so the verifier can
+check that cited PMIDs exist and match their author and year without a
+network round trip per citation.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import unicodedata
+from pathlib import Path
+
+DEFAULT_INDEX_PATH = Path.home() / ".veritas" / "pmid-index.db"
+
+# SQLite's historical host-parameter limit; larger lookups are chunked
+LOOKUP_CHUNK = 999
+LOAD_BATCH = 5000
+
+YEAR_RE = re.compile(r'\b(\d{4})\b')
+
+
+def normalize_name(name):
+    """Lower-case ASCII form of an author name for comparison"""
+    folded = unicodedata.normalize('NFKD', name or '')
+    return ''.join(c for c in folded if not unicodedata.combining(c)).lower().strip()
+
+
+def author_matches(cited, first_author):
+    """True when the cited surname is the record's first author surname (or part of it)"""
+    cited = normalize_name(cited)
+    surname = normalize_name(first_author)
+    return cited == surname or cited in re.split(r'[\s\-\']+', surname)
+
+
+def _open_text(path):
+    path = str(path)
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _year(text):
+    match = YEAR_RE.search(text or '')
+    return int(match.group(1)) if match else None
+
+
+def iter_pubmed_xml(path):
+    """Yield ('upsert', record) and ('delete', pmid) from a PubMed XML file
+
+    Handles baseline and update files (plain or .gz). Elements are cleared as
+    they are read, so memory stays flat on 30k-article baseline files.
+    """
+    # Loading an index is rare; post-command.py only needs author_matches
+    import xml.etree.ElementTree as ET
+
+    with _open_text(path) as f:
+        context = ET.iterparse(f, events=('start', 'end'))
+        _event, root = next(context)
+        for event, elem in context:
+            if event != 'end':
+                continue
+            if elem.tag == 'PubmedArticle':
+                record = _parse_article(elem)
+                if record is not None:
+                    yield 'upsert', record
+                root.clear()
+            elif elem.tag == 'DeleteCitation':
+                for pmid in elem.iter('PMID'):
+                    if (pmid.text or '').strip().isdigit():
+                        yield 'delete', int(pmid.text)
+                root.clear()
+
+
+def _parse_article(elem):
+    citation = elem.find('MedlineCitation')
+    if citation is None:
+        return None
+    pmid_text = (citation.findtext('PMID') or '').strip()
+    if not pmid_text.isdigit():
+        return None
+    article = citation.find('Article')
+    if article is None:
+        return None
+
+    first_author = None
+    for author in article.iterfind('AuthorList/Author'):
+        first_author = author.findtext('LastName') or author.findtext('CollectiveName')
+        if first_author:
+            break
+
+    pub_date = article.find('Journal/JournalIssue/PubDate')
+    year = None
+    if pub_date is not None:
+        year = _year(pub_date.findtext('Year')) or _year(pub_date.findtext('MedlineDate'))
+    # Electronic publication often precedes the issue by a year; either may be cited
+    epub_year = _year(article.findtext('ArticleDate/Year'))
+
+    title_elem = article.find('ArticleTitle')
+    title = ''.join(title_elem.itertext()) if title_elem is not None else None
+    journal = article.findtext('Journal/ISOAbbreviation') or article.findtext('Journal/Title')
+    return {'pmid': int(pmid_text), 'first_author': first_author, 'year': year or epub_year,
+            'epub_year': epub_year, 'title': title, 'journal': journal}
+
+
+def iter_pubmed_json(path):
+    """Yield ('upsert', record) from JSON exports
+
+    Accepts E-utilities esummary output ({"result": {"uids": [...], ...}}),
+    a JSON list of records, or JSON lines. Records use pmid/first_author/year
+    keys; esummary-style sortfirstauthor/authors/pubdate are also understood.
+    """
+    with _open_text(path) as f:
+        data = f.read().decode('utf-8')
+    try:
+        documents = [json.loads(data)]
+    except ValueError:
+        documents = [json.loads(line) for line in data.splitlines() if line.strip()]
+
+    for document in documents:
+        if isinstance(document, dict) and isinstance(document.get('result'), dict):
+            result = document['result']
+            items = [result[uid] for uid in result.get('uids', []) if uid in result]
+        elif isinstance(document, list):
+            items = document
+        else:
+            items = [document]
+        for item in items:
+            record = _json_record(item)
+            if record is not None:
+                yield 'upsert', record
+
+
+def _json_record(item):
+    if not isinstance(item, dict):
+        return None
+    pmid = str(item.get('pmid') or item.get('uid') or '').strip()
+    if not pmid.isdigit():
+        return None
+    first_author = item.get('first_author') or item.get('sortfirstauthor')
+    authors = [author.get('name') if isinstance(author, dict) else author for author in item.get('authors') or ()]
+    if not first_author and item.get('authors'):
+        author = item['authors'][0]
+        first_author = author.get('name') if isinstance(author, dict) else author
+    if first_author and ' ' in first_author and not item.get('first_author'):
+        # esummary names look like "Smith J"; keep the surname
+        first_author = first_author.rsplit(' ', 1)[0]
+    year = item.get('year')
+    year = int(year) if str(year or '').isdigit() else _year(item.get('pubdate') or item.get('sortpubdate'))
+    epub_year = item.get('epub_year')
+    epub_year = int(epub_year) if str(epub_year or '').isdigit() else _year(item.get('epubdate'))
+    return {'pmid': int(pmid), 'first_author': first_author, 'year': year or epub_year,
+            'epub_year': epub_year, 'title': item.get('title'),
+            'journal': item.get('journal') or item.get('source'), 'authors': [name for name in authors if name]}
+
+
+def iter_records(path):
+    """Pick the parser from the file name"""
+    name = str(path).lower()
+    if name.endswith(('.xml', '.xml.gz')):
+        return iter_pubmed_xml(path)
+    return iter_pubmed_json(path)
+
+
+class PMIDIndex:
+    """PubMed records keyed by PMID, with batched lookups"""
+
+    def __init__(self, db_path=DEFAULT_INDEX_PATH):
+        self.db_path = Path(db_path)
+        self._conn = None
+        self._conn_pid = None
+        self._readonly = None
+
+    def exists(self):
+        return self.db_path.exists()
+
+    def connect(self, readonly=False):
+        """Shared connection, reopened after a fork or to gain write access"""
+        if (self._conn is not None and self._conn_pid == os.getpid()
+                and (readonly or not self._readonly)):
+            return self._conn
+        self.close()
+        if readonly:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=5)
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    pmid INTEGER PRIMARY KEY,
+                    first_author TEXT,
+                    year INTEGER,
+                    epub_year INTEGER,
+                    title TEXT,
+                    journal TEXT
+                );
+            """)
+        self._conn, self._conn_pid, self._readonly = conn, os.getpid(), readonly
+        return conn
+
+    def close(self):
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def load(self, path):
+        """Load one dump file; returns (upserted, deleted) counts"""
+        conn = self.connect()
+        upserts, deletes = [], []
+        counts = [0, 0]
+
+        def flush():
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO articles (pmid, first_author, year, epub_year, title, journal) "
+                    "VALUES (:pmid, :first_author, :year, :epub_year, :title, :journal)", upserts)
+                conn.executemany("DELETE FROM articles WHERE pmid = ?", [(pmid,) for pmid in deletes])
+            counts[0] += len(upserts)
+            counts[1] += len(deletes)
+            upserts.clear()
+            deletes.clear()
+
+        for action, value in iter_records(path):
+            if action == 'upsert':
+                upserts.append(value)
+            else:
+                deletes.append(value)
+            if len(upserts) + len(deletes) >= LOAD_BATCH:
+                flush()
+        flush()
+        return tuple(counts)
+
+    def lookup(self, pmids):
+        """Return {pmid: (first_author, year, epub_year)} for the PMIDs that are indexed"""
+        pmids = sorted(set(pmids))
+        found = {}
+        if not pmids:
+            return found
+        conn = self.connect(readonly=True)
+        for i in range(0, len(pmids), LOOKUP_CHUNK):
+            chunk = pmids[i:i + LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            for pmid, first_author, year, epub_year in conn.execute(
+                    f"SELECT pmid, first_author, year, epub_year FROM articles "
+                    f"WHERE pmid IN ({placeholders})", chunk):
+                found[pmid] = (first_author, year, epub_year)
+        return found
+
+    def count(self):
+        return self.connect(readonly=True).execute("SELECT COUNT(*) FROM articles").fetchone()[0]
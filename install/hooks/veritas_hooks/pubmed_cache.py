@@ -0,0 +1,277 @@
+"""
+Offline cache of PubMed summaries
+PMIDs checked against NCBI are remembered in ~/.veritas/pubmed-cache.db:
+first author, author list, year, title and journal for PMIDs that exist,
+and a negative entry for PMIDs esummary answers with an error item. Entries
+expire after ttl_days (negative ones after negative_ttl_days, since a PMID
+that failed once is worth asking about again sooner) and the cache is
+trimmed to max_entries, least recently used first.
+
+post-command.py reads it directly, after the PMID index; pubmed-cache.py
+fills it from E-utilities esummary (ESummaryFetcher) or from saved esummary
+JSON, and can warm it with every PMID cited in the vaults.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from .pmid_index import LOOKUP_CHUNK, _json_record, iter_pubmed_json
+
+DEFAULT_CACHE_PATH = Path.home() / ".veritas" / "pubmed-cache.db"
+
+DEFAULTS = {
+    "enabled": True,
+    "ttl_days": 30,
+    "negative_ttl_days": 1,
+    "max_entries": 100000,
+}
+
+# A read refreshes an entry's LRU stamp at most this often, so repeat
+# lookups stay pure reads
+ACCESS_RESOLUTION = 3600
+
+ESUMMARY_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
+# esummary accepts a few hundred ids per POST
+FETCH_BATCH = 200
+# NCBI allows 3 requests/s without an API key, 10 with one
+REQUEST_INTERVAL = 0.34
+REQUEST_INTERVAL_WITH_KEY = 0.1
+
+
+def load_settings(config=None):
+    """DEFAULTS overridden by "pubmed_cache" in verification.json"""
+    settings = dict(DEFAULTS)
+    if isinstance(config, dict):
+        settings.update((key, value) for key, value in config.items() if key in DEFAULTS)
+    return settings
+
+
+class PubMedCache:
+    """PMID summaries with TTL expiry, negative entries and an LRU size limit"""
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, settings=None):
+        self.db_path = Path(db_path)
+        self.settings = settings or load_settings()
+        self._conn = None
+        self._conn_pid = None
+
+    def exists(self):
+        return self.db_path.exists()
+
+    def connect(self):
+        """Shared connection, reopened after a fork"""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                pmid INTEGER PRIMARY KEY,
+                found INTEGER NOT NULL,
+                first_author TEXT,
+                authors TEXT,
+                year INTEGER,
+                epub_year INTEGER,
+                title TEXT,
+                journal TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON summaries(accessed_at);
+        """)
+        self._conn, self._conn_pid = conn, os.getpid()
+        return conn
+
+    def close(self):
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def _cutoffs(self, now):
+        return (now - self.settings["ttl_days"] * 86400,
+                now - self.settings["negative_ttl_days"] * 86400)
+
+    def lookup(self, pmids, stale_ok=False):
+        """{pmid: (first_author, year, epub_year), or None if PubMed has no such PMID}
+
+        PMIDs that are not cached, or whose entry has expired, are left out.
+        stale_ok keeps expired entries for PMIDs that exist: their metadata
+        rarely changes, unlike a failed lookup.
+        """
+        pmids = sorted(set(pmids))
+        found = {}
+        if not pmids:
+            return found
+        conn = self.connect()
+        now = time.time()
+        fresh, negative_fresh = self._cutoffs(now)
+        if stale_ok:
+            fresh = 0
+        touched = []
+        for i in range(0, len(pmids), LOOKUP_CHUNK):
+            chunk = pmids[i:i + LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            for pmid, exists, first_author, year, epub_year, fetched_at, accessed_at in conn.execute(
+                    f"SELECT pmid, found, first_author, year, epub_year, fetched_at, accessed_at "
+                    f"FROM summaries WHERE pmid IN ({placeholders})", chunk):
+                if fetched_at < (fresh if exists else negative_fresh):
+                    continue
+                found[pmid] = (first_author, year, epub_year) if exists else None
+                if accessed_at < now - ACCESS_RESOLUTION:
+                    touched.append(pmid)
+        if touched:
+            try:
+                with conn:
+                    conn.execute("UPDATE summaries SET accessed_at = ? WHERE pmid IN "
+                                 "(SELECT value FROM json_each(?))", (now, json.dumps(touched)))
+            except sqlite3.OperationalError:
+                pass  # Busy writer; the stamp is refreshed on a later read
+        return found
+
+    def expired(self, pmids):
+        """The PMIDs among pmids that are not cached or whose entry has expired"""
+        pmids = set(pmids)
+        return sorted(pmids - set(self.lookup(pmids)))
+
+    def store(self, records, missing=(), now=None):
+        """Cache esummary records (pmid_index record dicts) and negative entries; returns the count"""
+        now = now or time.time()
+        rows = [(record['pmid'], 1, record.get('first_author'), json.dumps(record.get('authors') or []),
+                 record.get('year'), record.get('epub_year'), record.get('title'), record.get('journal'),
+                 now, now) for record in records]
+        rows.extend((int(pmid), 0, None, None, None, None, None, None, now, now) for pmid in missing)
+        if not rows:
+            return 0
+        conn = self.connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO summaries (pmid, found, first_author, authors, year, epub_year, "
+                "title, journal, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.prune()
+        return len(rows)
+
+    def import_file(self, path):
+        """Cache the records in an esummary JSON export; returns the count"""
+        return self.store([record for _action, record in iter_pubmed_json(path)])
+
+    def refresh(self, pmids, fetcher, force=False):
+        """Fetch the PMIDs that are missing or expired (all of them with force)
+
+        Returns (fetched, not_in_pubmed) counts. Network errors propagate;
+        nothing is recorded for a batch that failed.
+        """
+        pending = sorted(set(pmids)) if force else self.expired(pmids)
+        fetched = missing_count = 0
+        for records, missing in fetcher.fetch(pending):
+            self.store(records, missing)
+            fetched += len(records)
+            missing_count += len(missing)
+        return fetched, missing_count
+
+    def prune(self):
+        """Drop least recently used entries beyond max_entries; returns the number removed"""
+        limit = int(self.settings["max_entries"])
+        conn = self.connect()
+        excess = conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0] - limit
+        if excess <= 0:
+            return 0
+        with conn:
+            conn.execute("DELETE FROM summaries WHERE pmid IN "
+                         "(SELECT pmid FROM summaries ORDER BY accessed_at LIMIT ?)", (excess,))
+        return excess
+
+    def get(self, pmid):
+        """Full cached entry for one PMID as a dict, or None"""
+        conn = self.connect()
+        row = conn.execute("SELECT pmid, found, first_author, authors, year, epub_year, title, journal, "
+                           "fetched_at FROM summaries WHERE pmid = ?", (int(pmid),)).fetchone()
+        if row is None:
+            return None
+        keys = ('pmid', 'found', 'first_author', 'authors', 'year', 'epub_year', 'title', 'journal',
+                'fetched_at')
+        entry = dict(zip(keys, row))
+        entry['found'] = bool(entry['found'])
+        entry['authors'] = json.loads(entry['authors']) if entry['authors'] else []
+        return entry
+
+    def stats(self):
+        conn = self.connect()
+        fresh, negative_fresh = self._cutoffs(time.time())
+        found, negative, stale = conn.execute(
+            "SELECT COALESCE(SUM(found), 0), COALESCE(SUM(1 - found), 0), "
+            "COALESCE(SUM(CASE WHEN fetched_at < (CASE found WHEN 1 THEN ? ELSE ? END) THEN 1 ELSE 0 END), 0) "
+            "FROM summaries", (fresh, negative_fresh)).fetchone()
+        return {'entries': found + negative, 'found': found, 'not_in_pubmed': negative, 'expired': stale,
+                'max_entries': self.settings["max_entries"]}
+
+
+class ESummaryFetcher:
+    """Batched E-utilities esummary requests, paced to NCBI's rate limits"""
+
+    def __init__(self, api_key=None, email=None, base_url=None, batch_size=FETCH_BATCH, timeout=30):
+        self.api_key = api_key if api_key is not None else os.environ.get('PUBMED_API_KEY')
+        self.email = email if email is not None else os.environ.get('PUBMED_EMAIL')
+        # PUBMED_ESUMMARY_URL points at a mirror or a local stand-in
+        self.base_url = base_url or os.environ.get('PUBMED_ESUMMARY_URL') or ESUMMARY_URL
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.interval = REQUEST_INTERVAL_WITH_KEY if self.api_key else REQUEST_INTERVAL
+        self._last_request = 0.0
+
+    def _request(self, pmids):
+        # urllib is only needed when fetching; post-command.py reads the cache without it
+        import urllib.parse
+        import urllib.request
+
+        params = {'db': 'pubmed', 'retmode': 'json', 'tool': 'veritas', 'id': ','.join(map(str, pmids))}
+        if self.api_key:
+            params['api_key'] = self.api_key
+        if self.email:
+            params['email'] = self.email
+        wait = self._last_request + self.interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        # POST keeps long id lists out of the URL
+        request = urllib.request.Request(self.base_url, data=urllib.parse.urlencode(params).encode())
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.load(response)
+        finally:
+            self._last_request = time.monotonic()
+
+    def fetch(self, pmids):
+        """Yield (records, missing PMIDs) per batch
+
+        Only PMIDs that esummary answers with an error item count as missing;
+        any other PMID it leaves out is in neither list, so it stays uncached
+        and is asked about again. A response without a result (esummary can
+        answer HTTP 200 with just an error message) raises ValueError.
+        """
+        pmids = sorted(set(int(pmid) for pmid in pmids))
+        for i in range(0, len(pmids), self.batch_size):
+            batch = pmids[i:i + self.batch_size]
+            response = self._request(batch)
+            if not isinstance(response, dict):
+                response = {}
+            result = response.get('result')
+            if not isinstance(result, dict) or not isinstance(result.get('uids'), list):
+                detail = response.get('esummaryresult') or response.get('error') or response
+                raise ValueError(f"esummary returned no result: {detail}"[:300])
+            records = []
+            missing = []
+            for pmid in batch:
+                item = result.get(str(pmid))
+                if not isinstance(item, dict):
+                    continue
+                if item.get('error'):
+                    missing.append(pmid)
+                    continue
+                record = _json_record(item)
+                if record is not None:
+                    records.append(record)
+            yield records, missing
@@ -0,0 +1,196 @@
+"""
+Incremental verification cache
+Documents are split into blocks at blank lines outside code fences. Each
+block's findings are stored under a hash of its content, so re-verifying an
+edited note only re-runs the rule engine on the blocks that changed.
+Blocks are scanned in order, and the outline state a block starts from
+(frontmatter, open fence, template and section) is part of its key; the
+state it ends in is stored with its findings and feeds the next block.
+The store is a small SQLite file with LRU eviction.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from .rules import ALL_RULES, ScanResult
+
+DEFAULT_MAX_BLOCKS = 20000
+DEFAULT_MAX_FILES = 5000
+
+# Larger files are streamed straight through the rule engine, uncached
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+
+# Writes between LRU eviction passes within one process
+EVICT_INTERVAL = 256
+
+# Seconds before a cache hit refreshes its LRU timestamp
+TOUCH_INTERVAL = 60
+
+
+def split_blocks(lines):
+    """Yield (start_line, lines) blocks; each ends with its trailing blank lines"""
+    block = []
+    start = 1
+    in_fence = False
+    after_blank = False
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        blank = not line.strip()
+        if block and after_blank and not blank and not in_fence:
+            yield start, block
+            block = []
+            start = number
+        block.append(line)
+        if line.startswith('```'):
+            in_fence = not in_fence
+        after_blank = blank
+    if block:
+        yield start, block
+
+
+class VerificationCache:
+    """Per-block findings keyed by content hash, plus each file's block list"""
+
+    def __init__(self, db_path, max_blocks=DEFAULT_MAX_BLOCKS, max_files=DEFAULT_MAX_FILES):
+        self.db_path = db_path
+        self.max_blocks = max_blocks
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._conn_pid = None
+        self._writes_since_evict = EVICT_INTERVAL  # Evict on the first write of each process
+
+    def connect(self):
+        """Shared connection, reopened after a fork (e.g. in pool workers)"""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blocks (
+                hash TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_blocks_used ON blocks(used);
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                hashes TEXT NOT NULL,
+                used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_files_used ON files(used);
+        """)
+        self._conn, self._conn_pid = conn, os.getpid()
+        return conn
+
+    def close(self):
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    @staticmethod
+    def block_key(block, is_markdown, rules, signature, state=None):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{signature}|{int(is_markdown)}|{','.join(sorted(rules))}|"
+                      f"{json.dumps(state)}\n".encode())
+        digest.update('\n'.join(block).encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def scan(self, engine, path, lines, is_markdown=False, rules=ALL_RULES):
+        """Equivalent to engine.scan(lines, ...), reusing cached block results"""
+        blocks = list(split_blocks(lines))
+        now = time.time()
+        conn = self.connect()
+        cached = {}
+        last_used = {}
+        keys = []
+
+        # Keys depend on the state the previous block ended in, so they are
+        # only known one by one; prefetch the blocks of the file's last
+        # version in batches and probe the rest individually
+        file_row = None
+        if path is not None:
+            file_row = conn.execute("SELECT hashes, used FROM files WHERE path = ?", (str(path),)).fetchone()
+        previous = json.loads(file_row[0]) if file_row is not None else []
+        for i in range(0, len(previous), 500):
+            chunk = previous[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for key, block_result, used in conn.execute(
+                    f"SELECT hash, result, used FROM blocks WHERE hash IN ({placeholders})", chunk):
+                cached[key] = json.loads(block_result)
+                last_used[key] = used
+
+        result = ScanResult()
+        fresh = []
+        state = None
+        for start, block in blocks:
+            key = self.block_key(block, is_markdown, rules, engine.signature, state)
+            keys.append(key)
+            block_result = cached.get(key)
+            if block_result is None:
+                row = conn.execute("SELECT result, used FROM blocks WHERE hash = ?", (key,)).fetchone()
+                if row is not None:
+                    block_result = cached[key] = json.loads(row[0])
+                    last_used[key] = row[1]
+            if block_result is None:
+                scanned = engine.scan_lines(block, is_markdown, rules, state=state)
+                block_result = {'findings': scanned.findings, 'facts': scanned.facts,
+                                'citations': scanned.citations, 'links': scanned.links,
+                                'state': scanned.state}
+                cached[key] = block_result
+                fresh.append((key, json.dumps(block_result), now))
+                self.misses += 1
+            else:
+                self.hits += 1
+            state = block_result['state']
+
+            offset = start - 1
+            for finding in block_result['findings']:
+                finding = dict(finding)
+                finding['line'] += offset
+                result.findings.append(finding)
+            for fact, (line, column) in block_result['facts'].items():
+                result.note(fact, line + offset, column)
+            for citation in block_result['citations']:
+                result.citations.append([citation[0] + offset] + citation[1:])
+            for line, column, target in block_result['links']:
+                result.links.append([line + offset, column, target])
+            result.last_line = offset + len(block)
+
+        # LRU timestamps only need minute resolution; skip writes for warm blocks
+        touched = [(now, key) for key, used in last_used.items() if now - used > TOUCH_INTERVAL]
+        if path is not None:
+            hashes = json.dumps(keys)
+            if file_row is not None and file_row[0] == hashes and now - file_row[1] <= TOUCH_INTERVAL:
+                path = None
+        if fresh or touched or path is not None:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO blocks (hash, result, used) VALUES (?, ?, ?)", fresh)
+                conn.executemany("UPDATE blocks SET used = ? WHERE hash = ?", touched)
+                if path is not None:
+                    conn.execute("INSERT OR REPLACE INTO files (path, hashes, used) VALUES (?, ?, ?)",
+                                 (str(path), hashes, now))
+                self._writes_since_evict += len(fresh) + 1
+                if self._writes_since_evict >= EVICT_INTERVAL:
+                    self._evict(conn)
+                    self._writes_since_evict = 0
+
+        engine.finalize(result, is_markdown, rules)
+        return result
+
+    def _evict(self, conn):
+        """Drop least recently used entries beyond the size caps"""
+        for table, cap in (("blocks", self.max_blocks), ("files", self.max_files)):
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            if count > cap:
+                key = "hash" if table == "blocks" else "path"
+                conn.execute(
+                    f"DELETE FROM {table} WHERE {key} IN "
+                    f"(SELECT {key} FROM {table} ORDER BY used LIMIT ?)",
+                    (count - cap,))
@@ -0,0 +1,235 @@
+"""
+Retention cleanup for the conversation-logger database
+Old messages and activities are deleted in bounded chunks, each in its own
+short WAL-mode transaction (together with their full-text index entries), so
+the MCP logger can keep writing between chunks. Timestamp and session indexes
+are created on first use, which turns every chunk into an index range scan.
+The last run is recorded in a state file and the cleanup triggers on
+elapsed time, not on the hour of day.
+"""
+
+import fcntl
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+from .conversation_db import DEFAULT_DB_PATH, LOGGER_DIR
+from .conversation_search import ensure_fts
+
+CONFIG_PATH = os.path.join(LOGGER_DIR, "retention.json")
+STATE_PATH = os.path.join(LOGGER_DIR, "retention-state.json")
+
+DEFAULTS = {
+    "enabled": True,
+    "retention_days": 5,
+    # Elapsed time between cleanups
+    "interval_hours": 24,
+    # Rows per DELETE transaction
+    "chunk_rows": 1000,
+    # Cleanup time per hook run; the rest carries over to the next run
+    "max_seconds": 2.0,
+    # Milliseconds a chunk waits for the logger's write lock
+    "busy_timeout_ms": 2000,
+    # Freelist pages returned per run once incremental auto-vacuum is on; 0 disables
+    "vacuum_pages": 2000,
+}
+
+INDEXES = [
+    ("idx_messages_timestamp", "messages", "timestamp"),
+    ("idx_messages_session", "messages", "session_id"),
+    ("idx_activities_timestamp", "activities", "timestamp"),
+    ("idx_activities_session", "activities", "session_id"),
+    ("idx_sessions_start", "sessions", "start_time"),
+]
+
+
+def load_settings(path=CONFIG_PATH):
+    """DEFAULTS overridden by retention.json, written by setup.sh"""
+    settings = dict(DEFAULTS)
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return settings
+    if isinstance(data, dict):
+        settings.update((key, value) for key, value in data.items() if key in DEFAULTS)
+    return settings
+
+
+def cutoff_timestamp(days, now=None):
+    """UTC cutoff in SQLite's CURRENT_TIMESTAMP format, which the logger writes"""
+    now = now or datetime.now(timezone.utc)
+    return (now - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class Retention:
+    """Chunked, resumable cleanup of rows older than the retention period"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, state_path=STATE_PATH, settings=None):
+        self.db_path = db_path
+        self.state_path = state_path
+        self.settings = settings or load_settings()
+
+    def read_state(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def write_state(self, state):
+        tmp = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp, self.state_path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def is_due(self, now=None):
+        """True when enabled and the last run is older than interval_hours or unfinished"""
+        if not self.settings["enabled"] or not os.path.exists(self.db_path):
+            return False
+        state = self.read_state()
+        if not state.get("complete", True):
+            return True
+        now = now or time.time()
+        return now - state.get("last_run", 0) >= self.settings["interval_hours"] * 3600
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.settings["busy_timeout_ms"] / 1000)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.settings['busy_timeout_ms'])}")
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            pass  # Logger mid-write; the switch is retried next run
+        return conn
+
+    @staticmethod
+    def ensure_indexes(conn):
+        """Create the timestamp and session indexes on tables that exist"""
+        tables = {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for name, table, column in INDEXES:
+            if table in tables:
+                with conn:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({column})")
+        return tables
+
+    def _delete_chunks(self, conn, table, select, params, deadline):
+        """Delete the rows select returns, a chunk per transaction, until it comes
+        back short; returns (rows, finished)"""
+        chunk = int(self.settings["chunk_rows"])
+        total = 0
+        while True:
+            with conn:
+                ids = [row_id for row_id, in conn.execute(select, params + (chunk,))]
+                conn.execute(f"DELETE FROM {table} WHERE rowid IN (SELECT value FROM json_each(?))",
+                             (json.dumps(ids),))
+            total += len(ids)
+            if len(ids) < chunk:
+                return total, True
+            if time.monotonic() >= deadline:
+                return total, False
+
+    def run(self, max_seconds=None, vacuum=True):
+        """Delete expired rows; returns the run's summary, also saved as the state"""
+        if not os.path.exists(self.db_path):
+            return None
+        started = time.monotonic()
+        budget = self.settings["max_seconds"] if max_seconds is None else max_seconds
+        deadline = started + budget if budget else float('inf')
+        cutoff = cutoff_timestamp(self.settings["retention_days"])
+        deleted = {"messages": 0, "activities": 0, "sessions": 0}
+        finished = True
+
+        conn = self.connect()
+        try:
+            tables = self.ensure_indexes(conn)
+            # Deletes below leave the search index through its triggers
+            ensure_fts(conn)
+            for table in ("messages", "activities"):
+                if table not in tables or not finished:
+                    continue
+                # Selecting rowids with LIMIT bounds each transaction without
+                # needing SQLITE_ENABLE_UPDATE_DELETE_LIMIT
+                deleted[table], finished = self._delete_chunks(
+                    conn, table, f"SELECT rowid FROM {table} WHERE timestamp < ? LIMIT ?",
+                    (cutoff,), deadline)
+            if finished and {"sessions", "messages", "activities"} <= tables:
+                # NOT EXISTS probes the session_id indexes once per session
+                deleted["sessions"], finished = self._delete_chunks(conn, "sessions", """
+                    SELECT rowid FROM sessions s WHERE s.start_time < ?
+                    AND NOT EXISTS (SELECT 1 FROM messages m WHERE m.session_id = s.id)
+                    AND NOT EXISTS (SELECT 1 FROM activities a WHERE a.session_id = s.id)
+                    LIMIT ?
+                """, (cutoff,), deadline)
+
+            vacuumed = 0
+            if vacuum and finished and self.settings["vacuum_pages"]:
+                vacuumed = self.incremental_vacuum(conn)
+            try:
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            except sqlite3.OperationalError:
+                pass
+        finally:
+            conn.close()
+
+        summary = {
+            "last_run": time.time(),
+            "complete": finished,
+            "cutoff": cutoff,
+            "deleted": deleted,
+            "vacuumed_pages": vacuumed,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+        }
+        self.write_state(summary)
+        return summary
+
+    def incremental_vacuum(self, conn):
+        """Return up to vacuum_pages free pages to the filesystem; 0 unless auto_vacuum is incremental"""
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return 0
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if not before:
+            return 0
+        # execute() steps the pragma once, freeing a single page; executescript
+        # runs it to completion
+        conn.executescript(f"PRAGMA incremental_vacuum({int(self.settings['vacuum_pages'])})")
+        return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def enable_incremental_vacuum(self):
+        """Switch the database to incremental auto-vacuum
+
+        Needs one full VACUUM, which locks the database while it rewrites it,
+        so this is a manual step rather than part of run().
+        """
+        if not os.path.exists(self.db_path):
+            return False
+        conn = self.connect()
+        try:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        finally:
+            conn.close()
+
+    def run_if_due(self):
+        """run() when due and no other process is already cleaning; returns the summary or None"""
+        if not self.is_due():
+            return None
+        lock_path = f"{self.state_path}.lock"
+        with open(lock_path, 'a') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return None
+            # Another process may have finished a run while we waited on is_due
+            if not self.is_due():
+                return None
+            return self.run()
@@ -0,0 +1,407 @@
+"""
+Single-pass rule engine behind HLAOutputVerifier
+Every claim, forbidden-phrase, citation and formatting rule is compiled into
+one trigger table keyed by word or character, so each line is tokenized once
+and only the rules it can possibly violate are confirmed with their regex.
+Every finding carries its line and column. Lines are classified by the
+outline parser as they are read: frontmatter and fenced code are never
+checked, and sections a note template exempts skip those rules entirely.
+"""
+
+import hashlib
+import re
+
+from .link_index import line_links
+from .markdown import split_code_spans
+from .outline import DEFAULT_SCOPES, OPAQUE_KINDS, OutlineState, scope_signature
+
+# Valid citation: (Author et al., YYYY, PMID: NNNNNNNN)
+VALID_CITATION = r'\([A-Z][a-z]+ et al\., \d{4}, PMID: \d{8}\)'
+
+# Medical/scientific claim indicators
+CLAIM_INDICATORS = [
+    r'\b\d+(?:\.\d+)?%\b',  # Percentages
+    r'\b(?:increased?|decreased?|associated?|correlated?|significant)\b',
+    r'\b(?:incidence|prevalence|rate|risk|odds|hazard|ratio)\b',
+    r'\b(?:p\s*[<=]\s*0\.\d+)\b',  # p-values
+    r'\b(?:n\s*=\s*\d+)\b',  # sample sizes
+]
+
+# General claims that need a citation on the same or the following line
+FORBIDDEN_PHRASES = [
+    (r'\b(?:it is (?:well )?known)\b', 'it is known'),
+    (r'\b(?:studies show)\b', 'studies show'),
+    (r'\b(?:research indicates)\b', 'research indicates'),
+    (r'\b(?:evidence suggests)\b', 'evidence suggests'),
+    (r'\b(?:has been shown)\b', 'has been shown'),
+    (r'\b(?:data demonstrates?)\b', 'data demonstrates'),
+]
+
+VERIFICATION_LEVELS = ['[FT-VERIFIED]', '[ABSTRACT-VERIFIED]', '[NEEDS-FT-REVIEW]']
+
+# Rule ids accepted by RuleEngine.scan(rules=...)
+ALL_RULES = frozenset([
+    'missing_pmid',
+    'unsupported_claim',
+    'verification_level',
+    'escaped_newline',
+    'html_entity',
+    'h1_underscore',
+    'table_formatting',
+    'citation_refs',
+    'wiki_links',
+    'placeholders',
+])
+
+# Template placeholder text: XX / YYYY-MM-DD style runs, X.X, "Author et al.,
+# Year", and bracketed instructions such as [X% rate] or [Write 2-3 paragraphs]
+PLACEHOLDER_TOKENS = r'\b(?:XX+|YY+|ZZ+|X\.X|Author et al\., Year)\b'
+
+# Bump when scan logic changes so cached block results are invalidated
+ENGINE_VERSION = 5
+ENGINE_SIGNATURE = hashlib.sha1(repr((
+    ENGINE_VERSION, VALID_CITATION, CLAIM_INDICATORS, FORBIDDEN_PHRASES,
+    VERIFICATION_LEVELS, PLACEHOLDER_TOKENS, sorted(ALL_RULES),
+)).encode()).hexdigest()[:16]
+
+H1_UNDERSCORE = re.compile(r'^#\s+.*_.*$')
+CITATION_RE = re.compile(VALID_CITATION)
+# Same pipes fix_markdown spaces: one touching text on either side
+BAD_PIPE_RE = re.compile(r'\|(?=[^\s|])|(?<=[^\s|])\|')
+CLAIM_RES = [re.compile(pattern, re.IGNORECASE) for pattern in CLAIM_INDICATORS]
+FORBIDDEN_RES = [re.compile(pattern, re.IGNORECASE) for pattern, _phrase in FORBIDDEN_PHRASES]
+WORDS_RE = re.compile(r'\w+')
+# A PMID reference, with the author and year when it is a full citation
+PMID_REF_RE = re.compile(r'(?:\(([A-Z][a-z]+) et al\., (\d{4}), )?PMID:\s*(\d+)')
+LEVEL_RE = re.compile('|'.join(re.escape(level) for level in VERIFICATION_LEVELS))
+PLACEHOLDER_RE = re.compile(PLACEHOLDER_TOKENS)
+# [...] that is not part of a wiki link, a [text](url) link or a checkbox
+BRACKET_RE = re.compile(r'(?<!\[)\[([^\[\]]+)\](?![\](])')
+BRACKET_TOKEN_RE = re.compile(r'\b[XYZ]\b')
+
+
+def _build_triggers():
+    """Map each lower-case word that can start a match to the rules it triggers"""
+    triggers = {}
+    # Word-list indicators match whole words, so a token lookup is exact
+    for index in (1, 2):
+        words = re.search(r'\(\?:([^)]*)\)', CLAIM_INDICATORS[index]).group(1)
+        for word in words.split('|'):
+            if word.endswith('?'):
+                triggers.setdefault(word[:-2], set()).add(('claim', index))
+                word = word.replace('?', '')
+            triggers.setdefault(word, set()).add(('claim', index))
+    # Forbidden phrases are triggered by their first word and confirmed by regex
+    for index, (_pattern, phrase) in enumerate(FORBIDDEN_PHRASES):
+        triggers.setdefault(phrase.split()[0], set()).add(('forbidden', index))
+    return {word: tuple(sorted(rules)) for word, rules in triggers.items()}
+
+
+TRIGGERS = _build_triggers()
+TRIGGER_WORDS = frozenset(TRIGGERS)
+
+# Indicators that need a character to be present before their regex can match
+CHARACTER_TRIGGERS = [
+    (0, ('%',)),       # Percentages
+    (3, ('<', '=')),   # p-values
+    (4, ('=',)),       # sample sizes
+]
+
+
+def line_citations(line):
+    """[(column, pmid, author, year, level)] for the PMID references on a line
+
+    author and year are None for a bare "PMID: N" reference. level is the
+    verification tag (without brackets) following the reference on the same
+    line, before the next reference, or None.
+    """
+    matches = list(PMID_REF_RE.finditer(line))
+    tags = list(LEVEL_RE.finditer(line)) if matches and '[' in line else ()
+    refs = []
+    for index, match in enumerate(matches):
+        author, year, pmid = match.groups()
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(line)
+        level = next((tag.group()[1:-1] for tag in tags if match.end() <= tag.start() < end), None)
+        refs.append((match.start() + 1, int(pmid), author, int(year) if year else None, level))
+    return refs
+
+
+def find_placeholder(line):
+    """Column of the first template placeholder in line, or None"""
+    match = PLACEHOLDER_RE.search(line)
+    column = match.start() + 1 if match else None
+    if '[' in line:
+        for bracket in BRACKET_RE.finditer(line, 0, column - 1 if column else len(line)):
+            text = bracket.group(1)
+            if text.strip() in ('', 'x', 'X'):
+                continue  # Task list checkbox
+            # Instructions are several words with no data in them
+            if BRACKET_TOKEN_RE.search(text) or (len(text.split()) >= 3 and not any(c.isdigit() for c in text)):
+                return bracket.start() + 1
+    return column
+
+
+def iter_lines(text):
+    """Yield the lines of a string one at a time, like text.split('\\n') without the list"""
+    start = 0
+    find = text.find
+    while True:
+        end = find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+class ScanResult:
+    """Findings from one scan plus document-level facts for finalize()"""
+
+    def __init__(self):
+        self.findings = []
+        self.last_line = 0
+        # Document-level facts: name -> (line, column) of first occurrence
+        self.facts = {}
+        # PMID references: [line, column, pmid, author or None, year or None, level or None]
+        self.citations = []
+        # Wiki links: [line, column, target]
+        self.links = []
+        # OutlineState.key() after the last line, for scanning the next block
+        self.state = None
+
+    def note(self, fact, line, column):
+        if fact not in self.facts:
+            self.facts[fact] = (line, column)
+
+
+class RuleEngine:
+    """Scans lines once and reports violations (errors) and warnings
+
+    scopes is an outline.scope_table(), for per-project section exemptions.
+    """
+
+    def __init__(self, scopes=None):
+        self.scopes = DEFAULT_SCOPES if scopes is None else scopes
+        self.signature = ENGINE_SIGNATURE if scopes is None else \
+            hashlib.sha1(f"{ENGINE_SIGNATURE}|{scope_signature(scopes)}".encode()).hexdigest()[:16]
+
+    def scan(self, lines, is_markdown=False, rules=ALL_RULES, start_line=1):
+        """Scan an iterable of lines; returns a finalized ScanResult"""
+        result = self.scan_lines(lines, is_markdown, rules, start_line)
+        self.finalize(result, is_markdown, rules)
+        return result
+
+    def scan_lines(self, lines, is_markdown=False, rules=ALL_RULES, start_line=1, state=None):
+        """Line-level rules only; document-level rules are added by finalize()
+
+        state is the OutlineState.key() left by the previous block, or None
+        at the start of a document.
+        """
+        result = ScanResult()
+        findings = result.findings
+        note = result.note
+        check_claims = 'missing_pmid' in rules
+        check_unsupported = 'unsupported_claim' in rules
+        check_h1 = is_markdown and 'h1_underscore' in rules
+        check_tables = is_markdown and 'table_formatting' in rules
+        check_escapes = is_markdown and 'escaped_newline' in rules
+        check_entities = is_markdown and 'html_entity' in rules
+        check_levels = 'verification_level' in rules
+        collect_citations = 'citation_refs' in rules
+        citations = result.citations
+        collect_links = 'wiki_links' in rules
+        links = result.links
+        check_placeholders = 'placeholders' in rules
+        find_words = WORDS_RE.findall
+        trigger_words = TRIGGER_WORDS
+        outline = OutlineState.from_key(state, self.scopes)
+        classify = outline.classify
+
+        pending = []  # unsupported claims waiting on the next line's PMID
+        line_no = start_line - 1
+        for line_no, line in enumerate(lines, start_line):
+            line = line.rstrip('\r\n')
+            kind = classify(line)
+            has_pmid = 'PMID:' in line
+            if pending:
+                if not has_pmid:
+                    findings.extend(pending)
+                pending = []
+            # Frontmatter and fenced code are not prose
+            if kind in OPAQUE_KINDS:
+                continue
+
+            # Skip headers and empty lines, and sections the template exempts
+            skipped = outline.skipped
+            claim_line = check_claims and 'missing_pmid' not in skipped and not (
+                line.startswith('#') or kind == 'blank'
+            )
+            unsupported_line = check_unsupported and 'unsupported_claim' not in skipped
+            if (claim_line or unsupported_line or check_placeholders) and \
+                    ('X' in line or 'Y' in line or 'Z' in line or '[' in line):
+                column = find_placeholder(line)
+                if column is not None:
+                    # An unfilled template line is reported once, as a
+                    # placeholder, rather than as claims
+                    if check_placeholders:
+                        note('placeholder', line_no, column)
+                    claim_line = unsupported_line = False
+
+            # Document-level facts
+            if has_pmid:
+                note('pmid', line_no, line.index('PMID:') + 1)
+                if collect_citations or check_levels:
+                    refs = line_citations(line)
+                    if collect_citations:
+                        citations.extend([line_no, *ref] for ref in refs)
+                    if check_levels:
+                        # In-text citations need a tag; reference list entries don't
+                        for column, _pmid, author, _year, level in refs:
+                            if author is not None and level is None:
+                                note('untagged', line_no, column)
+                                break
+            if collect_links and '[[' in line:
+                for column, target in line_links(line):
+                    links.append([line_no, column, target])
+            if check_levels and '[' in line:
+                for level in VERIFICATION_LEVELS:
+                    if level in line:
+                        note('level', line_no, line.index(level) + 1)
+                        break
+            if check_escapes and '\\n' in line:
+                note('escaped_newline', line_no, line.index('\\n') + 1)
+            if check_entities and ('&gt;' in line or '&lt;' in line):
+                positions = [line.find(entity) for entity in ('&gt;', '&lt;')]
+                note('html_entity', line_no, min(p for p in positions if p >= 0) + 1)
+
+            # One tokenization decides which word-triggered rules can fire
+            hits = ()
+            if claim_line or unsupported_line:
+                hits = trigger_words.intersection(find_words(line.lower()))
+
+            if claim_line:
+                categories = set()
+                for word in hits:
+                    for rule_kind, index in TRIGGERS[word]:
+                        if rule_kind == 'claim':
+                            categories.add(index)
+                for index, characters in CHARACTER_TRIGGERS:
+                    if any(c in line for c in characters):
+                        categories.add(index)
+                if categories and not (has_pmid and CITATION_RE.search(line)):
+                    for index in sorted(categories):
+                        match = CLAIM_RES[index].search(line)
+                        if match:
+                            findings.append({
+                                'line': line_no,
+                                'column': match.start() + 1,
+                                'type': 'missing_pmid',
+                                'content': line[:100],
+                                'severity': 'error'
+                            })
+
+            if check_h1 and line.startswith('#') and H1_UNDERSCORE.match(line):
+                findings.append({
+                    'line': line_no,
+                    'column': 1,
+                    'type': 'obsidian_formatting',
+                    'content': f'H1 heading contains underscore: {line}',
+                    'severity': 'error'
+                })
+
+            if check_tables and '|' in line:
+                match = BAD_PIPE_RE.search(line)
+                if match and '`' in line:
+                    # Pipes inside inline code are literal
+                    match = None
+                    offset = 0
+                    for is_code, text in split_code_spans(line):
+                        if not is_code and '|' in text:
+                            match = BAD_PIPE_RE.search(line, offset, offset + len(text))
+                            if match:
+                                break
+                        offset += len(text)
+                if match:
+                    findings.append({
+                        'line': line_no,
+                        'column': match.start() + 1,
+                        'type': 'table_formatting',
+                        'message': f'Table may need spaces around pipes: {line[:50]}',
+                        'severity': 'warning'
+                    })
+
+            if unsupported_line and hits:
+                unsupported = []
+                for index in sorted({index for word in hits
+                                     for rule_kind, index in TRIGGERS[word] if rule_kind == 'forbidden'}):
+                    match = FORBIDDEN_RES[index].search(line)
+                    if match:
+                        unsupported.append({
+                            'line': line_no,
+                            'column': match.start() + 1,
+                            'type': 'unsupported_claim',
+                            'content': f'"{FORBIDDEN_PHRASES[index][1]}" without citation',
+                            'severity': 'error'
+                        })
+                if unsupported and not has_pmid:
+                    pending = unsupported
+
+        # The last line has no following line that could carry the PMID
+        findings.extend(pending)
+        result.last_line = line_no
+        result.state = outline.key()
+        return result
+
+    def finalize(self, result, is_markdown=False, rules=ALL_RULES):
+        """Turn document-level facts into findings"""
+        facts = result.facts
+        if is_markdown:
+            if 'escaped_newline' in rules and 'escaped_newline' in facts:
+                line, column = facts['escaped_newline']
+                result.findings.append({
+                    'line': line,
+                    'column': column,
+                    'type': 'obsidian_formatting',
+                    'content': 'Contains escaped newlines (\\n)',
+                    'severity': 'error'
+                })
+            if 'html_entity' in rules and 'html_entity' in facts:
+                line, column = facts['html_entity']
+                result.findings.append({
+                    'line': line,
+                    'column': column,
+                    'type': 'obsidian_formatting',
+                    'content': 'Contains HTML entities (&gt; or &lt;)',
+                    'severity': 'error'
+                })
+
+        if 'placeholders' in rules and 'placeholder' in facts:
+            line, column = facts['placeholder']
+            result.findings.append({
+                'line': line,
+                'column': column,
+                'type': 'template_placeholder',
+                'message': 'Template placeholder text has not been filled in',
+                'severity': 'warning'
+            })
+
+        if 'verification_level' in rules and 'pmid' in facts and 'level' not in facts:
+            line, column = facts['pmid']
+            result.findings.append({
+                'line': line,
+                'column': column,
+                'type': 'missing_verification_level',
+                'message': 'Citations present but no verification levels found',
+                'severity': 'warning'
+            })
+        elif 'verification_level' in rules and 'untagged' in facts:
+            line, column = facts['untagged']
+            result.findings.append({
+                'line': line,
+                'column': column,
+                'type': 'missing_verification_level',
+                'message': 'Citation has no verification level tag ([FT-VERIFIED], [ABSTRACT-VERIFIED] '
+                           'or [NEEDS-FT-REVIEW])',
+                'severity': 'warning'
+            })
+        return result
@@ -0,0 +1,191 @@
+"""
+Hook timing instrumentation
+Hooks time their phases (startup, root discovery, config load, checks, log
+write) with a monotonic clock and append them to a fixed-size ring buffer
+file, .claude/state/hook-timings.bin. hook-stats.py reports percentiles.
+
+Usage inside a hook:
+    timing.start("post-command")
+    with timing.phase("config_load"):
+        ...
+    timing.finish()
+
+phase() is a no-op when no timer is active, so shared code (e.g. the
+verifier inside verify-vault.py workers) can be instrumented unconditionally.
+Set VERITAS_HOOK_TIMINGS=0 to disable recording. Nothing is written outside
+a project root (a directory with CLAUDE.md or .claude/).
+"""
+
+import fcntl
+import os
+import struct
+import time
+
+RING_SLOTS = 8192
+# Header: total records ever written; slot = count % RING_SLOTS
+HEADER = struct.Struct('<Q')
+# Record: wall-clock timestamp, seconds, hook name, phase name
+RECORD = struct.Struct('<dd24s24s')
+
+# Set by hook-server.py: hooks there share a long-lived process, so the
+# interpreter startup phase does not apply to them
+in_server = False
+
+_current = None
+
+
+def ring_path(project_root):
+    """Ring buffer file for a project root given as a str or Path"""
+    return os.path.join(project_root, ".claude", "state", "hook-timings.bin")
+
+
+def enabled():
+    return os.environ.get("VERITAS_HOOK_TIMINGS", "1") != "0"
+
+
+def process_age():
+    """Seconds since this process started, where the platform exposes it"""
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            fields = f.read().rsplit(b")", 1)[1].split()
+        with open("/proc/uptime", "rb") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class HookTimer:
+    """Collects one hook run's phase timings and writes them in one append"""
+
+    def __init__(self, hook, record_startup=True):
+        self.hook = hook
+        self.started = time.perf_counter()
+        # Phase name -> seconds; repeated phases (e.g. one scan per file) add up
+        self.records = {}
+        self.startup = process_age() if record_startup else None
+        if self.startup is not None:
+            self.mark("startup", self.startup)
+
+    def mark(self, phase, seconds):
+        self.records[phase] = self.records.get(phase, 0.0) + seconds
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def flush(self, path):
+        """Append this run's phases plus a total to the ring buffer"""
+        total = time.perf_counter() - self.started + (self.startup or 0.0)
+        self.mark("total", total)
+        now = time.time()
+        write_records(path, [(now, self.hook, phase, seconds)
+                             for phase, seconds in self.records.items()])
+        self.records = {}
+
+
+class _Phase:
+    """Context manager timing one block; a class, since contextlib costs an import"""
+
+    __slots__ = ('timer', 'name', 'started')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.mark(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def start(hook):
+    """Begin timing a hook run; replaces any timer left from a previous run"""
+    global _current
+    _current = HookTimer(hook, record_startup=not in_server) if enabled() else None
+    return _current
+
+
+def phase(name):
+    """Time a block under the active timer, if any"""
+    if _current is None:
+        return _NULL_PHASE
+    return _current.phase(name)
+
+
+def finish(project_root=None):
+    """Write the active timer's records; never raises into the hook"""
+    global _current
+    timer, _current = _current, None
+    if timer is None:
+        return
+    from .paths import is_project_root, project_root_dir
+    if project_root is None:
+        project_root = project_root_dir()
+    # project_root_dir() falls back to the cwd; never create state outside a project
+    if not is_project_root(project_root):
+        return
+    try:
+        timer.flush(ring_path(project_root))
+    except OSError:
+        pass
+
+
+def _encode(text):
+    return text.encode("utf-8")[:24]
+
+
+def write_records(path, records):
+    """Append (timestamp, hook, phase, seconds) records under an exclusive lock"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        header = os.pread(fd, HEADER.size, 0)
+        count = HEADER.unpack(header)[0] if len(header) == HEADER.size else 0
+        for timestamp, hook, phase_name, seconds in records:
+            slot = count % RING_SLOTS
+            os.pwrite(fd, RECORD.pack(timestamp, seconds, _encode(hook), _encode(phase_name)),
+                      HEADER.size + slot * RECORD.size)
+            count += 1
+        os.pwrite(fd, HEADER.pack(count), 0)
+    finally:
+        os.close(fd)
+
+
+def read_records(path):
+    """Return stored (timestamp, hook, phase, seconds) records, oldest first"""
+    try:
+        with open(path, "rb") as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    if len(data) < HEADER.size:
+        return []
+    count = HEADER.unpack_from(data, 0)[0]
+    stored = min(count, RING_SLOTS)
+    first = count - stored
+    records = []
+    for n in range(first, count):
+        offset = HEADER.size + (n % RING_SLOTS) * RECORD.size
+        if offset + RECORD.size > len(data):
+            continue
+        timestamp, seconds, hook, phase_name = RECORD.unpack_from(data, offset)
+        records.append((timestamp, hook.rstrip(b"\0").decode("utf-8", "replace"),
+                        phase_name.rstrip(b"\0").decode("utf-8", "replace"), seconds))
+    return records
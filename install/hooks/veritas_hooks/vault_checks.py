@@ -0,0 +1,87 @@
+"""
+Per-file vault checks ported from post-command.sh
+Each note is read once, line by line, and every check runs on that pass,
+instead of one grep process per check per file. Results use the same
+violation types and messages as the original shell hook.
+"""
+
+import os
+import re
+
+# Files modified within this many seconds are checked (find -mmin -5)
+RECENT_SECONDS = 300
+
+# Vault folders scanned for files missing an extension
+EXTENSION_DIRS = ("Research Questions", "Concepts", "Daily", "Rules", "Notes")
+EXTENSION_LIMIT = 5
+
+TABLE_RE = re.compile(r'\|[^\s|]|[^\s|]\|')
+H1_UNDERSCORE_RE = re.compile(r'^# .*_')
+WIKI_SPACE_RE = re.compile(r'\[\[[A-Za-z]* [A-Za-z]*\]\]')
+MEDICAL_CLAIM_RE = re.compile(r'increase|decrease|associate|correlat|significant|risk|rate|incidence|prevalence|%')
+PMID_RE = re.compile(r'PMID: [0-9]{8}')
+
+# (type, message) in the order post-command.sh reports them
+MESSAGES = {
+    'EXTENSION': 'Missing .md extension',
+    'TABLE_FORMAT': 'Tables missing spaces around pipes',
+    'ESCAPED_CHARS': 'Contains escaped newlines (\\n)',
+    'HTML_ENTITIES': 'Contains HTML entities',
+    'H1_UNDERSCORES': 'H1 heading contains underscores',
+    'WIKI_LINKS': 'Wiki links need underscores for spaces',
+    'MISSING_PMID': 'Medical claims without PMID',
+}
+ORDER = list(MESSAGES)
+
+
+def check_lines(path, lines, medical=False):
+    """Return [(type, message)] for one file, scanning its lines once"""
+    found = set()
+    if not path.endswith('.md'):
+        found.add('EXTENSION')
+    # The PMID rule only applies to research and concept notes
+    check_claims = medical and ('Research' in path or 'Concept' in path)
+    has_claim = has_pmid = False
+
+    for line in lines:
+        line = line.rstrip('\n')
+        if '|' in line and 'TABLE_FORMAT' not in found and TABLE_RE.search(line):
+            found.add('TABLE_FORMAT')
+        if '\\n' in line:
+            found.add('ESCAPED_CHARS')
+        if '&' in line and ('&gt;' in line or '&lt;' in line or '&amp;' in line):
+            found.add('HTML_ENTITIES')
+        if line.startswith('# ') and H1_UNDERSCORE_RE.match(line):
+            found.add('H1_UNDERSCORES')
+        if '[[' in line and 'WIKI_LINKS' not in found and WIKI_SPACE_RE.search(line):
+            found.add('WIKI_LINKS')
+        if check_claims:
+            has_claim = has_claim or bool(MEDICAL_CLAIM_RE.search(line))
+            has_pmid = has_pmid or bool(PMID_RE.search(line))
+
+    if check_claims and has_claim and not has_pmid:
+        found.add('MISSING_PMID')
+    return [(kind, MESSAGES[kind]) for kind in ORDER if kind in found]
+
+
+def check_file(path, medical=False):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return check_lines(path, f, medical)
+
+
+def files_without_extension(vault, limit=EXTENSION_LIMIT):
+    """Up to limit extensionless files in each of the standard vault folders"""
+    for folder in EXTENSION_DIRS:
+        base = os.path.join(vault, folder)
+        if not os.path.isdir(base):
+            continue
+        found = 0
+        for current, _dirs, files in os.walk(base):
+            for name in files:
+                if '.' not in name:
+                    yield os.path.join(current, name)
+                    found += 1
+                    if found >= limit:
+                        break
+            if found >= limit:
+                break
@@ -224,6 +224,37 @@ else
     echo -e "${RED}[WARNING] Only $INSTALLED_COUNT of 9 essential hooks installed${NC}"
 fi
 
+# Hook support tools (shared package, hook server and client)
+SUPPORT_HOOKS=(
+    "hook-server.py"
+    "hook-client.py"
+    "change-watcher.py"
+    "verify-vault.py"
+    "verification-log.py"
+    "pmid-index.py"
+    "citation-report.py"
+    "pubmed-cache.py"
+    "link-index.py"
+    "conversation-search.py"
+    "hook-stats.py"
+    "project-context.py"
+)
+
+if [ -d "$VERITAS_DIR/install/hooks/veritas_hooks" ]; then
+    rm -rf "$PROJECT_DIR/.claude/hooks/veritas_hooks"
+    cp -R "$VERITAS_DIR/install/hooks/veritas_hooks" "$PROJECT_DIR/.claude/hooks/"
+    find "$PROJECT_DIR/.claude/hooks/veritas_hooks" -name "__pycache__" -type d -prune -exec rm -rf {} + 2>/dev/null
+    echo "  ✓ veritas_hooks/"
+fi
+
+for hook in "${SUPPORT_HOOKS[@]}"; do
+    if [ -f "$VERITAS_DIR/install/hooks/$hook" ]; then
+        cp "$VERITAS_DIR/install/hooks/$hook" "$PROJECT_DIR/.claude/hooks/"
+        chmod +x "$PROJECT_DIR/.claude/hooks/$hook"
+        echo "  ✓ $hook"
+    fi
+done
+
 # Step 4: Install templates
 echo ""
 echo "Installing templates..."
@@ -485,6 +516,13 @@ if [ -d "$VERITAS_DIR/conversation-logger" ]; then
             ;;
     esac
     
+    # Retention settings read by the auto-conversation-logger hook's cleanup
+    if [ "$DRY_RUN" != "true" ]; then
+        mkdir -p "$HOME/.conversation-logger"
+        printf '{\n  "enabled": %s,\n  "retention_days": %s\n}\n' \
+            "$ENABLE_CLEANUP" "$RETENTION_DAYS" > "$HOME/.conversation-logger/retention.json"
+    fi
+    
     # Configure cleanup script if enabled
     CLEANUP_SCRIPT="$VERITAS_DIR/conversation-logger/cleanup-old-logs.js"
     if [ "$ENABLE_CLEANUP" = true ] && [ -f "$CLEANUP_SCRIPT" ]; then
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Synthetic Obsidian corpora for the hook benchmarks
+Notes are built from the templates in install/templates/obsidian/: the
+placeholders are filled with seeded random authors, years, PMIDs and numbers,
+and the template sections are repeated until the note reaches the target size.
+The same seed always produces the same bytes.
+
+Usage: corpus.py OUTPUT_DIR [--sizes 1KB,100KB,10MB] [--seed N]
+"""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+VERITAS_DIR = Path(__file__).resolve().parents[2]
+TEMPLATE_DIR = VERITAS_DIR / "install" / "templates" / "obsidian"
+
+KINDS = {
+    "research_question": "research_question_template.md",
+    "concept": "concept_template.md",
+    "daily_journal": "daily_journal_template.md",
+}
+
+SIZES = {"1KB": 1024, "100KB": 100 * 1024, "10MB": 10 * 1024 * 1024}
+
+SURNAMES = ["Smith", "Tambur", "Lefaucheur", "Wiebe", "Loupy", "Zhang", "Garcia",
+            "Nakamura", "Haas", "Schinstock", "Bestard", "Heidt", "Claas", "Tait"]
+TOPICS = ["hla-antibodies", "dsa", "mfi-cutoffs", "crossmatch", "eplet-matching",
+          "desensitization", "graft-survival", "amr"]
+
+CITATION_RE = re.compile(r'\(Author et al\., Year, PMID: XXXXXXXX\)')
+PLACEHOLDERS = [
+    (re.compile(r'XXXXXXXX'), lambda rng: str(rng.randint(10000000, 39999999))),
+    (re.compile(r'YYYY-MM-DD'), lambda rng: f"20{rng.randint(18, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"),
+    (re.compile(r'\bX\.X\b'), lambda rng: f"{rng.randint(1, 9)}.{rng.randint(0, 9)}"),
+    (re.compile(r'\bXX\b'), lambda rng: str(rng.randint(10, 99))),
+    (re.compile(r'\bX\b'), lambda rng: str(rng.randint(1, 9))),
+    (re.compile(r'\bY\b'), lambda rng: str(rng.randint(1, 59))),
+    (re.compile(r'\{[a-z-]+\}'), lambda rng: rng.choice(TOPICS)),
+]
+WIKI_LINK_RE = re.compile(r'\[\[([A-Za-z_]+)\]\]')
+
+
+def fill(text, rng):
+    """Replace template placeholders with plausible values"""
+    text = CITATION_RE.sub(
+        lambda m: f"({rng.choice(SURNAMES)} et al., {rng.randint(2005, 2025)}, "
+                  f"PMID: {rng.randint(10000000, 39999999)})", text)
+    for pattern, value in PLACEHOLDERS:
+        text = pattern.sub(lambda m: value(rng), text)
+    # Half the wiki links use spaces, as hand-written notes often do
+    return WIKI_LINK_RE.sub(
+        lambda m: f"[[{m.group(1).replace('_', ' ') if rng.random() < 0.5 else m.group(1)}]]", text)
+
+
+def split_template(text):
+    """Split a template into its head (frontmatter and H1) and its H2 sections"""
+    parts = re.split(r'\n(?=## )', text)
+    return parts[0], parts[1:]
+
+
+def generate(kind, size, seed=0):
+    """Return a note of the given kind that is at most size bytes (close to it)"""
+    rng = random.Random(f"{kind}:{size}:{seed}")
+    head, sections = split_template((TEMPLATE_DIR / KINDS[kind]).read_text())
+    pieces = [fill(head, rng)]
+    used = len(pieces[0].encode("utf-8"))
+    part = 0
+    while used < size:
+        section = sections[part % len(sections)]
+        if part >= len(sections):
+            # Repeated sections get distinct headings
+            title, _, body = section.partition("\n")
+            section = f"{title} (Part {part // len(sections) + 1})\n{body}"
+        text = "\n" + fill(section, rng)
+        encoded = len(text.encode("utf-8"))
+        if used + encoded > size:
+            # Take whole lines of the last section until the budget is spent
+            for line in text.splitlines(keepends=True):
+                length = len(line.encode("utf-8"))
+                if used + length > size:
+                    break
+                pieces.append(line)
+                used += length
+            break
+        pieces.append(text)
+        used += encoded
+        part += 1
+    return "".join(pieces)
+
+
+def parse_sizes(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def main():
+    """Write the corpora to OUTPUT_DIR/<size>/<kind>.md"""
+    args = sys.argv[1:]
+    if not args or args[0] in ("-h", "--help"):
+        print(__doc__.strip())
+        return
+    output = Path(args.pop(0))
+    sizes = list(SIZES)
+    seed = 0
+    while args:
+        arg = args.pop(0)
+        if arg == "--sizes":
+            sizes = parse_sizes(args.pop(0))
+        elif arg == "--seed":
+            seed = int(args.pop(0))
+    for size_name in sizes:
+        for kind in KINDS:
+            path = output / size_name / f"{kind}.md"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(generate(kind, SIZES[size_name], seed))
+            print(f"{path}: {path.stat().st_size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+VERITAS Hook Benchmarks
+Times the verification and enforcement hooks against synthetic notes built
+from the Obsidian templates (see corpus.py), inside a throwaway project with
+a fresh copy of install/hooks:
+
+  verify_output     HLAOutputVerifier.verify_output (block cache disabled)
+  fix_formatting    ObsidianEnforcer.fix_formatting
+  fix_wiki_links    ObsidianEnforcer.fix_wiki_links
+  detect_task_type  TaskRouter.detect_task_type
+  cold_start        Each hook script run as a new python3 process
+
+Results are written as JSON (commit, environment and per-benchmark
+min/median/mean/max) so runs can be compared between commits.
+
+Usage:
+  run_benchmarks.py [--sizes 1KB,100KB,10MB] [--repeat N] [--output FILE]
+  run_benchmarks.py --compare BASELINE.json CURRENT.json [--threshold PCT]
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import KINDS, SIZES, generate, parse_sizes
+
+VERITAS_DIR = Path(__file__).resolve().parents[2]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# (hook script, argv, stdin) for the cold-start benchmark
+COLD_START_HOOKS = [
+    ("post-command.py", [], None),
+    ("task-router.py", [], "Create a research question note in Obsidian about MFI cutoffs"),
+    ("enforce-claude-md.py", [], None),
+    ("obsidian-enforcer.py", ["fix"], "# Title\n| a|b |\n[[Some Link]]\n"),
+]
+
+
+def make_project():
+    """Throwaway project with CLAUDE.md, a verification config and the hooks"""
+    root = Path(tempfile.mkdtemp(prefix="veritas-bench-"))
+    (root / "CLAUDE.md").write_text("# Benchmark project\n")
+    (root / ".claude" / "config").mkdir(parents=True)
+    (root / ".claude" / "config" / "verification.json").write_text(
+        json.dumps({"cache": {"enabled": False}, "pmid_index": {"enabled": False}}))
+    shutil.copytree(VERITAS_DIR / "install" / "hooks", root / ".claude" / "hooks",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    return root
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=VERITAS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(func, repeat):
+    """Run func repeat times; returns the wall times in milliseconds"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def summarize(name, kind, size_name, size_bytes, times):
+    median = statistics.median(times)
+    result = {
+        "name": name,
+        "kind": kind,
+        "size": size_name,
+        "bytes": size_bytes,
+        "repeat": len(times),
+        "min_ms": round(min(times), 3),
+        "median_ms": round(median, 3),
+        "mean_ms": round(statistics.fmean(times), 3),
+        "max_ms": round(max(times), 3),
+    }
+    if size_bytes:
+        result["mb_per_s"] = round(size_bytes / 1e6 / (median / 1000), 3) if median else None
+    return result
+
+
+def run(sizes, repeat):
+    project = make_project()
+    hooks_dir = project / ".claude" / "hooks"
+    sys.path.insert(0, str(hooks_dir))
+    from veritas_hooks.loader import load_hook
+
+    results = []
+    try:
+        verifier = load_hook("post-command").HLAOutputVerifier()
+        enforcer = load_hook("obsidian-enforcer").ObsidianEnforcer()
+        router = load_hook("task-router").TaskRouter()
+
+        for size_name in sizes:
+            # Very large notes take seconds per run; cap their repeats
+            runs = repeat if SIZES[size_name] < 1024 * 1024 else max(1, min(repeat, 3))
+            for kind in KINDS:
+                content = generate(kind, SIZES[size_name])
+                size_bytes = len(content.encode("utf-8"))
+
+                def verify():
+                    verifier.reset()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        verifier.verify_output(content)
+
+                benchmarks = [
+                    ("verify_output", verify),
+                    ("fix_formatting", lambda: enforcer.fix_formatting(content)),
+                    ("fix_wiki_links", lambda: enforcer.fix_wiki_links(content)),
+                    ("detect_task_type", lambda: router.detect_task_type(content)),
+                ]
+                for name, func in benchmarks:
+                    result = summarize(name, kind, size_name, size_bytes, measure(func, runs))
+                    results.append(result)
+                    print(f"{name:<18}{kind:<20}{size_name:>6}  median {result['median_ms']:>10.3f} ms",
+                          file=sys.stderr)
+                verifier.audit.flush()
+
+        env = dict(os.environ, VERITAS_HOOK_TIMINGS="0")
+        for script, args, stdin in COLD_START_HOOKS:
+            command = [sys.executable, str(hooks_dir / script)] + args
+
+            def cold_start():
+                subprocess.run(command, cwd=project, input=stdin, text=True, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+            result = summarize("cold_start", script, None, None, measure(cold_start, repeat))
+            results.append(result)
+            print(f"{'cold_start':<18}{script:<26}  median {result['median_ms']:>10.3f} ms", file=sys.stderr)
+    finally:
+        sys.path.remove(str(hooks_dir))
+        shutil.rmtree(project, ignore_errors=True)
+    return results
+
+
+def compare(baseline_path, current_path, threshold):
+    """Print median changes between two result files; returns regression count"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+    key = lambda r: (r["name"], r["kind"], r["size"])
+    before = {key(r): r for r in baseline["results"]}
+    regressions = 0
+    print(f"Baseline {baseline['meta'].get('commit')} -> current {current['meta'].get('commit')}")
+    for result in current["results"]:
+        old = before.get(key(result))
+        if old is None or not old["median_ms"]:
+            continue
+        change = (result["median_ms"] - old["median_ms"]) / old["median_ms"] * 100
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        label = f"{result['name']} {result['kind']} {result['size'] or ''}".strip()
+        print(f"  {label:<48}{old['median_ms']:>12.3f} -> {result['median_ms']:>12.3f} ms "
+              f"({change:+.1f}%){flag}")
+    return regressions
+
+
+def main():
+    """CLI interface for the benchmarks"""
+    args = sys.argv[1:]
+    sizes = list(SIZES)
+    repeat = 5
+    output = None
+    threshold = 10.0
+    compare_paths = None
+    while args:
+        arg = args.pop(0)
+        if arg == "--sizes":
+            sizes = parse_sizes(args.pop(0))
+        elif arg == "--repeat":
+            repeat = max(1, int(args.pop(0)))
+        elif arg == "--output":
+            output = Path(args.pop(0))
+        elif arg == "--compare":
+            compare_paths = (args.pop(0), args.pop(0))
+        elif arg == "--threshold":
+            threshold = float(args.pop(0))
+        elif arg in ("-h", "--help"):
+            print(__doc__.strip())
+            return
+        else:
+            print(f"Unknown argument: {arg}", file=sys.stderr)
+            sys.exit(2)
+
+    if compare_paths:
+        sys.exit(1 if compare(*compare_paths, threshold) else 0)
+
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        print(f"Unknown size(s): {', '.join(unknown)} (choose from {', '.join(SIZES)})", file=sys.stderr)
+        sys.exit(2)
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": sizes,
+            "repeat": repeat,
+        },
+        "results": run(sizes, repeat),
+    }
+    output = output or RESULTS_DIR / f"{commit or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
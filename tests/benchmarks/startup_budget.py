@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+VERITAS Hook Startup Budget
+Runs each hook on its common nothing-to-do path (a prompt that is not an
+Obsidian task, a non-Obsidian tool call, no changed notes) as a new
+python3 -X importtime process in a throwaway project (see
+run_benchmarks.make_project), and checks what it imported against
+startup_budget.json:
+
+  forbidden         Modules the hook must not import on that path
+  max_modules       Modules imported beyond the interpreter's own startup
+  max_import_ratio  Their summed import time, best of --repeat runs, as a
+                    multiple of the wall time of `python3 -c pass` measured
+                    in the same run
+
+The module count is a hard limit. Import time is only compared with the
+interpreter's own startup on the same machine, so the budget holds on
+faster and slower machines alike. Exits 1 when any hook is over budget, so
+a change that drags a heavy import onto the startup path fails. --update
+rewrites max_modules and max_import_ratio from the current measurements,
+with headroom; forbidden lists are kept.
+
+Usage: startup_budget.py [--repeat N] [--update] [--budget FILE]
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from run_benchmarks import make_project
+
+BUDGET_PATH = Path(__file__).resolve().parent / "startup_budget.json"
+
+# (budget name, hook script, argv, stdin) for each hook's nothing-to-do path
+STARTUP_HOOKS = [
+    ("enforce-claude-md", "enforce-claude-md.py", [], None),
+    ("task-router", "task-router.py", [], "What time zone is Chicago in?"),
+    ("obsidian-enforcer", "obsidian-enforcer.py", ["check"], '{"tool": "Bash", "command": "ls"}'),
+    ("post-command", "post-command.py", [], None),
+]
+
+# Headroom --update leaves above the measured values; the time ratio gets
+# generous headroom because import time and interpreter startup do not
+# scale identically across machines and loads
+MODULE_SLACK = 3
+IMPORT_RATIO_FACTOR = 2.0
+IMPORT_RATIO_SLACK = 0.5
+
+
+def parse_importtime(stderr):
+    """{module: self microseconds} from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def import_profile(command, cwd, stdin, env):
+    """Modules a command imports and the wall time it took"""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime"] + command, cwd=cwd, input=stdin,
+                            text=True, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    wall_ms = (time.perf_counter() - started) * 1000
+    return result.returncode, parse_importtime(result.stderr), wall_ms
+
+
+def measure(repeat):
+    """(baseline_ms, {hook: {'modules': [...], 'import_ms': best, 'import_ratio': ...,
+    'wall_ms': best, 'returncode': ...}}); baseline_ms is the best wall time of
+    python3 -c pass"""
+    project = make_project()
+    hooks_dir = project / ".claude" / "hooks"
+    env = dict(os.environ, HOME=str(project))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    try:
+        baseline_ms = None
+        for _ in range(repeat):
+            _code, baseline, wall_ms = import_profile(["-c", "pass"], project, None, env)
+            baseline_ms = wall_ms if baseline_ms is None else min(baseline_ms, wall_ms)
+        results = {}
+        for name, script, args, stdin in STARTUP_HOOKS:
+            command = [str(hooks_dir / script)] + args
+            # The first run writes bytecode and the context snapshot
+            import_profile(command, project, stdin, env)
+            best = None
+            for _ in range(repeat):
+                code, modules, wall_ms = import_profile(command, project, stdin, env)
+                own = {module: us for module, us in modules.items() if module not in baseline}
+                import_ms = sum(own.values()) / 1000
+                if best is None or import_ms < best["import_ms"]:
+                    best = {"modules": sorted(own), "import_ms": round(import_ms, 1),
+                            "wall_ms": round(wall_ms, 1), "returncode": code}
+            best["import_ratio"] = round(best["import_ms"] / baseline_ms, 2)
+            results[name] = best
+        return round(baseline_ms, 1), results
+    finally:
+        shutil.rmtree(project, ignore_errors=True)
+
+
+def check(results, budget):
+    """Print each hook against its budget; returns the number of hooks over budget"""
+    failures = 0
+    for name, result in results.items():
+        limits = budget.get(name, {})
+        problems = []
+        if result["returncode"]:
+            problems.append(f"exit status {result['returncode']}")
+        forbidden = sorted(set(limits.get("forbidden", ())) & set(result["modules"]))
+        if forbidden:
+            problems.append(f"imports {', '.join(forbidden)}")
+        if "max_modules" in limits and len(result["modules"]) > limits["max_modules"]:
+            problems.append(f"{len(result['modules'])} modules > {limits['max_modules']}")
+        if "max_import_ratio" in limits and result["import_ratio"] > limits["max_import_ratio"]:
+            problems.append(f"imports take {result['import_ratio']}x python startup > {limits['max_import_ratio']}x")
+        if problems:
+            failures += 1
+        print(f"  {name:<20}{len(result['modules']):>4} modules {result['import_ms']:>7.1f} ms imports "
+              f"({result['import_ratio']:>4.2f}x) {result['wall_ms']:>7.1f} ms wall  "
+              f"{'OVER BUDGET: ' + '; '.join(problems) if problems else 'ok'}")
+    return failures
+
+
+def update(results, budget):
+    """Budget with limits reset from results, keeping each hook's forbidden list"""
+    updated = {}
+    for name, result in results.items():
+        entry = dict(budget.get(name, {}))
+        entry["max_modules"] = len(result["modules"]) + MODULE_SLACK
+        entry.pop("max_import_ms", None)
+        entry["max_import_ratio"] = round(result["import_ratio"] * IMPORT_RATIO_FACTOR + IMPORT_RATIO_SLACK, 2)
+        entry.setdefault("forbidden", [])
+        updated[name] = entry
+    return updated
+
+
+def main():
+    """CLI interface for the startup budget check"""
+    args = sys.argv[1:]
+    repeat = 5
+    write = False
+    budget_path = BUDGET_PATH
+    while args:
+        arg = args.pop(0)
+        if arg == "--repeat":
+            repeat = max(1, int(args.pop(0)))
+        elif arg == "--update":
+            write = True
+        elif arg == "--budget":
+            budget_path = Path(args.pop(0))
+        elif arg in ("-h", "--help"):
+            print(__doc__.strip())
+            return
+        else:
+            print(f"Unknown argument: {arg}", file=sys.stderr)
+            sys.exit(2)
+
+    try:
+        budget = json.loads(budget_path.read_text())
+    except (OSError, ValueError):
+        budget = {}
+    baseline_ms, results = measure(repeat)
+    if write:
+        budget = update(results, budget)
+        budget_path.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"Budget written to {budget_path}", file=sys.stderr)
+
+    print(f"Hook startup (Python {sys.version.split()[0]}, best of {repeat}, "
+          f"python3 -c pass {baseline_ms} ms):")
+    sys.exit(1 if check(results, budget) else 0)
+
+
+if __name__ == "__main__":
+    main()
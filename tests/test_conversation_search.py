@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Conversation search index test
+Checks that the FTS5 index in veritas_hooks.conversation_search stays
+consistent with conversations.db when rows are deleted or updated outside
+Python retention, as cleanup-old-logs.js and the Node watcher do with plain
+DELETE statements: indexed rows leave the index, rows past the high-water
+mark are left alone, and an index built before the triggers is rebuilt.
+
+Usage: python3 tests/test_conversation_search.py  (or python3 -m unittest discover tests)
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "install", "hooks"))
+
+from veritas_hooks import conversation_search
+from veritas_hooks.conversation_db import SCHEMA
+from veritas_hooks.retention import DEFAULTS, Retention
+
+OLD = '2020-01-01 00:00:00'
+NEW = '2999-01-01 00:00:00'
+
+
+class ConversationSearchTriggerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="veritas-search-test-")
+        self.db_path = os.path.join(self.tmp, "conversations.db")
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(SCHEMA)
+        self.add_message(OLD, "eplet mismatch load predicts rejection")
+        self.add_message(NEW, "eplet analysis for the DQ locus")
+        with self.conn:
+            self.conn.execute("INSERT INTO activities (session_id, timestamp, activity_type, description, metadata) "
+                              "VALUES ('s1', ?, 'note', 'eplet summary written', '{}')", (OLD,))
+        conversation_search.sync(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def add_message(self, timestamp, content):
+        with self.conn:
+            self.conn.execute("INSERT INTO messages (session_id, timestamp, role, content, tools_used) "
+                              "VALUES ('s1', ?, 'user', ?, '[]')", (timestamp, content))
+
+    def assert_index_consistent(self):
+        for fts, _columns in conversation_search.FTS_TABLES.values():
+            # rank 1 compares every index entry with the content table
+            self.conn.execute(f"INSERT INTO {fts} ({fts}, rank) VALUES ('integrity-check', 1)")
+
+    def hits(self, term, sources=("messages",)):
+        return sorted(result['id'] for result in conversation_search.search(
+            self.conn, conversation_search.quote(term), sources=sources))
+
+    def test_external_delete_leaves_index(self):
+        # What cleanup-old-logs.js runs
+        with self.conn:
+            self.conn.execute("DELETE FROM messages WHERE timestamp < ?", (NEW,))
+            self.conn.execute("DELETE FROM activities WHERE timestamp < ?", (NEW,))
+        self.assert_index_consistent()
+        self.assertEqual(self.hits("eplet"), [2])
+        self.assertEqual(self.hits("eplet", ("activities",)), [])
+        row_count = self.conn.execute("SELECT COUNT(*) FROM messages_fts_docsize").fetchone()[0]
+        self.assertEqual(row_count, 1)
+
+    def test_delete_of_unindexed_row(self):
+        self.add_message(NEW, "crossmatch not yet indexed")
+        with self.conn:
+            self.conn.execute("DELETE FROM messages WHERE content LIKE 'crossmatch%'")
+        self.assert_index_consistent()
+        conversation_search.sync(self.conn)
+        self.assert_index_consistent()
+        self.assertEqual(self.hits("crossmatch"), [])
+
+    def test_update_reindexes_row(self):
+        with self.conn:
+            self.conn.execute("UPDATE messages SET content = 'crossmatch result' WHERE id = 1")
+        self.assert_index_consistent()
+        self.assertEqual(self.hits("crossmatch"), [1])
+        self.assertEqual(self.hits("rejection"), [])
+
+    def test_retention_delete(self):
+        retention = Retention(self.db_path, os.path.join(self.tmp, "retention-state.json"),
+                              dict(DEFAULTS, retention_days=1))
+        retention.run(max_seconds=0, vacuum=False)
+        self.assert_index_consistent()
+        self.assertEqual(self.hits("eplet"), [2])
+
+    def test_index_from_before_triggers_is_rebuilt(self):
+        with self.conn:
+            self.conn.execute("DROP TRIGGER messages_fts_ad")
+            self.conn.execute("DROP TRIGGER messages_fts_au")
+            self.conn.execute("DELETE FROM messages WHERE id = 1")
+        conversation_search.sync(self.conn)
+        self.assert_index_consistent()
+        self.assertEqual(self.hits("eplet"), [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
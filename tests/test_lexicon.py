@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Task lexicon scoring test
+Checks that veritas_hooks.lexicon.Lexicon scores every occurrence of every
+phrase, as separate substring searches would, when phrases overlap: one
+phrase inside another ("rule" in "rule_mfi"), phrases of different
+categories sharing text, phrases straddling each other and repeated
+phrases sharing letters. Also checks the task type matches the original
+first-category-with-any-phrase rule.
+
+Usage: python3 tests/test_lexicon.py  (or python3 -m unittest discover tests)
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "install", "hooks"))
+
+from veritas_hooks.lexicon import DEFAULT_TASK, Lexicon
+
+
+def substring_scores(lexicon, text):
+    """Per-category scores from one overlapping substring count per phrase"""
+    lowered = text.lower()
+    scores = dict.fromkeys(lexicon.categories, 0.0)
+    for phrase, (category, weight) in lexicon.phrases.items():
+        count = sum(1 for start in range(len(lowered)) if lowered.startswith(phrase, start))
+        scores[category] += weight * count
+    return scores
+
+
+def substring_task(lexicon, text):
+    lowered = text.lower()
+    for category, phrases in lexicon.categories.items():
+        if any(phrase in lowered for phrase in phrases):
+            return category
+    return DEFAULT_TASK
+
+
+class LexiconOverlapTest(unittest.TestCase):
+
+    def assert_substring_semantics(self, lexicon, text):
+        result = lexicon.classify(text)
+        self.assertEqual(result['scores'], substring_scores(lexicon, text))
+        self.assertEqual(result['task_type'], substring_task(lexicon, text))
+        return result
+
+    def test_phrase_inside_longer_phrase(self):
+        result = self.assert_substring_semantics(Lexicon(), "Apply rule_mfi and the algorithm rule_epitope")
+        self.assertEqual(result['scores']['obsidian_task'], 6.0)
+
+    def test_categories_sharing_text(self):
+        # "vault export" is a code phrase containing the obsidian phrase "vault"
+        lexicon = Lexicon({"code_task": ["vault export"]})
+        result = self.assert_substring_semantics(lexicon, "Please run the vault export now")
+        self.assertEqual(result['task_type'], "obsidian_task")
+
+    def test_straddling_phrases(self):
+        lexicon = Lexicon({"stats_task": {"kaplan-meier": 2, "meier curve": 1, "curve": 0.5}})
+        self.assert_substring_semantics(lexicon, "Draw a Kaplan-Meier curve of graft survival")
+
+    def test_repeated_phrase_sharing_letters(self):
+        lexicon = Lexicon({"stats_task": ["anana"]})
+        result = self.assert_substring_semantics(lexicon, "banananana testestest")
+        self.assertEqual(result['scores']['stats_task'], 3.0)
+        self.assertEqual(result['scores']['code_task'], 3.0)
+
+    def test_spans_do_not_overlap(self):
+        result = Lexicon().classify("rule_mfi testest")
+        self.assertEqual([span[:3] for span in result['matches']],
+                         [(0, 8, "rule_mfi"), (9, 13, "test")])
+
+    def test_memo_returns_independent_results(self):
+        lexicon = Lexicon()
+        first = lexicon.classify("debug the vault")
+        first['scores']['code_task'] = 99.0
+        first['matches'].clear()
+        second = lexicon.classify("debug the vault")
+        self.assertEqual(second['scores'], substring_scores(lexicon, "debug the vault"))
+        self.assertEqual(len(second['matches']), 2)
+
+    def test_memo_keyed_by_text(self):
+        # Prompts of equal length must never share a memo entry
+        lexicon = Lexicon()
+        self.assertEqual(lexicon.classify("write the code")['task_type'], "code_task")
+        self.assertEqual(lexicon.classify("open the vault")['task_type'], "obsidian_task")
+        self.assertEqual(set(lexicon.memo), {"write the code", "open the vault"})
+
+    def test_case_folding_path(self):
+        # "İ" lowercases to two characters, so the case-insensitive pattern runs
+        self.assert_substring_semantics(Lexicon(), "İ: Vault RULE_EPITOPE test")
+
+
+if __name__ == "__main__":
+    unittest.main()
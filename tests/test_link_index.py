@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Wiki-link index freshness test
+Checks that veritas_hooks.link_index.LinkIndex keeps resolving links when
+notes change behind its back: notes created or renamed outside a session
+(never passed to update()) are picked up by one refresh once the index is
+older than max_age_seconds, a fresh index does not walk the vault, and a
+deleted link target drops out without a refresh.
+
+Usage: python3 tests/test_link_index.py  (or python3 -m unittest discover tests)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "install", "hooks"))
+
+from veritas_hooks.link_index import LinkIndex, parse_note
+
+
+class LinkIndexFreshnessTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="veritas-link-test-"))
+        self.vault = self.tmp / "vault"
+        self.vault.mkdir()
+        (self.vault / "Existing.md").write_text("# Existing\n")
+        self.index = LinkIndex(self.tmp / "wiki-links.db", [self.vault], max_age_seconds=3600)
+        self.assertEqual(self.dangling("[[Existing]]"), [])
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def dangling(self, text):
+        return [link['target'] for link in self.index.check(parse_note(text)[1])]
+
+    def age_index(self, seconds):
+        with self.index.connect() as conn:
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'refreshed_at'",
+                         (repr(float(conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'")
+                                     .fetchone()[0]) - seconds),))
+
+    def refreshed_at(self):
+        return self.index.stats()['refreshed_at']
+
+    def test_fresh_index_does_not_walk(self):
+        (self.vault / "Synced.md").write_text("# Synced\n")
+        before = self.refreshed_at()
+        self.assertEqual(self.dangling("[[Synced]]"), ["Synced"])
+        self.assertEqual(self.refreshed_at(), before)
+
+    def test_stale_index_refreshes_before_reporting(self):
+        (self.vault / "Synced.md").write_text("# Synced\n")
+        self.age_index(7200)
+        self.assertEqual(self.dangling("[[Synced]] and [[Never Written]]"), ["Never Written"])
+        self.assertFalse(self.index.stale())
+
+    def test_rename_outside_session(self):
+        os.rename(self.vault / "Existing.md", self.vault / "Renamed.md")
+        self.age_index(7200)
+        self.assertEqual(self.dangling("[[Renamed]] [[Existing]]"), ["Existing"])
+
+    def test_stale_index_without_dangling_links_does_not_walk(self):
+        self.age_index(7200)
+        before = self.refreshed_at()
+        self.assertEqual(self.dangling("[[Existing]]"), [])
+        self.assertEqual(self.refreshed_at(), before)
+
+    def test_deleted_target_drops_out_without_refresh(self):
+        (self.vault / "Existing.md").unlink()
+        before = self.refreshed_at()
+        self.assertEqual(self.dangling("[[Existing]]"), ["Existing"])
+        self.assertEqual(self.refreshed_at(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
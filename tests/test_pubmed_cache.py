@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+PubMed cache fetch test
+Runs veritas_hooks.pubmed_cache.PubMedCache.refresh with an ESummaryFetcher
+whose HTTP request is replaced by canned esummary responses, and checks
+what gets cached: summaries for PMIDs esummary returns, negative entries
+only for PMIDs it answers with an error item, nothing for PMIDs it leaves
+out, and nothing at all (plus an error) for a response with no result,
+such as the HTTP 200 error body esummary sends when a query fails.
+
+Usage: python3 tests/test_pubmed_cache.py  (or python3 -m unittest discover tests)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "install", "hooks"))
+
+from veritas_hooks.pubmed_cache import ESummaryFetcher, PubMedCache
+
+SUMMARY = {"uid": "12345678", "sortfirstauthor": "Smith J", "pubdate": "2020 Mar",
+           "title": "Eplet mismatch and graft survival", "source": "Transplantation"}
+
+
+class CannedFetcher(ESummaryFetcher):
+    """ESummaryFetcher answering every request with one canned response"""
+
+    def __init__(self, response):
+        super().__init__(api_key="", email="")
+        self.response = response
+        self.requests = []
+
+    def _request(self, pmids):
+        self.requests.append(list(pmids))
+        return self.response
+
+
+class PubMedCacheFetchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="veritas-pubmed-test-"))
+        self.cache = PubMedCache(self.tmp / "pubmed-cache.db")
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_error_body_caches_nothing(self):
+        fetcher = CannedFetcher({"esummaryresult": ["Unable to obtain query #1"]})
+        with self.assertRaises(ValueError) as raised:
+            self.cache.refresh([12345678, 23456789], fetcher)
+        self.assertIn("Unable to obtain query #1", str(raised.exception))
+        self.assertEqual(self.cache.lookup([12345678, 23456789]), {})
+        self.assertEqual(self.cache.expired([12345678, 23456789]), [12345678, 23456789])
+
+    def test_result_without_uids_caches_nothing(self):
+        with self.assertRaises(ValueError):
+            self.cache.refresh([12345678], CannedFetcher({"header": {}, "result": {}}))
+        self.assertEqual(self.cache.lookup([12345678]), {})
+
+    def test_only_error_items_are_negative(self):
+        fetcher = CannedFetcher({"header": {}, "result": {
+            "uids": ["12345678", "99999999"],
+            "12345678": SUMMARY,
+            "99999999": {"uid": "99999999", "error": "cannot get document summary"},
+        }})
+        self.assertEqual(self.cache.refresh([12345678, 23456789, 99999999], fetcher), (1, 1))
+        self.assertEqual(self.cache.lookup([12345678, 23456789, 99999999]),
+                         {12345678: ("Smith", 2020, None), 99999999: None})
+        # Left out of the answer, so asked about again next time
+        self.assertEqual(self.cache.expired([12345678, 23456789, 99999999]), [23456789])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Verification cache equivalence test
+Scans a note through veritas_hooks.result_cache.VerificationCache, edits it,
+and asserts the warm (partly cached) scan of the edited note reports exactly
+what a cold veritas_hooks.rules.RuleEngine scan of it does. The edits change
+one block inside a fence, and one block across a fence or frontmatter
+boundary, so that the blocks after it start from a different outline state.
+
+Usage: python3 tests/test_result_cache.py  (or python3 -m unittest discover tests)
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "install", "hooks"))
+
+from veritas_hooks.result_cache import VerificationCache
+from veritas_hooks.rules import RuleEngine
+
+NOTE = """---
+title: Outcomes
+summary: Risk increased 40% (n = 120)
+---
+# Outcomes
+
+Graft failure risk increased by 30% after mismatch.
+Studies show that eplet load matters.
+
+```python
+risk = 0.3  # increased 30%
+
+print("studies show &gt; data demonstrates")
+```
+
+Mortality decreased, p < 0.05, in a cohort of n = 250 recipients.
+The hazard ratio was 1.8 (Jones et al., 2019, PMID: 23456789) [FT-VERIFIED].
+
+| Locus |B|
+|-------|--|
+
+See [[Note One]] and [[Missing Note]].
+Evidence suggests an association.
+"""
+
+
+def edit(text, old, new):
+    assert old in text, old
+    return text.replace(old, new, 1)
+
+
+def comparable(result):
+    """A ScanResult's reported content, with cached JSON and live lists alike"""
+    return json.loads(json.dumps({'findings': sorted(result.findings, key=lambda f: (f['line'], f['column'], f['type'])),
+                                  'citations': result.citations, 'links': result.links}))
+
+
+class VerificationCacheEquivalenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="veritas-cache-test-"))
+        self.cache = VerificationCache(self.tmp / "verify-cache.db")
+        self.engine = RuleEngine()
+        self.path = self.tmp / "note.md"
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def assert_warm_matches_cold(self, edited):
+        cold_before = self.engine.scan(NOTE.splitlines(), True)
+        self.assertEqual(comparable(self.cache.scan(self.engine, self.path, NOTE.splitlines(), True)),
+                         comparable(cold_before))
+        hits = self.cache.hits
+        warm = self.cache.scan(self.engine, self.path, edited.splitlines(), True)
+        self.assertGreater(self.cache.hits, hits, "edited note reused no cached blocks")
+        self.assertEqual(comparable(warm), comparable(self.engine.scan(edited.splitlines(), True)))
+        return warm
+
+    def test_edit_inside_fence(self):
+        edited = edit(NOTE, "risk = 0.3  # increased 30%\n", "risk = 0.4  # increased 40%\n\nrate = 2\n")
+        self.assert_warm_matches_cold(edited)
+
+    def test_edit_opening_fence(self):
+        # Opening a fence earlier turns the prose after it into code
+        edited = edit(NOTE, "Studies show that eplet load matters.\n", "```\nStudies show that eplet load matters.\n")
+        warm = self.assert_warm_matches_cold(edited)
+        self.assertNotIn('unsupported_claim', [finding['type'] for finding in warm.findings
+                                               if finding['line'] == 9])
+
+    def test_edit_removing_closing_fence(self):
+        # The fence now runs to the end of the note
+        edited = edit(NOTE, 'demonstrates")\n```\n', 'demonstrates")\n')
+        self.assert_warm_matches_cold(edited)
+
+    def test_edit_removing_frontmatter_close(self):
+        edited = edit(NOTE, "(n = 120)\n---\n", "(n = 120)\n\n")
+        self.assert_warm_matches_cold(edited)
+
+    def test_rescan_unchanged(self):
+        cold = self.engine.scan(NOTE.splitlines(), True)
+        self.cache.scan(self.engine, self.path, NOTE.splitlines(), True)
+        misses = self.cache.misses
+        warm = self.cache.scan(self.engine, self.path, NOTE.splitlines(), True)
+        self.assertEqual(self.cache.misses, misses)
+        self.assertEqual(comparable(warm), comparable(cold))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Rule engine equivalence test
+Runs veritas_hooks.rules.RuleEngine and a reference built from the
+original post-command.py checks (one regex pass per check over the whole
+document) on the same notes and asserts they report the same findings.
+
+The reference keeps the original regexes and carries the later,
+deliberate changes explicitly: frontmatter and fenced code are not
+checked, a line with template placeholder text is reported once as a
+placeholder instead of as claims, table pipes are checked with the spacing
+rule fix_markdown applies, and in-text citations each need a verification
+tag. Every finding is compared with its line and column.
+
+Usage: python3 tests/test_rule_engine.py  (or python3 -m unittest discover tests)
+"""
+
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "install", "hooks"))
+
+from veritas_hooks.rules import RuleEngine, find_placeholder
+
+# The checks as post-command.py ran them before the rule engine
+VALID_PATTERN = r'\([A-Z][a-z]+ et al\., \d{4}, PMID: \d{8}\)'
+CLAIM_INDICATORS = [
+    r'\b\d+(?:\.\d+)?%\b',
+    r'\b(?:increased?|decreased?|associated?|correlated?|significant)\b',
+    r'\b(?:incidence|prevalence|rate|risk|odds|hazard|ratio)\b',
+    r'\b(?:p\s*[<=]\s*0\.\d+)\b',
+    r'\b(?:n\s*=\s*\d+)\b',
+]
+FORBIDDEN_PHRASES = [
+    (r'\b(?:it is (?:well )?known)\b', 'it is known'),
+    (r'\b(?:studies show)\b', 'studies show'),
+    (r'\b(?:research indicates)\b', 'research indicates'),
+    (r'\b(?:evidence suggests)\b', 'evidence suggests'),
+    (r'\b(?:has been shown)\b', 'has been shown'),
+    (r'\b(?:data demonstrates?)\b', 'data demonstrates'),
+]
+VALID_LEVELS = ['[FT-VERIFIED]', '[ABSTRACT-VERIFIED]', '[NEEDS-FT-REVIEW]']
+H1_PATTERN = r'^#\s+.*_.*$'
+# Changed from \|(?! )|(?<! )\| so that row-closing pipes are not flagged
+TABLE_PATTERN = r'\|(?=[^\s|])|(?<=[^\s|])\|'
+IN_TEXT_CITATION = r'\([A-Z][a-z]+ et al\., \d{4}, PMID:\s*\d+'
+
+
+def prose_lines(lines):
+    """1-based numbers of the lines outside frontmatter and fenced code"""
+    prose = set()
+    frontmatter = bool(lines) and lines[0] == '---'
+    fence = None
+    for number, line in enumerate(lines, 1):
+        if frontmatter:
+            if number > 1 and line in ('---', '...'):
+                frontmatter = False
+            continue
+        stripped = line.lstrip()
+        if fence is not None:
+            if stripped.startswith(fence):
+                fence = None
+            continue
+        if stripped.startswith(('```', '~~~')):
+            fence = stripped[:3]
+            continue
+        prose.add(number)
+    return prose
+
+
+def reference_findings(content, is_markdown):
+    """Findings of the original checks, as (line, column, type, text, severity)"""
+    lines = content.split('\n')
+    prose = prose_lines(lines)
+    placeholders = {number for number in prose if find_placeholder(lines[number - 1]) is not None}
+    findings = []
+
+    # check_pmid_citations
+    for number in sorted(prose - placeholders):
+        line = lines[number - 1]
+        if line.startswith('#') or not line.strip():
+            continue
+        for indicator in CLAIM_INDICATORS:
+            match = re.search(indicator, line, re.IGNORECASE)
+            if match and not re.search(VALID_PATTERN, line):
+                findings.append((number, match.start() + 1, 'missing_pmid', line[:100], 'error'))
+
+    # check_unsupported_claims
+    for number in sorted(prose - placeholders):
+        line = lines[number - 1]
+        for pattern, phrase in FORBIDDEN_PHRASES:
+            match = re.search(pattern, line, re.IGNORECASE)
+            if match and 'PMID:' not in line and (number >= len(lines) or 'PMID:' not in lines[number]):
+                findings.append((number, match.start() + 1, 'unsupported_claim',
+                                 f'"{phrase}" without citation', 'error'))
+
+    # check_obsidian_formatting
+    if is_markdown:
+        for number in sorted(prose):
+            line = lines[number - 1]
+            if re.match(H1_PATTERN, line):
+                findings.append((number, 1, 'obsidian_formatting',
+                                 f'H1 heading contains underscore: {line}', 'error'))
+            match = re.search(TABLE_PATTERN, line) if '|' in line else None
+            if match:
+                findings.append((number, match.start() + 1, 'table_formatting',
+                                 f'Table may need spaces around pipes: {line[:50]}', 'warning'))
+        escaped = [number for number in sorted(prose) if r'\n' in lines[number - 1]]
+        if escaped:
+            findings.append((escaped[0], lines[escaped[0] - 1].index(r'\n') + 1, 'obsidian_formatting',
+                             'Contains escaped newlines (\\n)', 'error'))
+        entities = [number for number in sorted(prose) if '&gt;' in lines[number - 1] or '&lt;' in lines[number - 1]]
+        if entities:
+            line = lines[entities[0] - 1]
+            column = min(position for position in (line.find('&gt;'), line.find('&lt;')) if position >= 0) + 1
+            findings.append((entities[0], column, 'obsidian_formatting',
+                             'Contains HTML entities (&gt; or &lt;)', 'error'))
+
+    if placeholders:
+        number = min(placeholders)
+        findings.append((number, find_placeholder(lines[number - 1]), 'template_placeholder',
+                         'Template placeholder text has not been filled in', 'warning'))
+
+    # check_verification_levels
+    cited = [number for number in sorted(prose) if 'PMID:' in lines[number - 1]]
+    if cited:
+        if not any(level in lines[number - 1] for number in prose for level in VALID_LEVELS):
+            findings.append((cited[0], lines[cited[0] - 1].index('PMID:') + 1, 'missing_verification_level',
+                             'Citations present but no verification levels found', 'warning'))
+        else:
+            for number in cited:
+                line = lines[number - 1]
+                untagged = []
+                for match in re.finditer(IN_TEXT_CITATION, line):
+                    following = line.find('PMID:', match.end())
+                    tail = line[match.end():following if following >= 0 else len(line)]
+                    if not any(level in tail for level in VALID_LEVELS):
+                        untagged.append(match.start() + 1)
+                if untagged:
+                    findings.append((number, untagged[0], 'missing_verification_level',
+                                     'Citation has no verification level tag ([FT-VERIFIED], '
+                                     '[ABSTRACT-VERIFIED] or [NEEDS-FT-REVIEW])', 'warning'))
+                    break
+    return sorted(findings)
+
+
+def engine_findings(content, is_markdown):
+    result = RuleEngine().scan(content.split('\n'), is_markdown)
+    return sorted((finding['line'], finding['column'], finding['type'],
+                   finding.get('content', finding.get('message')), finding['severity'])
+                  for finding in result.findings)
+
+
+CORPUS = """---
+title: Outcomes
+tags: [hla, review]
+summary: Risk increased 40% (n = 120); it is known to matter
+---
+# Outcomes_of_HLA matching
+
+Graft failure risk increased by 30% after mismatch.
+Donor-specific antibodies were associated with rejection (Smith et al., 2020, PMID: 12345678) [FT-VERIFIED].
+Mortality decreased, p < 0.05, in a cohort of n = 250 recipients.
+The hazard ratio was 1.8 (Jones et al., 2019, PMID: 23456789).
+Studies show that eplet load matters.
+(Brown et al., 2021, PMID: 34567890) [ABSTRACT-VERIFIED]
+It is well known that DQ mismatches matter.
+Nothing to see on this line.
+
+## Method details
+
+```python
+risk = 0.3  # increased 30% p < 0.01
+print("studies show &gt; data demonstrates")
+```
+
+~~~
+Evidence suggests fences with tildes are code too: 12%
+~~~
+
+Incidence was XX% in the [Write 2-3 paragraphs about incidence] cohort.
+Research indicates a significant correlation.
+Evidence suggests an association PMID: 45678901
+Data demonstrates the effect.
+
+| Locus | Mismatches |
+|-------|------------|
+| A |B|
+|DRB1 | 2 |
+
+Prevalence literal \\n escape and &lt;tag&gt; entity, odds 2.1.
+Reference list: PMID: 56789012
+- [ ] check eplets
+- [x] done
+Correlated outcomes with prevalence 15.5% and rate 3 has been shown"""
+
+NO_TAGS = """Risk decreased 12% with matching (Smith et al., 2020, PMID: 12345678).
+Evidence suggests benefit.
+PMID: 23456789"""
+
+
+class RuleEngineEquivalenceTest(unittest.TestCase):
+
+    def assert_same(self, content, is_markdown):
+        expected = reference_findings(content, is_markdown)
+        self.assertTrue(expected)
+        self.assertEqual(engine_findings(content, is_markdown), expected)
+
+    def test_markdown_note(self):
+        self.assert_same(CORPUS, is_markdown=True)
+
+    def test_plain_text(self):
+        self.assert_same(CORPUS, is_markdown=False)
+
+    def test_citations_without_any_tag(self):
+        self.assert_same(NO_TAGS, is_markdown=False)
+
+    def test_streamed_lines_match_string(self):
+        engine = RuleEngine()
+        streamed = engine.scan(iter(line + '\n' for line in CORPUS.split('\n')), True).findings
+        self.assertEqual(streamed, engine.scan(CORPUS.split('\n'), True).findings)
+
+
+if __name__ == "__main__":
+    unittest.main()